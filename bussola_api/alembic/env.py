@@ -26,6 +26,14 @@ config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
 # Isso diz ao Alembic: "Olhe para esta classe Base para descobrir as tabelas"
 target_metadata = Base.metadata
 
+# --- OBJETOS GERENCIADOS FORA DO METADATA ---
+# O índice de busca (FTS5 / tsvector) é criado por DDL próprio (ver app.services.search).
+# Sem este filtro, o autogenerate proporia DROP das tabelas 'search_index*'.
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "table" and name and name.startswith("search_index"):
+        return False
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -44,6 +52,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -65,7 +74,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,65 @@
+"""Add full-text search index
+
+Revision ID: a1c4e7f20b31
+Revises: 6109ea6c3d5d
+Create Date: 2026-10-18 10:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.search import SearchService, _extrair_documento
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c4e7f20b31'
+down_revision: Union[str, Sequence[str], None] = '6109ea6c3d5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Colunas de origem EXISTENTES nesta revisão (os Models atuais têm colunas de revisões
+# posteriores, ex: anotacao.conteudo_hash, e não podem ser usados no backfill).
+TABELAS_ORIGEM = {
+    "anotacao": sa.table(
+        "anotacao", sa.column("id", sa.Integer), sa.column("user_id", sa.Integer),
+        sa.column("titulo", sa.String), sa.column("conteudo", sa.Text),
+        sa.column("data_criacao", sa.DateTime),
+    ),
+    "tarefa": sa.table(
+        "tarefa", sa.column("id", sa.Integer), sa.column("user_id", sa.Integer),
+        sa.column("titulo", sa.String), sa.column("descricao", sa.Text),
+        sa.column("prazo", sa.DateTime), sa.column("data_criacao", sa.DateTime),
+    ),
+    "compromisso": sa.table(
+        "compromisso", sa.column("id", sa.Integer), sa.column("user_id", sa.Integer),
+        sa.column("titulo", sa.String), sa.column("descricao", sa.Text),
+        sa.column("local", sa.String), sa.column("data_hora", sa.DateTime),
+    ),
+    "transacao": sa.table(
+        "transacao", sa.column("id", sa.Integer), sa.column("user_id", sa.Integer),
+        sa.column("descricao", sa.String), sa.column("data", sa.DateTime),
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    service = SearchService()
+
+    # DDL específico do dialeto (FTS5 no SQLite / tsvector + GIN no PostgreSQL)
+    for ddl in service._ddl(bind.dialect.name):
+        op.execute(ddl)
+
+    # Backfill: indexa todos os registros já existentes (Core, colunas desta revisão)
+    for dominio, tabela in TABELAS_ORIGEM.items():
+        resultado = bind.execute(sa.select(tabela).order_by(tabela.c.id))
+        while lote := resultado.fetchmany(500):
+            service._upsert(bind, [_extrair_documento(dominio, linha) for linha in lote])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,29 @@
+"""RitmoBio indice (user_id, data_registro)
+
+Revision ID: a7c4e9f52b38
+Revises: f6b3d8e41a27
+Create Date: 2026-10-18 15:22:04.871236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e9f52b38'
+down_revision: Union[str, Sequence[str], None] = 'f6b3d8e41a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serve o "último registro" (get_latest_bio) e a série temporal por intervalo de datas.
+    op.create_index('ix_ritmo_bio_user_data', 'ritmo_bio', ['user_id', 'data_registro'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ritmo_bio_user_data', table_name='ritmo_bio')
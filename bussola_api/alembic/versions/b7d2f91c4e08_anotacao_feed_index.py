@@ -0,0 +1,28 @@
+"""Anotacao feed index
+
+Revision ID: b7d2f91c4e08
+Revises: a1c4e7f20b31
+Create Date: 2026-10-18 11:02:17.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f91c4e08'
+down_revision: Union[str, Sequence[str], None] = 'a1c4e7f20b31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_anotacao_user_fixado_data', 'anotacao', ['user_id', 'fixado', 'data_criacao'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_anotacao_user_fixado_data', table_name='anotacao')
@@ -0,0 +1,42 @@
+"""Cofre rotacao de chave (watermark)
+
+Revision ID: b8d5f0a63c49
+Revises: a7c4e9f52b38
+Create Date: 2026-10-18 16:10:45.129873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d5f0a63c49'
+down_revision: Union[str, Sequence[str], None] = 'a7c4e9f52b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cofre_rotacao_chave',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('chave_id', sa.String(length=16), nullable=False),
+    sa.Column('ultimo_id', sa.Integer(), nullable=False),
+    sa.Column('processados', sa.Integer(), nullable=False),
+    sa.Column('reescritos', sa.Integer(), nullable=False),
+    sa.Column('falhas', sa.Integer(), nullable=False),
+    sa.Column('iniciado_em', sa.DateTime(), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(), nullable=True),
+    sa.Column('concluido_em', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('chave_id')
+    )
+    op.create_index(op.f('ix_cofre_rotacao_chave_id'), 'cofre_rotacao_chave', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cofre_rotacao_chave_id'), table_name='cofre_rotacao_chave')
+    op.drop_table('cofre_rotacao_chave')
@@ -0,0 +1,47 @@
+"""Tarefa prioridade_rank
+
+Revision ID: c3e8a5d17f42
+Revises: b7d2f91c4e08
+Create Date: 2026-10-18 11:40:03.671254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e8a5d17f42'
+down_revision: Union[str, Sequence[str], None] = 'b7d2f91c4e08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tarefa', sa.Column('prioridade_rank', sa.SmallInteger(), nullable=False, server_default='3'))
+
+    # Backfill: converte a prioridade textual no rank (valores fora do padrão -> 5)
+    op.execute("""
+        UPDATE tarefa SET prioridade_rank = CASE prioridade
+            WHEN 'Crítica' THEN 1
+            WHEN 'Alta' THEN 2
+            WHEN 'Média' THEN 3
+            WHEN 'Baixa' THEN 4
+            ELSE 5
+        END
+    """)
+
+    op.create_index(
+        'ix_tarefa_fila_prioridade', 'tarefa',
+        ['user_id', 'status', 'prioridade_rank', 'prazo', sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tarefa_fila_prioridade', table_name='tarefa')
+    with op.batch_alter_table('tarefa') as batch_op:
+        batch_op.drop_column('prioridade_rank')
@@ -0,0 +1,41 @@
+"""Cofre contadores por usuario e indices de expiracao
+
+Revision ID: c9e6a1b74d50
+Revises: b8d5f0a63c49
+Create Date: 2026-10-18 17:02:11.418630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e6a1b74d50'
+down_revision: Union[str, Sequence[str], None] = 'b8d5f0a63c49'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_segredo_user_expiracao', 'segredo', ['user_id', 'data_expiracao'], unique=False)
+    op.create_index('ix_segredo_expiracao', 'segredo', ['data_expiracao'], unique=False)
+    # Sem backfill: o contador é criado sob demanda no primeiro acesso (CofreService.get_contadores).
+    op.create_table('cofre_contador',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('expirados', sa.Integer(), nullable=False),
+    sa.Column('proxima_expiracao', sa.Date(), nullable=True),
+    sa.Column('calculado_em', sa.Date(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('cofre_contador')
+    op.drop_index('ix_segredo_expiracao', table_name='segredo')
+    op.drop_index('ix_segredo_user_expiracao', table_name='segredo')
@@ -0,0 +1,39 @@
+"""Estado da instancia (total de usuarios sem COUNT)
+
+Revision ID: d0f7b2c85e61
+Revises: c9e6a1b74d50
+Create Date: 2026-10-19 09:14:32.507219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0f7b2c85e61'
+down_revision: Union[str, Sequence[str], None] = 'c9e6a1b74d50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sistema_estado',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_usuarios', sa.Integer(), nullable=False),
+    sa.Column('inicializado_em', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('atualizado_em', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Backfill: linha única a partir do estado atual da tabela 'user'
+    op.execute(
+        'INSERT INTO sistema_estado (id, total_usuarios, inicializado_em, atualizado_em) '
+        'SELECT 1, COUNT(id), MIN(created_at), CURRENT_TIMESTAMP FROM "user"'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sistema_estado')
@@ -0,0 +1,30 @@
+"""Anotacao conteudo_hash
+
+Revision ID: d4f1b6a28c95
+Revises: c3e8a5d17f42
+Create Date: 2026-10-18 12:21:48.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1b6a28c95'
+down_revision: Union[str, Sequence[str], None] = 'c3e8a5d17f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Notas existentes ficam com hash NULL: o primeiro save grava normalmente e preenche o hash.
+    op.add_column('anotacao', sa.Column('conteudo_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('anotacao') as batch_op:
+        batch_op.drop_column('conteudo_hash')
@@ -0,0 +1,52 @@
+"""Ritmo totais de macros por refeicao e dieta
+
+Revision ID: e5a2c7d39b16
+Revises: d4f1b6a28c95
+Create Date: 2026-10-18 14:05:12.310442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a2c7d39b16'
+down_revision: Union[str, Sequence[str], None] = 'd4f1b6a28c95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for coluna in ('total_calorias', 'total_proteina', 'total_carbo', 'total_gordura'):
+        op.add_column('ritmo_refeicao', sa.Column(coluna, sa.Float(), nullable=True, server_default='0'))
+    for coluna in ('total_proteina', 'total_carbo', 'total_gordura'):
+        op.add_column('ritmo_dieta_config', sa.Column(coluna, sa.Float(), nullable=True, server_default='0'))
+
+    # Backfill: a partir daqui os totais são mantidos incrementalmente pelo RitmoService.
+    op.execute("""
+        UPDATE ritmo_refeicao SET
+            total_calorias = (SELECT COALESCE(SUM(calorias), 0) FROM ritmo_alimento_item a WHERE a.refeicao_id = ritmo_refeicao.id),
+            total_proteina = (SELECT COALESCE(SUM(proteina), 0) FROM ritmo_alimento_item a WHERE a.refeicao_id = ritmo_refeicao.id),
+            total_carbo = (SELECT COALESCE(SUM(carbo), 0) FROM ritmo_alimento_item a WHERE a.refeicao_id = ritmo_refeicao.id),
+            total_gordura = (SELECT COALESCE(SUM(gordura), 0) FROM ritmo_alimento_item a WHERE a.refeicao_id = ritmo_refeicao.id)
+    """)
+    op.execute("""
+        UPDATE ritmo_dieta_config SET
+            calorias_calculadas = (SELECT COALESCE(SUM(total_calorias), 0) FROM ritmo_refeicao r WHERE r.dieta_id = ritmo_dieta_config.id),
+            total_proteina = (SELECT COALESCE(SUM(total_proteina), 0) FROM ritmo_refeicao r WHERE r.dieta_id = ritmo_dieta_config.id),
+            total_carbo = (SELECT COALESCE(SUM(total_carbo), 0) FROM ritmo_refeicao r WHERE r.dieta_id = ritmo_dieta_config.id),
+            total_gordura = (SELECT COALESCE(SUM(total_gordura), 0) FROM ritmo_refeicao r WHERE r.dieta_id = ritmo_dieta_config.id)
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('ritmo_dieta_config') as batch_op:
+        for coluna in ('total_proteina', 'total_carbo', 'total_gordura'):
+            batch_op.drop_column(coluna)
+    with op.batch_alter_table('ritmo_refeicao') as batch_op:
+        for coluna in ('total_calorias', 'total_proteina', 'total_carbo', 'total_gordura'):
+            batch_op.drop_column(coluna)
@@ -0,0 +1,44 @@
+"""Tarefa fila: indice parcial (tarefas abertas)
+
+Revision ID: e7b9c2d46f18
+Revises: d0f7b2c85e61
+Create Date: 2026-10-19 16:05:48.219374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b9c2d46f18'
+down_revision: Union[str, Sequence[str], None] = 'd0f7b2c85e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mesmo predicado das consultas (status != 'Concluído'): o planner só usa o índice parcial
+# quando o WHERE da consulta implica o do índice.
+TAREFA_ABERTA = sa.text("status != 'Concluído'")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index('ix_tarefa_fila_prioridade', table_name='tarefa')
+    op.create_index(
+        'ix_tarefa_fila_prioridade', 'tarefa',
+        ['user_id', 'prioridade_rank', sa.text('(prazo IS NULL)'), 'prazo', sa.text('id DESC')],
+        unique=False,
+        postgresql_where=TAREFA_ABERTA, sqlite_where=TAREFA_ABERTA
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tarefa_fila_prioridade', table_name='tarefa')
+    op.create_index(
+        'ix_tarefa_fila_prioridade', 'tarefa',
+        ['user_id', 'status', 'prioridade_rank', 'prazo', sa.text('id DESC')],
+        unique=False
+    )
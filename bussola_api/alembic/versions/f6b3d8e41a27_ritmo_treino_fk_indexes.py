@@ -0,0 +1,31 @@
+"""Ritmo indices das FKs de treino (volume semanal)
+
+Revision ID: f6b3d8e41a27
+Revises: e5a2c7d39b16
+Create Date: 2026-10-18 14:48:37.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b3d8e41a27'
+down_revision: Union[str, Sequence[str], None] = 'e5a2c7d39b16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sustentam o GROUP BY do volume semanal (Exercício -> Dia -> Plano) e o selectinload da árvore.
+    op.create_index(op.f('ix_ritmo_dia_treino_plano_id'), 'ritmo_dia_treino', ['plano_id'], unique=False)
+    op.create_index(op.f('ix_ritmo_exercicio_item_dia_treino_id'), 'ritmo_exercicio_item', ['dia_treino_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ritmo_exercicio_item_dia_treino_id'), table_name='ritmo_exercicio_item')
+    op.drop_index(op.f('ix_ritmo_dia_treino_plano_id'), table_name='ritmo_dia_treino')
@@ -11,20 +11,23 @@ PARTE DO SISTEMA:
     Backend / API Core / Security
 
 RESPONSABILIDADES:
-    1. Prover sessões de banco de dados isoladas por requisição.
+    1. Prover sessões de banco de dados isoladas por requisição (síncronas e assíncronas).
     2. Decodificar e validar tokens JWT.
     3. Recuperar o usuário atual do banco de dados.
     4. Aplicar regras de negócio de segurança (ex: bloquear usuários inativos).
     5. Autorizar acesso administrativo (Superuser).
+    6. Cache em processo do principal autenticado (evita Redis + SELECT por requisição).
 
 COMUNICAÇÃO:
     - Utilizado por: Todos os Endpoints (routers) da API.
     - Conecta com: app.core.security (JWT), app.db (Session), app.models (User).
+    - Conecta com: app.core.principal_cache (LRU por 'jti', invalidado via Pub/Sub).
+    - Conecta com: app.core.token_revocation (revogações por 'jti' + Filtro de Bloom).
 
 =======================================================================================
 """
 
-from typing import Generator, Annotated
+from typing import AsyncGenerator, Generator, Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
@@ -34,7 +37,10 @@ import redis
 
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal_cache import principal_cache
+from app.core.token_revocation import token_revocation
+from app.db.session import SessionLocal, AsyncSessionLocal
+from app.db.async_db import AsyncDB
 from app.models.user import User
 from app.schemas.token import TokenPayload
 
@@ -62,8 +68,27 @@ def get_db() -> Generator:
     finally:
         db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncDB, None]:
+    """
+    [NOVO] Sessão para endpoints `async def`.
+
+    Com ASYNC_DB_ENABLED, entrega uma AsyncSession (aiosqlite/asyncpg). Caso contrário,
+    a Session síncrona de sempre, executada no threadpool. Nos dois casos a API é a
+    mesma (AsyncDB) e nenhuma query roda na thread do event loop.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield AsyncDB(session)
+    else:
+        db = SessionLocal()
+        try:
+            yield AsyncDB(db)
+        finally:
+            db.close()
+
 # Alias para injeção de dependência limpa nas rotas
 SessionDep = Annotated[Session, Depends(get_db)]
+AsyncDBDep = Annotated[AsyncDB, Depends(get_async_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 def get_current_user(session: SessionDep, token: TokenDep) -> User:
@@ -72,22 +97,25 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
 
     Regras de Negócio e Segurança:
     1. Valida a assinatura do JWT usando a SECRET_KEY.
-    2. [NOVO] Verifica se o token está na BLACKLIST do Redis (Logout).
+    2. [NOVO] Verifica se o 'jti' do token foi revogado (Logout). O caso comum
+       (não revogado) é respondido pelo Filtro de Bloom local, sem ida ao Redis.
     3. Converte o 'sub' do token para buscar o usuário no banco.
     4. Garante que o usuário ainda existe no banco.
     5. Garante que o usuário está ATIVO (bloqueia acesso de usuários banidos/inativos
        mesmo que possuam um token válido).
 
+    [OTIMIZAÇÃO] Acerto no cache de principal (mesmo token já validado há menos de
+    PRINCIPAL_CACHE_TTL_SECONDS) pula os passos 1, 3 e 4: nenhuma ida ao banco.
+    Logout/alterações de perfil invalidam o cache de todos os workers via Pub/Sub.
+
     Retorna:
         User: Instância do usuário autenticado.
     """
-    
-    # [CHECK BLACKLIST] Se o token foi revogado, nega acesso instantaneamente.
-    if redis_client.exists(f"blacklist:{token}"):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Sessão revogada. Faça login novamente.",
-        )
+    jti = _jti_nao_verificado(token) if principal_cache.ativo else None
+    entrada = principal_cache.get(jti, token)
+    if entrada is not None and not token_revocation.esta_revogado(jti):
+        return principal_cache.materializar(session, entrada.retrato)
+    geracao = principal_cache.geracao()
 
     try:
         # Decodifica e valida assinatura/expiração do token
@@ -108,7 +136,14 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Não foi possível validar as credenciais",
         )
-    
+
+    # [CHECK REVOGAÇÃO] Se o token foi revogado, nega acesso instantaneamente.
+    if token_revocation.esta_revogado(token_data.jti, token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Sessão revogada. Faça login novamente.",
+        )
+
     # Busca o usuário pelo ID contido no 'sub' do token
     user = session.query(User).filter(User.id == int(token_data.sub)).first()
     
@@ -118,9 +153,20 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     # Regra de Segurança: Impede login de usuários desativados logicamente
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Usuário inativo")
-        
+
+    principal_cache.put(token_data.jti, token, payload, user, geracao)
     return user
 
+def _jti_nao_verificado(token: str):
+    """
+    Lê o 'jti' SEM validar a assinatura (só serve de chave de busca: o cache compara
+    o token inteiro com o que já foi validado). Token malformado = sem cache.
+    """
+    try:
+        return jwt.get_unverified_claims(token).get("jti")
+    except JWTError:
+        return None
+
 # Alias para injeção direta do usuário autenticado nas rotas
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
@@ -25,13 +25,21 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+import threading
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from app.api import deps
-from app.schemas.cofre import SegredoResponse, SegredoCreate, SegredoUpdate, SegredoValueResponse
+from app.schemas.cofre import (
+    SegredoResponse, SegredoCreate, SegredoUpdate, SegredoValueResponse,
+    SegredoRevelarLoteRequest, SegredoRevelarLoteResponse, CofreRotacaoStatus
+)
+from app.db.session import SessionLocal
 from app.services.cofre import cofre_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # --------------------------------------------------------------------------------------
@@ -119,4 +127,70 @@ def obter_valor_segredo(
     if valor is None: 
         raise HTTPException(404, "Segredo não encontrado")
         
-    return {"valor": valor}
\ No newline at end of file
+    return {"valor": valor}
+
+@router.post("/revelar", response_model=SegredoRevelarLoteResponse)
+def revelar_segredos_lote(
+    dados: SegredoRevelarLoteRequest,
+    db: Session = Depends(deps.get_db), 
+    current_user = Depends(deps.get_current_user)
+):
+    """
+    Revela vários segredos de uma vez (uma única query e um único cipher).
+    
+    Segurança:
+        Mesmas regras da rota unitária: requisição explícita, isolamento por usuário
+        e mensagens controladas quando a descriptografia falha.
+    """
+    valores = cofre_service.revelar_lote(db, dados.ids, current_user.id)
+    return {
+        "valores": [{"id": i, "valor": valores[i]} for i in dict.fromkeys(dados.ids) if i in valores],
+        "nao_encontrados": [i for i in dict.fromkeys(dados.ids) if i not in valores],
+    }
+
+# --------------------------------------------------------------------------------------
+# ADMIN: ROTAÇÃO DA ENCRYPTION_KEY
+# --------------------------------------------------------------------------------------
+# Impede dois jobs simultâneos no mesmo processo (o job em si é idempotente e retomável).
+_rotacao_lock = threading.Lock()
+
+def _executar_rotacao():
+    if not _rotacao_lock.acquire(blocking=False):
+        return
+    db = SessionLocal()
+    try:
+        resumo = cofre_service.rotacionar_chave(db)
+        logger.info(f"[Cofre] Rotação finalizada: {resumo}")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"[Cofre] Rotação interrompida (retomável): {e}")
+    finally:
+        db.close()
+        _rotacao_lock.release()
+
+@router.get("/admin/rotacao-chave", response_model=CofreRotacaoStatus)
+def status_rotacao_chave(
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_active_superuser)
+):
+    """Progresso (watermark) da re-criptografia para a ENCRYPTION_KEY atual."""
+    estado = cofre_service.get_status_rotacao(db)
+    if not estado:
+        raise HTTPException(404, "Nenhuma rotação iniciada para a chave atual")
+    resposta = CofreRotacaoStatus.model_validate(estado)
+    resposta.em_execucao = _rotacao_lock.locked()
+    return resposta
+
+@router.post("/admin/rotacao-chave", status_code=202)
+def iniciar_rotacao_chave(
+    background_tasks: BackgroundTasks,
+    current_user = Depends(deps.get_current_active_superuser)
+):
+    """
+    Inicia (ou retoma) a re-criptografia de todos os segredos com a chave primária.
+    Roda em background, em lotes; a API continua servindo durante o processo.
+    """
+    if _rotacao_lock.locked():
+        return {"status": "em_execucao"}
+    background_tasks.add_task(_executar_rotacao)
+    return {"status": "agendado"}
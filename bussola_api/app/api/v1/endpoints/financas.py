@@ -40,6 +40,7 @@ from app.schemas.financas import (
     FinancasDashboardResponse
 )
 from app.services.financas import financas_service
+from app.services.search import search_service
 
 router = APIRouter()
 
@@ -125,10 +126,13 @@ def delete_transacao(
     
     # Exclusão em Lote se pertencer a um grupo
     if transacao.id_grupo_recorrencia and transacao.tipo_recorrencia in ['recorrente', 'parcelada']:
-        db.query(Transacao).filter(
+        query_grupo = db.query(Transacao).filter(
             Transacao.id_grupo_recorrencia == transacao.id_grupo_recorrencia,
             Transacao.user_id == current_user.id
-        ).delete()
+        )
+        # Delete em lote não dispara eventos ORM: limpa o índice de busca explicitamente.
+        search_service.remove_ids(db, "transacao", [tid for (tid,) in query_grupo.with_entities(Transacao.id)])
+        query_grupo.delete()
     else:
         # Exclusão unitária
         db.delete(transacao)
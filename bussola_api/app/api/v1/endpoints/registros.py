@@ -23,14 +23,14 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional
 from app.api import deps
 from app.schemas.registros import (
     RegistrosDashboardResponse, 
-    AnotacaoCreate, AnotacaoResponse, AnotacaoUpdate,
-    TarefaCreate, TarefaResponse, TarefaUpdate,
+    AnotacaoCreate, AnotacaoResponse, AnotacaoUpdate, AnotacoesFeedResponse,
+    TarefaCreate, TarefaResponse, TarefaUpdate, TarefasLoteRequest, TarefasLoteResponse,
     GrupoCreate, GrupoResponse 
 )
 from app.services.registros import registros_service
@@ -49,7 +49,7 @@ def get_dashboard(
     """
     Retorna a visão geral de Produtividade.
     Inclui:
-    - Anotações agrupadas por mês.
+    - Anotações agrupadas por mês (primeira página do feed, com trecho do conteúdo).
     - Anotações fixadas no topo.
     - Tarefas pendentes ordenadas por prioridade.
     - Tarefas recém-concluídas.
@@ -101,6 +101,31 @@ def delete_grupo(
 # ANOTAÇÕES
 # --------------------------------------------------------------------------------------
 
+@router.get("/anotacoes", response_model=AnotacoesFeedResponse)
+def get_feed_anotacoes(
+    meses: int = Query(3, ge=1, le=12, description="Quantidade de meses por página"),
+    antes_de: Optional[str] = Query(None, description="Cursor 'AAAA-MM' retornado na página anterior"),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_user)
+):
+    """
+    Feed paginado (keyset) das notas não fixadas, agrupadas por mês.
+    Cada nota traz apenas um `trecho` em texto puro; use GET /anotacoes/{id} para o corpo completo.
+    """
+    return registros_service.get_feed_anotacoes(db, current_user.id, meses, antes_de)
+
+@router.get("/anotacoes/{id}", response_model=AnotacaoResponse)
+def get_anotacao(
+    id: int,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_user)
+):
+    """Retorna a nota com o conteúdo integral (carregamento sob demanda)."""
+    reg = registros_service.get_anotacao(db, id, current_user.id)
+    if not reg:
+        raise HTTPException(status_code=404, detail="Anotação não encontrada")
+    return reg
+
 @router.post("/anotacoes", response_model=AnotacaoResponse)
 def create_anotacao(
     dados: AnotacaoCreate, 
@@ -161,6 +186,19 @@ def create_tarefa(
     """
     return registros_service.create_tarefa(db, dados, current_user.id)
 
+@router.post("/tarefas/lote", response_model=TarefasLoteResponse)
+def aplicar_lote_tarefas(
+    dados: TarefasLoteRequest,
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_user)
+):
+    """
+    Aplica várias operações (status, prioridade, prazo, excluir) em uma única transação.
+    Ideal para ações em massa (ex: adiar tarefas estagnadas sugeridas pela IA).
+    Retorna o resultado individual de cada operação, na ordem enviada.
+    """
+    return registros_service.aplicar_operacoes_lote(db, dados.operacoes, current_user.id)
+
 @router.put("/tarefas/{id}", response_model=TarefaResponse)
 def update_tarefa(
     id: int, 
@@ -28,13 +28,15 @@ COMUNICAÇÃO:
 """
 
 from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from app import schemas, models
 from app.api import deps
 from app.services.ritmo import RitmoService
+from app.services.taco import taco_index
 from app.schemas import ritmo as ritmo_schema
 
 router = APIRouter()
@@ -70,6 +72,34 @@ def read_latest_bio(
         "volume_semanal": volume
     })
 
+@router.get("/bio/series", response_model=ritmo_schema.BioSeriesResponse)
+def read_bio_series(
+    inicio: Optional[datetime] = None,
+    fim: Optional[datetime] = None,
+    pontos: int = Query(200, ge=3, le=2000, description="Máximo de pontos por métrica (LTTB)"),
+    janela: int = Query(7, ge=1, le=365, description="Janela da média móvel, em dias"),
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Série temporal de peso, BF, TMB e GET para os gráficos de evolução.
+    Cada métrica é reduzida no servidor para no máximo `pontos` (LTTB), com média
+    móvel e inclinação da tendência calculadas sobre todo o intervalo.
+    """
+    return RitmoService.get_bio_series(db, current_user.id, inicio, fim, pontos, janela)
+
+@router.post("/bio/simular", response_model=ritmo_schema.SimulacaoMetabolicaResponse)
+def simular_metas(
+    sim_in: ritmo_schema.SimulacaoMetabolicaRequest,
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """
+    Planejador de metas: calcula TMB, GET e macros para vários cenários de uma vez
+    (pesos-alvo x níveis de atividade x objetivos, ou curva semanal de cutting/bulking).
+    Stateless: não cria registros e não acessa o banco.
+    """
+    return RitmoService.simular_metas(sim_in)
+
 @router.post("/bio", response_model=ritmo_schema.BioResponse)
 def create_bio(
     *,
@@ -186,6 +216,14 @@ def get_dieta_ativa(
     dieta = RitmoService.get_dieta_ativa(db, current_user.id)
     return dieta
 
+@router.get("/nutricao/ativo/resumo", response_model=Optional[ritmo_schema.DietaResumoResponse])
+def get_resumo_dieta_ativa(
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_user),
+) -> Any:
+    """Totais de macros da dieta vigente e de cada refeição (sem a lista de alimentos)."""
+    return RitmoService.get_resumo_dieta_ativa(db, current_user.id)
+
 @router.post("/nutricao", response_model=ritmo_schema.DietaConfigResponse)
 def create_dieta(
     *,
@@ -238,6 +276,17 @@ def get_local_foods(q: str = ""):
         return []
     return RitmoService.search_taco_foods(q)
 
+@router.post("/local/foods/reload")
+def reload_local_foods(
+    current_user = Depends(deps.get_current_active_superuser)
+):
+    """
+    [ADMIN] Hot-reload do índice TACO em memória após atualizar data/taco.json.
+    """
+    if not taco_index.reload():
+        raise HTTPException(status_code=500, detail="Falha ao recarregar a tabela TACO.")
+    return {"status": "success", "alimentos": len(taco_index.snapshot)}
+
 
 @router.put("/nutricao/{dieta_id}", response_model=ritmo_schema.DietaConfigResponse)
 def update_dieta(
@@ -0,0 +1,56 @@
+"""
+=======================================================================================
+ARQUIVO: search.py (Endpoints de Busca Unificada)
+=======================================================================================
+
+OBJETIVO:
+    Expor a busca Full-Text que atravessa Notas, Tarefas, Compromissos e Transações.
+
+PARTE DO SISTEMA:
+    Backend / API Layer / Endpoints
+
+RESPONSABILIDADES:
+    1. Validar os parâmetros de busca (termo, domínios, paginação).
+    2. Garantir isolamento por usuário (`current_user.id`).
+    3. Delegar a consulta ranqueada ao SearchService.
+
+COMUNICAÇÃO:
+    - Chama: app.services.search.search_service
+    - Depende: app.api.deps (Session e User)
+
+=======================================================================================
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.api import deps
+from app.schemas.search import SearchResponse
+from app.services.search import search_service, DOMINIOS
+
+router = APIRouter()
+
+@router.get("/", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=2, max_length=200, description="Termos da busca"),
+    dominios: Optional[List[str]] = Query(None, description="Filtra por: anotacao, tarefa, compromisso, transacao"),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(deps.get_db),
+    current_user = Depends(deps.get_current_user)
+):
+    """
+    Busca ranqueada em todos os módulos do usuário.
+    
+    - Insensível a acentos e caixa ("acucar" encontra "Açúcar").
+    - Termos casam por prefixo e são combinados com AND.
+    - Paginação por `limit`/`offset`; `tem_mais` indica se há próxima página.
+    """
+    if dominios:
+        invalidos = [d for d in dominios if d not in DOMINIOS]
+        if invalidos:
+            raise HTTPException(status_code=400, detail=f"Domínio inválido: {', '.join(invalidos)}")
+
+    resultado = search_service.search(db, current_user.id, q, dominios, limit, offset)
+    return {"query": q, "limit": limit, "offset": offset, **resultado}
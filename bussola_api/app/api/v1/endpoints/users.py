@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 from app.models.user import User
 from app.schemas.user import User as UserSchema, UserCreate
 from app.core.security import get_password_hash, verify_password
@@ -78,6 +79,8 @@ def update_user_me(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    # [NOVO] Perfil alterado: descarta o principal em cache (todos os workers)
+    principal_cache.invalidar_usuario(current_user.id)
     return current_user
 
 # --------------------------------------------------------------------------------------
@@ -109,6 +112,8 @@ def verify_email(
     user.is_verified = True
     db.add(user)
     db.commit()
+    # [NOVO] Conta verificada: descarta o principal em cache (todos os workers)
+    principal_cache.invalidar_usuario(user.id)
     
     return {"msg": "Email verificado com sucesso!"}
 
@@ -35,7 +35,8 @@ from app.api.v1.endpoints import (
     panorama,
     system,
     users,
-    ai
+    ai,
+    search
 )
 
 # Instância principal que acumulará todas as rotas
@@ -61,6 +62,9 @@ api_router.include_router(ritmo.router, prefix="/ritmo", tags=["ritmo"])
 api_router.include_router(cofre.router, prefix="/cofre", tags=["cofre"])
 api_router.include_router(panorama.router, prefix="/panorama", tags=["panorama"])
 
+# Busca Unificada (Full-Text entre módulos)
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+
 # Módulo de IA (Serviço de Inteligência / Chat)
 api_router.include_router(ai.router, prefix="/ai", tags=["ai"]) 
 
@@ -27,7 +27,7 @@ COMUNICAÇÃO:
 
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # --------------------------------------------------------------------------------------
@@ -63,9 +63,35 @@ class Settings(BaseSettings):
 
     ALGORITHM: str = "HS256"
 
+    # Custo do bcrypt (2^rounds). Ao alterar, hashes antigos são refeitos no próximo login.
+    BCRYPT_ROUNDS: int = 12
+    # Pool de processos do bcrypt: processos dedicados e quantas operações podem aguardar
+    # na fila além delas. Acima disso o login/cadastro responde 503 (0 workers = inline).
+    PASSWORD_POOL_WORKERS: int = 2
+    PASSWORD_POOL_FILA: int = 8
+
+    # Cache em processo do usuário autenticado (por 'jti'), invalidado via Redis Pub/Sub.
+    # TTL curto limita a janela caso uma invalidação se perca; 0 desativa o cache.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_SIZE: int = 10000
+
+    # Revogação de tokens por 'jti': Filtro de Bloom local (por worker) dimensionado para
+    # a quantidade de revogações vivas, reconstruído periodicamente a partir do stream.
+    REVOGACAO_BLOOM_CAPACIDADE: int = 100000
+    REVOGACAO_BLOOM_TAXA_FP: float = 0.001
+    REVOGACAO_RECONSTRUCAO_SEGUNDOS: int = 3600
+
     # ENCRYPTION_KEY: Chave simétrica para criptografar dados sensíveis no banco (Data at Rest).
     # Usado pelo módulo 'app.core.security' ou serviços como o Cofre de Senhas.
     ENCRYPTION_KEY: str
+    # Rotação de chave: chaves ANTERIORES (separadas por vírgula), aceitas apenas para
+    # descriptografar. A ENCRYPTION_KEY é sempre a primária (usada para criptografar).
+    # Após o job de re-criptografia concluir, as antigas podem ser removidas.
+    ENCRYPTION_KEYS_ANTIGAS: str = ""
+    # Tamanho do lote do job de re-criptografia do Cofre (linhas por transação).
+    COFRE_ROTACAO_LOTE: int = 500
+    # Antecedência (dias) do resumo diário de segredos prestes a expirar.
+    COFRE_DIGEST_DIAS: int = 7
 
     # ----------------------------------------------------------------------------------
     # INFRAESTRUTURA (DB & CACHE)
@@ -74,6 +100,31 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     REDIS_URL: str
 
+    # [NOVO] Engine assíncrona (opt-in): aiosqlite no SQLite / asyncpg no PostgreSQL.
+    # Desligada, os endpoints assíncronos executam as queries da engine síncrona em
+    # threads (nunca no event loop). ASYNC_DATABASE_URL vazio = derivada de DATABASE_URL.
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Cache de IA em dois níveis: L1 em processo (sugestões já validadas, LRU + TTL) na
+    # frente do Redis (L2). O TTL do L1 nunca passa do TTL restante da chave no Redis.
+    # 0 em qualquer um desativa o L1.
+    AI_CACHE_L1_SIZE: int = 2000
+    AI_CACHE_L1_TTL_SECONDS: int = 300
+    # Single-flight dos agentes: validade do lock entre workers e espera máxima de quem
+    # aguarda um líder. Deve cobrir a duração de uma chamada de LLM.
+    AI_SINGLE_FLIGHT_LOCK_SECONDS: int = 30
+    # Stale-while-revalidate por domínio: (TTL suave, TTL rígido) em segundos. Entre os dois,
+    # a última resposta boa é servida na hora (flag 'stale') e recalculada em segundo plano;
+    # após o rígido, a chave some do Redis. Domínios ausentes: 24h sem fase 'stale'.
+    AI_CACHE_TTL_DOMINIOS: Dict[str, Tuple[int, int]] = {
+        "financas": (6 * 3600, 24 * 3600),
+        "roteiro": (1 * 3600, 24 * 3600),
+        "registros": (1 * 3600, 24 * 3600),
+        "nutri": (12 * 3600, 24 * 3600),
+        "coach": (12 * 3600, 24 * 3600),
+    }
+
     # ----------------------------------------------------------------------------------
     # SERVIÇOS DE IA E APIS EXTERNAS
     # ----------------------------------------------------------------------------------
@@ -128,6 +179,8 @@ class Settings(BaseSettings):
     MAIL_SERVER: Optional[str] = None
     MAIL_STARTTLS: bool = True
     MAIL_SSL_TLS: bool = False
+    # Envio em massa (digests): quantas mensagens reaproveitam a mesma conexão SMTP.
+    MAIL_MENSAGENS_POR_CONEXAO: int = 50
 
     @property
     def EMAILS_ENABLED(self) -> bool:
@@ -162,6 +215,12 @@ class Settings(BaseSettings):
     # Usa BASE_DIR para garantir o caminho correto dentro e fora do Docker.
     DATA_DIR: str = os.path.join(str(BASE_DIR), "data")
 
+    # Intervalo (segundos) para checar se data/taco.json mudou e recarregar o índice em memória.
+    # 0 desativa o hot-reload automático (ainda é possível recarregar via endpoint admin).
+    TACO_RELOAD_INTERVAL_SECONDS: int = 30
+    # Capacidade do cache LRU de consultas da busca de alimentos (0 desativa).
+    TACO_QUERY_CACHE_SIZE: int = 1024
+
     # Configuração do Pydantic para carregar o arquivo .env
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -0,0 +1,245 @@
+"""
+=======================================================================================
+ARQUIVO: principal_cache.py (Cache em Processo do Usuário Autenticado)
+=======================================================================================
+
+OBJETIVO:
+    Evitar, a cada requisição autenticada, as duas idas à rede feitas por
+    'deps.get_current_user' (consulta de revogação no Redis + SELECT do usuário).
+    O principal (claims do token + retrato enxuto do usuário) fica em um LRU local
+    com TTL curto, indexado pelo 'jti' do token de acesso.
+
+PARTE DO SISTEMA:
+    Backend / Core (Security Layer).
+
+RESPONSABILIDADES:
+    1. LRU + TTL thread-safe (por worker), limitado também pelo 'exp' do próprio token.
+    2. Retrato enxuto do User (sem hash de senha) e reconstrução como objeto ORM
+       "detached" anexado à sessão da requisição, SEM consulta ao banco.
+    3. Invalidação entre workers via Redis Pub/Sub (logout, desativação, alteração de perfil).
+    4. Fail-safe: sem assinatura ativa no Pub/Sub, o cache é desligado (cada requisição
+       volta ao caminho completo), pois as invalidações não chegariam a este worker.
+
+COMUNICAÇÃO:
+    - Utilizado por: app.api.deps (get_current_user).
+    - Invalidado por: app.services.auth (logout/reset de senha), endpoints de usuário.
+    - Config: settings.PRINCIPAL_CACHE_TTL_SECONDS, settings.PRINCIPAL_CACHE_SIZE, settings.REDIS_URL.
+
+=======================================================================================
+"""
+
+import copy
+import hmac
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Canal Pub/Sub. Mensagens: "jti:<jti>" (um token) ou "user:<id>" (todos os tokens do usuário).
+CANAL_INVALIDACAO = "auth:principal:invalidar"
+
+# Colunas copiadas para o retrato. As demais (ex: hashed_password) ficam "unloaded"
+# no objeto reconstruído e são carregadas sob demanda se algum endpoint precisar.
+CAMPOS_RETRATO = (
+    "id", "email", "full_name", "is_active", "is_superuser", "is_verified",
+    "auth_provider", "is_premium", "plan_status", "avatar_url", "city", "news_preferences",
+)
+
+# Espera entre tentativas de reconectar o assinante do Pub/Sub
+ESPERA_RECONEXAO_SEGUNDOS = 5.0
+
+
+class _Entrada:
+    __slots__ = ("token", "claims", "retrato", "expira_em")
+
+    def __init__(self, token: str, claims: dict, retrato: dict, expira_em: float):
+        self.token = token
+        self.claims = claims
+        self.retrato = retrato
+        self.expira_em = expira_em
+
+
+class PrincipalCache:
+    """
+    LRU de principais autenticados (por worker).
+
+    A chave é o 'jti', mas a entrada guarda o token original: um acerto só vale se o
+    token recebido for idêntico ao que já teve a assinatura validada no miss.
+    """
+
+    def __init__(self, capacidade: int, ttl_segundos: float, redis_url: str):
+        self.capacidade = capacidade
+        self.ttl_segundos = ttl_segundos
+        self._redis_url = redis_url
+        self._itens: "OrderedDict[str, _Entrada]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._ouvinte: Optional[threading.Thread] = None
+        self._assinado = False
+        self._geracao = 0 # Incrementada a cada invalidação (descarta puts concorrentes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.capacidade > 0 and self.ttl_segundos > 0
+
+    # ----------------------------------------------------------------------------------
+    # LEITURA / ESCRITA
+    # ----------------------------------------------------------------------------------
+
+    def geracao(self) -> int:
+        """Capturar ANTES do caminho completo e repassar ao `put`."""
+        return self._geracao
+
+    def get(self, jti: Optional[str], token: str) -> Optional[_Entrada]:
+        if not self.ativo or not jti:
+            return None
+        self._garantir_ouvinte()
+        if not self._assinado:
+            return None
+
+        with self._lock:
+            entrada = self._itens.get(jti)
+            if entrada is None or entrada.expira_em <= time.monotonic():
+                if entrada is not None:
+                    del self._itens[jti]
+                self.misses += 1
+                return None
+            if not hmac.compare_digest(entrada.token, token):
+                self.misses += 1
+                return None
+            self._itens.move_to_end(jti)
+            self.hits += 1
+            return entrada
+
+    def put(self, jti: Optional[str], token: str, claims: dict, user: User, geracao: int) -> None:
+        """
+        Só grava se nenhuma invalidação ocorreu desde `geracao`: um logout publicado
+        entre a checagem de revogação e este ponto não pode ser "desfeito" pelo cache.
+        """
+        if not self.ativo or not jti or not self._assinado:
+            return
+        # Nunca além da expiração do próprio token
+        restante_token = float(claims.get("exp", 0)) - time.time()
+        expira_em = time.monotonic() + min(self.ttl_segundos, restante_token)
+        entrada = _Entrada(token, claims, self.retrato(user), expira_em)
+        with self._lock:
+            if geracao != self._geracao:
+                return
+            self._itens[jti] = entrada
+            self._itens.move_to_end(jti)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    # ----------------------------------------------------------------------------------
+    # RETRATO DO USUÁRIO
+    # ----------------------------------------------------------------------------------
+
+    @staticmethod
+    def retrato(user: User) -> dict:
+        return {campo: copy.deepcopy(getattr(user, campo)) for campo in CAMPOS_RETRATO}
+
+    @staticmethod
+    def materializar(session: Session, retrato: dict) -> User:
+        """
+        Reconstrói o User como instância persistente da sessão, sem SELECT.
+        Cópia por requisição: alterações de um endpoint não vazam para o cache.
+        """
+        user = User(**copy.deepcopy(retrato))
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
+    # ----------------------------------------------------------------------------------
+    # INVALIDAÇÃO (LOCAL + PUB/SUB)
+    # ----------------------------------------------------------------------------------
+
+    def invalidar_token(self, jti: Optional[str]) -> None:
+        """Remove um token de todos os workers (ex: logout)."""
+        if jti:
+            self._remover_token(jti)
+            self._publicar(f"jti:{jti}")
+
+    def invalidar_usuario(self, user_id: int) -> None:
+        """Remove todos os tokens de um usuário em todos os workers (perfil, senha, desativação)."""
+        self._remover_usuario(user_id)
+        self._publicar(f"user:{user_id}")
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._geracao += 1
+            self._itens.clear()
+
+    def _remover_token(self, jti: str) -> None:
+        with self._lock:
+            self._geracao += 1
+            self._itens.pop(jti, None)
+
+    def _remover_usuario(self, user_id: int) -> None:
+        # Invalidações são raras: varrer o LRU evita manter um índice reverso por usuário.
+        with self._lock:
+            self._geracao += 1
+            for jti in [j for j, e in self._itens.items() if e.retrato["id"] == user_id]:
+                del self._itens[jti]
+
+    def _cliente(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self._redis_url, decode_responses=True)
+        return self._redis
+
+    def _publicar(self, mensagem: str) -> None:
+        try:
+            self._cliente().publish(CANAL_INVALIDACAO, mensagem)
+        except redis.RedisError as e:
+            logger.warning(f"[PrincipalCache] Falha ao publicar invalidação '{mensagem}': {e}")
+
+    def _aplicar(self, mensagem: str) -> None:
+        tipo, _, valor = mensagem.partition(":")
+        if tipo == "jti":
+            self._remover_token(valor)
+        elif tipo == "user" and valor.isdigit():
+            self._remover_usuario(int(valor))
+
+    def _garantir_ouvinte(self) -> None:
+        if self._ouvinte is not None:
+            return
+        with self._lock:
+            if self._ouvinte is None:
+                self._ouvinte = threading.Thread(target=self._ouvir, name="principal-cache-pubsub", daemon=True)
+                self._ouvinte.start()
+
+    def _ouvir(self) -> None:
+        """Loop do assinante (thread daemon). Reconecta com espera fixa em caso de falha."""
+        while True:
+            try:
+                pubsub = self._cliente().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CANAL_INVALIDACAO)
+                self._assinado = True
+                for mensagem in pubsub.listen():
+                    if mensagem.get("type") == "message":
+                        self._aplicar(mensagem["data"])
+            except Exception as e:
+                if self._assinado:
+                    logger.warning(f"[PrincipalCache] Assinatura Pub/Sub perdida ({e}). Cache desligado até reconectar.")
+            # Invalidações podem ter sido perdidas durante a queda: descarta tudo.
+            self._assinado = False
+            self.limpar()
+            time.sleep(ESPERA_RECONEXAO_SEGUNDOS)
+
+
+# Instância única por processo (worker)
+principal_cache = PrincipalCache(
+    capacidade=settings.PRINCIPAL_CACHE_SIZE,
+    ttl_segundos=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    redis_url=settings.REDIS_URL,
+)
@@ -15,6 +15,8 @@ RESPONSABILIDADES:
     2. Gerar hashes seguros para armazenamento (Data at Rest).
     3. Verificar correspondência de senhas (Login).
     4. Emitir tokens de acesso assinados para autenticação stateless.
+    5. Executar o bcrypt em um pool de PROCESSOS dedicado e limitado, com descarte
+       rápido (503) quando a fila enche, e re-hash transparente no login.
 
 COMUNICAÇÃO:
     - Utilizado por: app.api.endpoints.auth (Login), app.services.user (Cadastro/Update).
@@ -23,8 +25,13 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
+import multiprocessing
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -36,7 +43,14 @@ from app.core.timezone import now_utc # [NOVO] Import padronizado
 # Configura o contexto de criptografia (Passlib).
 # 'bcrypt' é escolhido por ser lento intencionalmente (work factor), dificultando
 # ataques de força bruta e rainbow tables. 'deprecated="auto"' permite rotação de hashes antigos.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# [NOVO] min/max = BCRYPT_ROUNDS: hashes com outro custo são marcados para re-hash no login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 # Expõe o algoritmo para ser reutilizado na validação de tokens em outros módulos (deps.py)
 ALGORITHM = settings.ALGORITHM
@@ -67,7 +81,8 @@ def create_access_token(subject: Union[str, Any], expires_delta: timedelta = Non
     # 'exp': Expiration Time (Segurança: tokens devem morrer eventualmente)
     # 'sub': Subject (Quem é o dono do token)
     # 'type': 'access' (Diferenciação explícita)
-    to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    # 'jti': JWT ID único (chave do cache de principal e das revogações)
+    to_encode = {"exp": expire, "sub": str(subject), "type": "access", "jti": uuid.uuid4().hex}
     
     # Assina o token usando a chave privada (SECRET_KEY)
     # Isso garante integridade: se o payload for alterado pelo cliente, a assinatura será inválida.
@@ -84,20 +99,83 @@ def create_refresh_token(subject: Union[str, Any], expires_delta: timedelta = No
     else:
         expire = now_utc() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     
-    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
+    to_encode = {"exp": expire, "sub": str(subject), "type": "refresh", "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+# --------------------------------------------------------------------------------------
+# POOL DE HASHING (BCRYPT FORA DO THREADPOOL DA API)
+# --------------------------------------------------------------------------------------
+# O bcrypt leva centenas de ms de CPU. Executado inline, uma rajada de logins ocupa as
+# threads compartilhadas do FastAPI e trava endpoints não relacionados. Aqui ele roda em
+# processos dedicados; a quantidade de operações em andamento + na fila é limitada e o
+# excedente é recusado na hora (PasswordPoolSaturado -> 503 em app.main).
+
+class PasswordPoolSaturado(Exception):
+    """Pool de hashing sem vagas (carga acima de PASSWORD_POOL_WORKERS + PASSWORD_POOL_FILA)."""
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_vagas = threading.BoundedSemaphore(max(1, settings.PASSWORD_POOL_WORKERS + settings.PASSWORD_POOL_FILA))
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # 'spawn': processos limpos, sem herdar threads/conexões do worker da API
+                _pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _pool
+
+def _executar(funcao: Callable, *args):
+    """Executa `funcao` no pool (ou inline se PASSWORD_POOL_WORKERS=0, ex: scripts)."""
+    global _pool
+    if settings.PASSWORD_POOL_WORKERS <= 0:
+        return funcao(*args)
+    if not _vagas.acquire(blocking=False):
+        raise PasswordPoolSaturado()
+    try:
+        futuro = _executor().submit(funcao, *args)
+    except BaseException:
+        _vagas.release()
+        raise
+    futuro.add_done_callback(lambda _: _vagas.release())
+    try:
+        return futuro.result()
+    except BrokenProcessPool:
+        _pool = None # Um processo morreu: o próximo uso recria o pool
+        raise
+
+# Funções executadas DENTRO dos processos do pool (precisam ser de nível de módulo)
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+def _verificar(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+def _verificar_e_atualizar(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifica se a senha em texto plano corresponde ao hash armazenado.
     Utilizado durante o processo de Login.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return _executar(_verificar, plain_password, hashed_password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica a senha e, se o hash usa um custo/esquema diferente do configurado,
+    devolve também o novo hash (re-hash transparente no login). Caso contrário, (ok, None).
+    """
+    return _executar(_verificar_e_atualizar, plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """
     Gera um hash irreversível da senha usando Bcrypt + Salt automático.
     Deve ser chamado antes de salvar/atualizar qualquer senha no banco de dados.
     """
-    return pwd_context.hash(password)
\ No newline at end of file
+    return _executar(_hash, password)
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+=======================================================================================
+ARQUIVO: token_revocation.py (Revogação de Tokens por 'jti')
+=======================================================================================
+
+OBJETIVO:
+    Revogar tokens JWT (logout, rotação de refresh) guardando apenas o 'jti' (32 chars)
+    em vez do token inteiro, e responder "não revogado" (o caso comum) sem ida à rede.
+
+PARTE DO SISTEMA:
+    Backend / Core (Security Layer).
+
+RESPONSABILIDADES:
+    1. Registrar revogações: chave `revogado:{jti}` (TTL = vida restante do token) +
+       evento no stream `auth:revogacoes` (aparado por tempo com MINID).
+    2. Manter, por worker, um Filtro de Bloom dos jtis revogados, sincronizado do stream
+       por uma thread (XREAD bloqueante) e reconstruído periodicamente (descarta expirados).
+    3. Consulta: filtro diz "não" -> não revogado (zero rede). Filtro diz "talvez" ->
+       confirma com EXISTS no Redis. Sem sincronia (boot, queda) -> sempre consulta o Redis.
+    4. Compatibilidade: tokens antigos sem 'jti' continuam na chave legada `blacklist:{token}`.
+
+COMUNICAÇÃO:
+    - Utilizado por: app.api.deps (get_current_user), app.services.auth (logout/refresh).
+    - Config: settings.REVOGACAO_BLOOM_CAPACIDADE, settings.REVOGACAO_BLOOM_TAXA_FP,
+      settings.REVOGACAO_RECONSTRUCAO_SEGUNDOS, settings.REFRESH_TOKEN_EXPIRE_DAYS.
+
+=======================================================================================
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+
+from app.core.config import settings
+from app.utils.bloom import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+STREAM_REVOGACOES = "auth:revogacoes"
+PREFIXO_REVOGADO = "revogado:"
+PREFIXO_LEGADO = "blacklist:"
+
+# Leitura do stream: tempo máximo bloqueado por XREAD e tamanho das páginas
+BLOQUEIO_XREAD_MS = 5000
+PAGINA_STREAM = 5000
+ESPERA_RECONEXAO_SEGUNDOS = 5.0
+
+
+class TokenRevocation:
+    """Registro de revogações + Filtro de Bloom local (um por worker)."""
+
+    def __init__(self, redis_url: str):
+        self._redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
+        self._filtro: Optional[BloomFilter] = None
+        self._ultimo_id = "0-0"
+        self._sincronizado = False
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _cliente(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self._redis_url, decode_responses=True)
+        return self._redis
+
+    # ----------------------------------------------------------------------------------
+    # ESCRITA
+    # ----------------------------------------------------------------------------------
+
+    def revogar(self, jti: Optional[str], exp: float, token: Optional[str] = None) -> None:
+        """
+        Revoga até a expiração natural (`exp`, epoch em segundos).
+        `token` só é usado para tokens legados (sem 'jti').
+        """
+        ttl = int(exp - time.time())
+        if ttl <= 0:
+            return
+        cliente = self._cliente()
+        if not jti:
+            if token:
+                cliente.setex(f"{PREFIXO_LEGADO}{token}", ttl, "revoked")
+            return
+
+        # Eventos mais antigos que a vida máxima de um token não revogam mais nada
+        corte_ms = int((time.time() - settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400) * 1000)
+        pipe = cliente.pipeline()
+        pipe.setex(f"{PREFIXO_REVOGADO}{jti}", ttl, "1")
+        pipe.xadd(STREAM_REVOGACOES, {"jti": jti}, minid=corte_ms, approximate=True)
+        pipe.execute()
+
+        # Este worker enxerga a revogação imediatamente (os demais via stream)
+        filtro = self._filtro
+        if filtro is not None:
+            with self._lock:
+                filtro.add(jti)
+
+    # ----------------------------------------------------------------------------------
+    # LEITURA
+    # ----------------------------------------------------------------------------------
+
+    def esta_revogado(self, jti: Optional[str], token: Optional[str] = None) -> bool:
+        if not jti:
+            return bool(token) and bool(self._cliente().exists(f"{PREFIXO_LEGADO}{token}"))
+
+        self._garantir_sincronizador()
+        filtro = self._filtro
+        if self._sincronizado and filtro is not None and jti not in filtro:
+            return False # Caso comum: resposta local, sem rede
+        return bool(self._cliente().exists(f"{PREFIXO_REVOGADO}{jti}"))
+
+    # ----------------------------------------------------------------------------------
+    # SINCRONIZAÇÃO DO FILTRO (THREAD)
+    # ----------------------------------------------------------------------------------
+
+    def _garantir_sincronizador(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sincronizar, name="token-revocation-stream", daemon=True)
+                self._thread.start()
+
+    def _reconstruir(self, cliente: redis.Redis) -> None:
+        """Lê o stream inteiro (já aparado por tempo) para um filtro novo e troca a referência."""
+        filtro = BloomFilter(settings.REVOGACAO_BLOOM_CAPACIDADE, settings.REVOGACAO_BLOOM_TAXA_FP)
+        inicio, ultimo_id = "-", "0-0"
+        while True:
+            pagina = cliente.xrange(STREAM_REVOGACOES, min=inicio, max="+", count=PAGINA_STREAM)
+            for id_evento, campos in pagina:
+                filtro.add(campos.get("jti", ""))
+                ultimo_id = id_evento
+            if len(pagina) < PAGINA_STREAM:
+                break
+            inicio = f"({ultimo_id}" # Intervalo exclusivo: continua após o último lido
+        with self._lock:
+            self._filtro, self._ultimo_id = filtro, ultimo_id
+        logger.info(f"[Revogação] Filtro reconstruído com {filtro.itens} jtis ({filtro.num_bits // 8 // 1024} KB).")
+
+    def _sincronizar(self) -> None:
+        while True:
+            try:
+                cliente = self._cliente()
+                self._reconstruir(cliente)
+                self._sincronizado = True
+                reconstruido_em = time.monotonic()
+                while time.monotonic() - reconstruido_em < settings.REVOGACAO_RECONSTRUCAO_SEGUNDOS:
+                    resposta = cliente.xread({STREAM_REVOGACOES: self._ultimo_id}, count=PAGINA_STREAM, block=BLOQUEIO_XREAD_MS)
+                    for _, eventos in resposta or []:
+                        with self._lock:
+                            for id_evento, campos in eventos:
+                                self._filtro.add(campos.get("jti", ""))
+                                self._ultimo_id = id_evento
+            except Exception as e:
+                if self._sincronizado:
+                    logger.warning(f"[Revogação] Stream indisponível ({e}). Consultando o Redis a cada requisição.")
+                self._sincronizado = False
+                time.sleep(ESPERA_RECONEXAO_SEGUNDOS)
+
+
+# Instância única por processo (worker)
+token_revocation = TokenRevocation(settings.REDIS_URL)
@@ -0,0 +1,106 @@
+"""
+=======================================================================================
+ARQUIVO: async_db.py (Acesso ao Banco para Endpoints Assíncronos)
+=======================================================================================
+
+OBJETIVO:
+    Permitir que endpoints `async def` consultem o banco SEM bloquear o event loop,
+    com a mesma API nos dois modos de execução.
+
+PARTE DO SISTEMA:
+    Backend / Core Infrastructure.
+
+RESPONSABILIDADES:
+    1. Modo assíncrono (ASYNC_DB_ENABLED): executa em uma AsyncSession (aiosqlite/asyncpg).
+    2. Modo padrão: executa na Session síncrona dentro do threadpool (run_in_threadpool).
+    3. Materializar resultados por completo dentro da unidade de execução (lista de
+       objetos/linhas), para que nenhum I/O escape para o event loop.
+    4. `run_sync`: variante assíncrona de QUALQUER service síncrono existente
+       (AsyncSession.run_sync ou thread), sem duplicar as queries.
+    5. `consultar_em_paralelo`: consultas independentes em sessões/conexões separadas,
+       executadas ao mesmo tempo.
+
+COMUNICAÇÃO:
+    - Criado por: app.api.deps.get_async_db.
+    - Utilizado por: app.api.v1.endpoints.ai (coleta de contexto das IAs) e
+      app.services.ai.context_builder (consultas paralelas).
+
+REGRA:
+    Objetos ORM retornados devem vir com os relacionamentos necessários já carregados
+    (selectinload/joinedload). No modo assíncrono, lazy loading levanta MissingGreenlet.
+=======================================================================================
+"""
+
+import asyncio
+from typing import Any, Callable, List, Union
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.session import AsyncSessionLocal, SessionLocal
+
+
+class AsyncDB:
+    """Fachada assíncrona sobre AsyncSession (opt-in) ou Session síncrona (threadpool)."""
+
+    def __init__(self, session: Union[AsyncSession, Session]):
+        self.session = session
+
+    @property
+    def assincrono(self) -> bool:
+        return isinstance(self.session, AsyncSession)
+
+    async def run_sync(self, funcao: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executa `funcao(session_sincrona, *args, **kwargs)` fora do event loop."""
+        if self.assincrono:
+            return await self.session.run_sync(funcao, *args, **kwargs)
+        return await run_in_threadpool(funcao, self.session, *args, **kwargs)
+
+    async def scalars(self, stmt) -> List[Any]:
+        """Lista de entidades/valores da primeira coluna (ex: select(Model))."""
+        if self.assincrono:
+            return (await self.session.execute(stmt)).scalars().all()
+        return await run_in_threadpool(lambda: self.session.execute(stmt).scalars().all())
+
+    async def all(self, stmt) -> List[Any]:
+        """Lista de linhas (tuplas nomeadas), para projeções e agregações."""
+        if self.assincrono:
+            return (await self.session.execute(stmt)).all()
+        return await run_in_threadpool(lambda: self.session.execute(stmt).all())
+
+    async def scalar(self, stmt) -> Any:
+        if self.assincrono:
+            return (await self.session.execute(stmt)).scalar()
+        return await run_in_threadpool(lambda: self.session.execute(stmt).scalar())
+
+    async def commit(self) -> None:
+        if self.assincrono:
+            await self.session.commit()
+        else:
+            await run_in_threadpool(self.session.commit)
+
+
+# --------------------------------------------------------------------------------------
+# CONSULTAS INDEPENDENTES EM PARALELO
+# --------------------------------------------------------------------------------------
+
+async def _consultar_em_sessao_propria(stmt) -> List[Any]:
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            return (await session.execute(stmt)).all()
+
+    def executar() -> List[Any]:
+        with SessionLocal() as session:
+            return session.execute(stmt).all()
+    return await run_in_threadpool(executar)
+
+async def consultar_em_paralelo(*stmts) -> List[List[Any]]:
+    """
+    [NOVO] Executa consultas independentes ao mesmo tempo, cada uma em sua própria
+    sessão (= conexão própria do pool), e devolve as linhas na ordem dos `stmts`.
+
+    Pensado para projeções de colunas (select(Model.a, Model.b)): linhas são tuplas
+    leves, sem identity map nem objetos ORM compartilhados entre sessões.
+    """
+    return list(await asyncio.gather(*(_consultar_em_sessao_propria(stmt) for stmt in stmts)))
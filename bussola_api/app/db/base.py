@@ -38,7 +38,8 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.financas import Categoria, Transacao
 from app.models.registros import Anotacao, Link
-from app.models.cofre import Segredo
+from app.models.cofre import Segredo, CofreRotacaoChave, CofreContador
+from app.models.system import SistemaEstado
 from app.models.agenda import Compromisso
 
 # Módulo Ritmo (Saúde e Performance)
@@ -15,6 +15,7 @@ RESPONSABILIDADES:
     2. Aplicar configurações específicas de driver (ex: SQLite vs Postgres).
     3. Configurar a estratégia de "Ping" para manter conexões vivas.
     4. Prover a fábrica `SessionLocal` para injeção de dependência nas rotas.
+    5. [NOVO] Engine/sessões assíncronas opcionais (ASYNC_DB_ENABLED): `AsyncSessionLocal`.
 
 COMUNICAÇÃO:
     - Recebe config de: app.core.config.settings
@@ -23,7 +24,10 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
+from typing import Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
@@ -58,4 +62,31 @@ engine = create_engine(
 # autocommit=False:
 # Garante controle transacional explícito. Alterações só persistem com db.commit().
 # Isso é crucial para integridade de dados e rollbacks em caso de erro.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# --------------------------------------------------------------------------------------
+# ENGINE ASSÍNCRONA (OPT-IN)
+# --------------------------------------------------------------------------------------
+# Mesmo banco, driver assíncrono. Só é criada com ASYNC_DB_ENABLED=true, para que
+# aiosqlite/asyncpg não sejam exigidos em instalações que não usam o modo assíncrono.
+DRIVERS_ASSINCRONOS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+def to_async_url(url: str) -> str:
+    """Troca o driver da URL síncrona pelo equivalente assíncrono (ex: psycopg2 -> asyncpg)."""
+    url_obj = make_url(url)
+    backend = url_obj.get_backend_name()
+    if backend not in DRIVERS_ASSINCRONOS:
+        raise ValueError(f"Sem driver assíncrono configurado para '{backend}'. Defina ASYNC_DATABASE_URL.")
+    return url_obj.set(drivername=DRIVERS_ASSINCRONOS[backend]).render_as_string(hide_password=False)
+
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+if settings.ASYNC_DB_ENABLED:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or to_async_url(settings.DATABASE_URL),
+        pool_pre_ping=True
+    )
+    # expire_on_commit=False: objetos continuam legíveis após o commit sem novo I/O
+    # (lazy load implícito não é permitido em AsyncSession).
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
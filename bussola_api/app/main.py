@@ -16,6 +16,7 @@ RESPONSABILIDADES:
     3. Instanciar o servidor FastAPI com metadados do projeto.
     4. Configurar segurança de acesso via navegador (CORS).
     5. Centralizar e incluir todas as rotas (endpoints) da versão v1.
+    6. [NOVO] Encerrar recursos no shutdown (lifespan): pool do engine assíncrono.
 
 COMUNICAÇÃO:
     - Importa configurações de: app.core.config.
@@ -35,18 +36,24 @@ import os
 load_dotenv()
 # -------------------------------------
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse # Necessário para servir o HTML do Scalar
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse # HTML: Scalar / JSON: handlers de erro
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import settings
+from app.core.security import PasswordPoolSaturado
 from app.api.v1.router import api_router
+from app.db import session as db_session
 from app.db.session import engine
 # Importamos 'base' para garantir que todos os Models sejam lidos pelo SQLAlchemy
 from app.db import base 
+from app.services.search import search_service
+from app.services.taco import taco_index
 
 # --------------------------------------------------------------------------------------
 # INICIALIZAÇÃO DO BANCO DE DADOS
@@ -57,11 +64,30 @@ from app.db import base
 # mas é útil para garantir que o banco exista em desenvolvimento/testes.
 base.Base.metadata.create_all(bind=engine)
 
+# [NOVO] Índice de Busca Full-Text (FTS5 no SQLite / tsvector+GIN no PostgreSQL).
+# Não é representável no metadata declarativo, por isso tem DDL próprio (idempotente).
+search_service.ensure_schema(engine)
+
+# [NOVO] Tabela TACO carregada uma única vez em memória (busca de alimentos sem I/O).
+taco_index.load()
+
+# --------------------------------------------------------------------------------------
+# CICLO DE VIDA (LIFESPAN) - [NOVO]
+# --------------------------------------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Com ASYNC_DB_ENABLED, o pool mantém conexões (no SQLite, threads do aiosqlite que
+    # não são daemon): sem o dispose o processo não termina após o SIGINT/SIGTERM.
+    if db_session.async_engine is not None:
+        await db_session.async_engine.dispose()
+
 # --------------------------------------------------------------------------------------
 # DEFINIÇÃO DA APLICAÇÃO
 # --------------------------------------------------------------------------------------
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
     # Define a URL onde o JSON do OpenAPI (Swagger) será servido
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     
@@ -80,6 +106,19 @@ limiter = Limiter(key_func=get_remote_address)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+# --------------------------------------------------------------------------------------
+# LOAD SHEDDING DO BCRYPT - [NOVO]
+# --------------------------------------------------------------------------------------
+# Pool de hashing cheio: recusa imediatamente (503 + Retry-After) em vez de enfileirar
+# e prender threads da API (ver app.core.security).
+@app.exception_handler(PasswordPoolSaturado)
+async def password_pool_saturado_handler(request: Request, exc: PasswordPoolSaturado):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Muitas autenticações simultâneas. Tente novamente em instantes."},
+        headers={"Retry-After": "1"},
+    )
+
 # --------------------------------------------------------------------------------------
 # CONFIGURAÇÃO DE SEGURANÇA (CORS)
 # --------------------------------------------------------------------------------------
@@ -35,7 +35,8 @@ from .registros import (
     Subtarefa
 )
 
-from .cofre import Segredo
+from .cofre import Segredo, CofreRotacaoChave, CofreContador
+from .system import SistemaEstado
 
 # Módulo Ritmo (Saúde & Performance)
 # Agrupa entidades de Biometria, Treino Físico e Nutrição
@@ -22,8 +22,8 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from sqlalchemy import Column, Integer, String, Text, Date, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship, deferred
 from app.db.base_class import Base
 from app.core.timezone import now_utc # [NOVO]
 
@@ -44,8 +44,58 @@ class Segredo(Base):
     # Intenção: Ocultar o acesso direto ao valor bruto no objeto Python.
     # O valor armazenado aqui JÁ DEVE estar criptografado (Fernet/AES) pela camada de serviço.
     # Nunca salvar texto plano nesta coluna.
-    valor_criptografado = Column("_valor_criptografado", String(500), nullable=False)
+    # [OTIMIZAÇÃO] deferred: o ciphertext só é carregado quando acessado explicitamente,
+    # nunca em listagens de metadados.
+    valor_criptografado = deferred(Column("_valor_criptografado", String(500), nullable=False))
 
     # [SEGURANÇA / MULTI-TENANCY]
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
-    user = relationship("User", back_populates="segredos")
\ No newline at end of file
+    user = relationship("User", back_populates="segredos")
+
+    # [OTIMIZAÇÃO] Contagem de expirados por usuário e varredura diária de vencimentos
+    # viram range scans no índice, em vez de varrer a tabela.
+    __table_args__ = (
+        Index("ix_segredo_user_expiracao", "user_id", "data_expiracao"),
+        Index("ix_segredo_expiracao", "data_expiracao"), # Digest diário (todos os usuários)
+    )
+
+
+class CofreContador(Base):
+    """
+    [NOVO] Contadores do cofre por usuário (KPIs do Panorama), recalculados nas escritas.
+
+    Como "expirado" depende da data de hoje, guardamos também a próxima data de
+    expiração: enquanto hoje <= proxima_expiracao, os números continuam válidos sem
+    nenhuma consulta em 'segredo'. Depois disso, o service recalcula uma única vez.
+    """
+    __tablename__ = 'cofre_contador'
+
+    user_id = Column(Integer, ForeignKey("user.id"), primary_key=True)
+    total = Column(Integer, default=0, nullable=False)
+    expirados = Column(Integer, default=0, nullable=False)
+    proxima_expiracao = Column(Date, nullable=True) # Menor data_expiracao >= calculado_em
+    calculado_em = Column(Date, nullable=False)
+
+
+class CofreRotacaoChave(Base):
+    """
+    [NOVO] Progresso (watermark) do job de re-criptografia após troca da ENCRYPTION_KEY.
+
+    Uma linha por chave primária (identificada por fingerprint, nunca pela chave em si).
+    `ultimo_id` é gravado na MESMA transação de cada lote re-criptografado, então o job
+    pode ser interrompido a qualquer momento e retomado do ponto exato.
+    """
+    __tablename__ = 'cofre_rotacao_chave'
+
+    id = Column(Integer, primary_key=True, index=True)
+    chave_id = Column(String(16), unique=True, nullable=False)
+
+    ultimo_id = Column(Integer, default=0, nullable=False)
+    processados = Column(Integer, default=0, nullable=False)
+    reescritos = Column(Integer, default=0, nullable=False)
+    falhas = Column(Integer, default=0, nullable=False) # Tokens que nenhuma chave conhecida abre
+
+    iniciado_em = Column(DateTime, default=now_utc)
+    atualizado_em = Column(DateTime, default=now_utc, onupdate=now_utc)
+    concluido_em = Column(DateTime, nullable=True)
+
@@ -20,8 +20,8 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, Text, DateTime, ForeignKey, Enum
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy import Column, Integer, SmallInteger, String, Boolean, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship, backref, validates
 from app.db.base_class import Base
 from app.core.timezone import now_utc # [NOVO]
 import enum
@@ -32,6 +32,20 @@ class StatusTarefa(str, enum.Enum):
     EM_ANDAMENTO = "Em andamento"
     CONCLUIDO = "Concluído"
 
+# [NOVO] Rank numérico da prioridade (menor = mais urgente).
+# A API continua trafegando a string; o rank existe apenas para ordenação/agrupamento indexável.
+PRIORIDADE_RANK = {
+    "Crítica": 1,
+    "Alta": 2,
+    "Média": 3,
+    "Baixa": 4,
+}
+PRIORIDADE_RANK_DESCONHECIDA = 5
+
+def rank_prioridade(prioridade: str) -> int:
+    """Converte a prioridade textual no rank ordenável (valores fora do padrão vão para o fim)."""
+    return PRIORIDADE_RANK.get(prioridade, PRIORIDADE_RANK_DESCONHECIDA)
+
 class GrupoAnotacao(Base):
     """
     Agrupador de notas (semelhante a cadernos ou pastas).
@@ -58,6 +72,9 @@ class Anotacao(Base):
     id = Column(Integer, primary_key=True, index=True)
     titulo = Column(String(200), nullable=True)
     conteudo = Column(Text, nullable=True)
+    # [NOVO] SHA-256 de (titulo, conteudo, links). Permite que o autosave detecte
+    # um payload idêntico ao persistido e pule todas as escritas.
+    conteudo_hash = Column(String(64), nullable=True)
     
     # Dashboard: Notas fixadas aparecem no topo ou na home.
     fixado = Column(Boolean, default=False)
@@ -73,6 +90,11 @@ class Anotacao(Base):
     # Cascade Delete: Se apagar a nota, apaga os links associados.
     links = relationship("Link", back_populates="anotacao", cascade="all, delete-orphan")
 
+    # [NOVO] Índice do feed paginado por mês (filtro por usuário/fixado + range de datas).
+    __table_args__ = (
+        Index("ix_anotacao_user_fixado_data", "user_id", "fixado", "data_criacao"),
+    )
+
 class Link(Base):
     """
     Recurso auxiliar para salvar URLs dentro de uma anotação.
@@ -96,6 +118,9 @@ class Tarefa(Base):
     descricao = Column(Text, nullable=True)
     
     prioridade = Column(String(20), default="Média")
+    # [NOVO] Espelho numérico de 'prioridade', mantido pelo @validates abaixo.
+    # Atualizações em lote (Query.update) devem gravar os DOIS campos.
+    prioridade_rank = Column(SmallInteger, nullable=False, default=PRIORIDADE_RANK["Média"], server_default="3")
     prazo = Column(DateTime, nullable=True)
     
     # Usa os valores do Enum definido no topo
@@ -112,6 +137,24 @@ class Tarefa(Base):
     # Cascade Delete: Apagar a tarefa remove todas as subtarefas recursivamente.
     subtarefas = relationship("Subtarefa", back_populates="tarefa", cascade="all, delete-orphan")
 
+    @validates("prioridade")
+    def _sincronizar_rank(self, key, value):
+        self.prioridade_rank = rank_prioridade(value)
+        return value
+
+# [NOVO] Índice da fila de tarefas: serve o filtro por usuário/status e a ordenação
+# (rank, prazo, id DESC) do dashboard e de consultas top-N, sem sort em memória.
+# Parcial (só tarefas abertas): o predicado `status != 'Concluído'` das consultas casa com
+# o WHERE do índice, e o status sai das colunas-chave (uma desigualdade no meio quebraria
+# a ordem). 'prazo IS NULL' entra como chave explícita: NULLs por último no PostgreSQL e
+# no SQLite, sem depender de NULLS LAST (que o SQLite não entrega pelo índice).
+TAREFA_ABERTA = Tarefa.status != StatusTarefa.CONCLUIDO.value
+Index(
+    "ix_tarefa_fila_prioridade",
+    Tarefa.user_id, Tarefa.prioridade_rank, Tarefa.prazo.is_(None), Tarefa.prazo, Tarefa.id.desc(),
+    postgresql_where=TAREFA_ABERTA, sqlite_where=TAREFA_ABERTA,
+)
+
 class Subtarefa(Base):
     """
     Item de checklist ou passo menor de uma Tarefa.
@@ -21,11 +21,14 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from app.core.timezone import now_utc # [NOVO]
 
+# [NOVO] Grupo usado quando o exercício não tem grupo_muscular (volume semanal e agentes do Coach)
+GRUPO_MUSCULAR_PADRAO = "Outros"
+
 # ==========================================================
 # 1. TABELA DE BIO-DADOS (Corpo & Metas)
 # ==========================================================
@@ -66,6 +69,11 @@ class RitmoBio(Base):
 
     user = relationship("User", back_populates="ritmo_bios")
 
+    # [OTIMIZAÇÃO] Atende o "último registro" e a série temporal por intervalo de datas.
+    __table_args__ = (
+        Index("ix_ritmo_bio_user_data", "user_id", "data_registro"),
+    )
+
 
 # ==========================================================
 # 2. TABELAS DE TREINO (Plano -> Dia -> Exercicio)
@@ -97,7 +105,7 @@ class RitmoDiaTreino(Base):
     __tablename__ = 'ritmo_dia_treino'
 
     id = Column(Integer, primary_key=True, index=True)
-    plano_id = Column(Integer, ForeignKey('ritmo_plano_treino.id'))
+    plano_id = Column(Integer, ForeignKey('ritmo_plano_treino.id'), index=True)
     
     nome = Column(String) 
     ordem = Column(Integer, default=0) # Ordenação na UI
@@ -113,7 +121,7 @@ class RitmoExercicioItem(Base):
     __tablename__ = 'ritmo_exercicio_item'
 
     id = Column(Integer, primary_key=True, index=True)
-    dia_treino_id = Column(Integer, ForeignKey('ritmo_dia_treino.id'))
+    dia_treino_id = Column(Integer, ForeignKey('ritmo_dia_treino.id'), index=True)
     
     # Metadados do Exercício
     nome_exercicio = Column(String) 
@@ -149,6 +157,11 @@ class RitmoDietaConfig(Base):
     
     # Soma total das calorias de todos os alimentos (Cache para performance).
     calorias_calculadas = Column(Float, default=0) 
+    # [OTIMIZAÇÃO] Totais de macros da dieta, mantidos incrementalmente (delta dos itens)
+    # pelo RitmoService. Ler o resumo da dieta não precisa percorrer Refeição -> Alimento.
+    total_proteina = Column(Float, default=0, server_default="0")
+    total_carbo = Column(Float, default=0, server_default="0")
+    total_gordura = Column(Float, default=0, server_default="0")
     
     refeicoes = relationship("RitmoRefeicao", back_populates="dieta", cascade="all, delete-orphan")
     user = relationship("User", back_populates="ritmo_dietas")
@@ -166,6 +179,12 @@ class RitmoRefeicao(Base):
     nome = Column(String) # Ex: "Almoço", "Pós-treino"
     ordem = Column(Integer, default=0)
 
+    # [OTIMIZAÇÃO] Totais da refeição (soma dos alimentos), mantidos incrementalmente.
+    total_calorias = Column(Float, default=0, server_default="0")
+    total_proteina = Column(Float, default=0, server_default="0")
+    total_carbo = Column(Float, default=0, server_default="0")
+    total_gordura = Column(Float, default=0, server_default="0")
+
     dieta = relationship("RitmoDietaConfig", back_populates="refeicoes")
     alimentos = relationship("RitmoAlimentoItem", back_populates="refeicao", cascade="all, delete-orphan")
 
@@ -0,0 +1,65 @@
+"""
+=======================================================================================
+ARQUIVO: system.py (Modelo de Dados - Estado da Instância)
+=======================================================================================
+
+OBJETIVO:
+    Guardar em uma única linha o estado global que antes era derivado de
+    `SELECT COUNT(*) FROM user` a cada chamada (instância inicializada? quantos usuários?).
+
+PARTE DO SISTEMA:
+    Backend / Database Layer.
+
+RESPONSABILIDADES:
+    1. Linha única (id = 1) com o total de usuários e a data do primeiro cadastro.
+    2. Manter o contador atualizado na MESMA transação de qualquer INSERT/DELETE de User
+       (eventos do mapper), cobrindo todos os caminhos: registro, Google, admin e scripts.
+
+COMUNICAÇÃO:
+    - Lido por: app.services.system (GET /system/config e AuthService.register_user).
+    - Observa: app.models.user.User (after_insert / after_delete).
+
+NOTA:
+    Exclusões em massa via Query.delete() não disparam eventos de mapper. Se algum fluxo
+    passar a usá-las em 'user', deve chamar `system_service.recalcular`.
+=======================================================================================
+"""
+
+from sqlalchemy import Column, Integer, DateTime, event, update, func
+from app.db.base_class import Base
+from app.core.timezone import now_utc
+from app.models.user import User
+
+ESTADO_ID = 1
+
+class SistemaEstado(Base):
+    """Estado da instância (linha única)."""
+    __tablename__ = 'sistema_estado'
+
+    id = Column(Integer, primary_key=True, default=ESTADO_ID)
+    total_usuarios = Column(Integer, default=0, nullable=False)
+    # Primeiro cadastro da instância (setup inicial concluído). Nulo = instância nova.
+    inicializado_em = Column(DateTime(timezone=True), nullable=True)
+    atualizado_em = Column(DateTime(timezone=True), default=now_utc, onupdate=now_utc)
+
+
+# --------------------------------------------------------------------------------------
+# SINCRONIZAÇÃO COM A TABELA 'user'
+# --------------------------------------------------------------------------------------
+# UPDATE relativo (total = total ± 1) na conexão da própria transação: atômico entre
+# workers e desfeito junto em caso de rollback. Se a linha ainda não existe, afeta 0
+# linhas e o service a cria com um COUNT completo no primeiro acesso.
+
+def _ajustar_total(connection, delta: int) -> None:
+    valores = {"total_usuarios": SistemaEstado.total_usuarios + delta, "atualizado_em": now_utc()}
+    if delta > 0:
+        valores["inicializado_em"] = func.coalesce(SistemaEstado.inicializado_em, now_utc())
+    connection.execute(update(SistemaEstado).where(SistemaEstado.id == ESTADO_ID).values(**valores))
+
+@event.listens_for(User, "after_insert")
+def _usuario_criado(mapper, connection, target):
+    _ajustar_total(connection, 1)
+
+@event.listens_for(User, "after_delete")
+def _usuario_removido(mapper, connection, target):
+    _ajustar_total(connection, -1)
@@ -90,6 +90,7 @@ class User(Base):
 
     compromissos = relationship("Compromisso", back_populates="user", cascade="all, delete-orphan")
     segredos = relationship("Segredo", back_populates="user", cascade="all, delete-orphan")
+    cofre_contador = relationship("CofreContador", uselist=False, cascade="all, delete-orphan")
     
     categorias_financas = relationship("Categoria", back_populates="user", cascade="all, delete-orphan")
     transacoes = relationship("Transacao", back_populates="user", cascade="all, delete-orphan")
@@ -12,9 +12,9 @@ PARTE DO SISTEMA:
 =======================================================================================
 """
 
-from pydantic import BaseModel
-from typing import Optional
-from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import date, datetime
 
 class SegredoBase(BaseModel):
     titulo: str
@@ -55,4 +55,34 @@ class SegredoValueResponse(BaseModel):
     Schema exclusivo para a rota de 'Copiar Senha / Revelar'.
     Retorna a senha descriptografada.
     """
-    valor: str
\ No newline at end of file
+    valor: str
+
+# [NOVO] Revelação em lote (ex: exportação / "copiar todos" de um serviço)
+class SegredoRevelarLoteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+class SegredoValorItem(BaseModel):
+    id: int
+    valor: str
+
+class SegredoRevelarLoteResponse(BaseModel):
+    """
+    Valores descriptografados dos IDs encontrados.
+    IDs inexistentes (ou de outro usuário) vão para 'nao_encontrados'.
+    """
+    valores: List[SegredoValorItem] = []
+    nao_encontrados: List[int] = []
+
+# [NOVO] Rotação de chave (Admin)
+class CofreRotacaoStatus(BaseModel):
+    chave_id: str
+    ultimo_id: int
+    processados: int
+    reescritos: int
+    falhas: int
+    iniciado_em: Optional[datetime] = None
+    atualizado_em: Optional[datetime] = None
+    concluido_em: Optional[datetime] = None
+    em_execucao: bool = False
+    class Config:
+        from_attributes = True
@@ -12,8 +12,8 @@ PARTE DO SISTEMA:
 =======================================================================================
 """
 
-from pydantic import BaseModel, field_validator
-from typing import List, Optional, ForwardRef, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, ForwardRef, Any, Literal
 from datetime import datetime
 
 # --------------------------------------------------------------------------------------
@@ -65,6 +65,21 @@ class AnotacaoResponse(AnotacaoBase):
     class Config:
         from_attributes = True
 
+class AnotacaoFeedItem(BaseModel):
+    """
+    [NOVO] Nota no feed mensal: sem o `conteudo` HTML, apenas um trecho em texto puro.
+    O corpo completo (visualização/edição) vem de GET /anotacoes/{id}.
+    """
+    id: int
+    titulo: Optional[str] = None
+    trecho: str = ""
+    trecho_truncado: bool = False
+    fixado: bool = False
+    grupo_id: Optional[int] = None
+    data_criacao: datetime
+    links: List[LinkResponse] = []
+    grupo: Optional[GrupoResponse] = None
+
 # --------------------------------------------------------------------------------------
 # TAREFAS E SUBTAREFAS (Recursividade)
 # --------------------------------------------------------------------------------------
@@ -143,12 +158,39 @@ class TarefaResponse(TarefaBase):
     class Config:
         from_attributes = True
 
+# --- OPERAÇÕES EM LOTE ---
+
+class TarefaOperacaoLote(BaseModel):
+    id: int
+    acao: Literal["status", "prioridade", "prazo", "excluir"]
+    status: Optional[str] = None # Obrigatório quando acao='status'
+    prioridade: Optional[str] = None # Obrigatório quando acao='prioridade'
+    prazo: Optional[datetime] = None # acao='prazo' (None remove o prazo)
+
+class TarefasLoteRequest(BaseModel):
+    operacoes: List[TarefaOperacaoLote] = Field(..., min_length=1, max_length=500)
+
+class TarefaLoteResultado(BaseModel):
+    id: int
+    acao: str
+    sucesso: bool
+    erro: Optional[str] = None
+
+class TarefasLoteResponse(BaseModel):
+    resultados: List[TarefaLoteResultado]
+    aplicadas: int
+
 # --------------------------------------------------------------------------------------
 # DASHBOARD REGISTROS
 # --------------------------------------------------------------------------------------
+class AnotacoesFeedResponse(BaseModel):
+    anotacoes_por_mes: dict[str, List[AnotacaoFeedItem]]
+    proximo_cursor: Optional[str] = None # "AAAA-MM" da próxima página (None = fim)
+
 class RegistrosDashboardResponse(BaseModel):
     anotacoes_fixadas: List[AnotacaoResponse]
-    anotacoes_por_mes: dict[str, List[AnotacaoResponse]]
+    anotacoes_por_mes: dict[str, List[AnotacaoFeedItem]] # Apenas a primeira página do feed
+    anotacoes_proximo_cursor: Optional[str] = None
     tarefas_pendentes: List[TarefaResponse]
     tarefas_concluidas: List[TarefaResponse]
     grupos_disponiveis: List[GrupoResponse]
\ No newline at end of file
@@ -12,9 +12,9 @@ PARTE DO SISTEMA:
 =======================================================================================
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 
 # ======================================================================================
 # 1. BIOMETRIA (Corpo e Metas)
@@ -52,6 +52,82 @@ class BioResponse(BioBase):
         from_attributes = True
 
 
+# [NOVO] Série temporal biométrica (gráficos de evolução)
+class BioSeriePonto(BaseModel):
+    data: datetime
+    valor: float
+    media_movel: float
+
+class BioSerieMetrica(BaseModel):
+    pontos: List[BioSeriePonto] = []
+    total_registros: int = 0
+    # Tendência linear sobre TODOS os registros do intervalo (não só os pontos reduzidos)
+    inclinacao_dia: float = 0.0
+    inclinacao_semana: float = 0.0
+
+class BioSeriesResponse(BaseModel):
+    inicio: Optional[datetime] = None
+    fim: Optional[datetime] = None
+    max_pontos: int
+    janela_dias: int
+    metricas: Dict[str, BioSerieMetrica] = {}
+
+
+# [NOVO] Planejador de metas "what-if" (stateless, nada é persistido)
+MAX_CENARIOS_SIMULACAO = 5000
+
+class ProjecaoPeso(BaseModel):
+    peso_inicial: float = Field(..., gt=0)
+    variacao_semanal_kg: float = Field(..., ge=-2, le=2) # negativo = cutting, positivo = bulking
+    semanas: int = Field(..., ge=1, le=104)
+
+    @model_validator(mode='after')
+    def validar_peso_final(self):
+        # A curva é linear: basta o último ponto para garantir que nenhuma semana fique <= 0 kg
+        if self.peso_inicial + self.variacao_semanal_kg * self.semanas <= 0:
+            raise ValueError("A projeção resulta em peso menor ou igual a zero; reduza 'semanas' ou a variação semanal.")
+        return self
+
+class SimulacaoMetabolicaRequest(BaseModel):
+    altura: float = Field(..., gt=0)
+    idade: int = Field(..., gt=0)
+    genero: str
+    # Informe `pesos` (metas avulsas) OU `projecao` (curva semana a semana)
+    pesos: List[float] = []
+    projecao: Optional[ProjecaoPeso] = None
+    niveis_atividade: List[str] = Field(default_factory=lambda: ["moderado"], min_length=1)
+    objetivos: List[str] = Field(default_factory=lambda: ["manutencao"], min_length=1)
+
+    @model_validator(mode='after')
+    def validar_grade(self):
+        if self.pesos and self.projecao:
+            raise ValueError("Informe 'pesos' OU 'projecao', não ambos.")
+        if any(peso <= 0 for peso in self.pesos):
+            raise ValueError("Todos os 'pesos' devem ser maiores que zero.")
+        qtd_pesos = self.projecao.semanas + 1 if self.projecao else len(self.pesos)
+        if qtd_pesos == 0:
+            raise ValueError("Informe 'pesos' ou 'projecao'.")
+        if qtd_pesos * len(self.niveis_atividade) * len(self.objetivos) > MAX_CENARIOS_SIMULACAO:
+            raise ValueError(f"A simulação excede o limite de {MAX_CENARIOS_SIMULACAO} cenários.")
+        return self
+
+class CenarioMetabolico(BaseModel):
+    semana: Optional[int] = None
+    peso: float
+    nivel_atividade: str
+    objetivo: str
+    tmb: float
+    gasto_calorico_total: float
+    meta_proteina: float
+    meta_carbo: float
+    meta_gordura: float
+    meta_agua: float
+
+class SimulacaoMetabolicaResponse(BaseModel):
+    total: int
+    cenarios: List[CenarioMetabolico] = []
+
+
 # ======================================================================================
 # 2. TREINO (Estrutura Hierárquica)
 # ======================================================================================
@@ -148,13 +224,17 @@ class RefeicaoResponse(RefeicaoBase):
     id: int
     dieta_id: int
     alimentos: List[AlimentoItemResponse] = []
+
+    # [OTIMIZAÇÃO] Totais persistidos (mantidos incrementalmente pelo service)
+    total_calorias: float = 0
+    total_proteina: float = 0
+    total_carbo: float = 0
+    total_gordura: float = 0
     
     @property
     def total_calorias_refeicao(self) -> float:
-        """Cálculo on-the-fly do total calórico desta refeição."""
-        if not self.alimentos:
-            return 0.0
-        return sum(a.calorias for a in self.alimentos)
+        """Total calórico desta refeição (lido do total persistido)."""
+        return self.total_calorias
 
     class Config:
         from_attributes = True
@@ -170,6 +250,29 @@ class DietaConfigCreate(DietaConfigBase):
 class DietaConfigResponse(DietaConfigBase):
     id: int
     calorias_calculadas: float
+    total_proteina: float = 0
+    total_carbo: float = 0
+    total_gordura: float = 0
     refeicoes: List[RefeicaoResponse] = []
+    class Config:
+        from_attributes = True
+
+# [NOVO] Resumo da dieta: apenas totais (Dieta + Refeições), sem a lista de alimentos.
+class RefeicaoResumoResponse(RefeicaoBase):
+    id: int
+    total_calorias: float = 0
+    total_proteina: float = 0
+    total_carbo: float = 0
+    total_gordura: float = 0
+    class Config:
+        from_attributes = True
+
+class DietaResumoResponse(DietaConfigBase):
+    id: int
+    calorias_calculadas: float
+    total_proteina: float = 0
+    total_carbo: float = 0
+    total_gordura: float = 0
+    refeicoes: List[RefeicaoResumoResponse] = []
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,29 @@
+"""
+=======================================================================================
+ARQUIVO: search.py (Schemas - Busca Unificada)
+=======================================================================================
+
+OBJETIVO:
+    Definir o contrato de resposta da busca Full-Text entre módulos
+    (Notas, Tarefas, Agenda e Finanças).
+=======================================================================================
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class SearchResultItem(BaseModel):
+    dominio: str # 'anotacao' | 'tarefa' | 'compromisso' | 'transacao'
+    id: int # ID do registro de origem (para navegação no Frontend)
+    titulo: str
+    trecho: str # Fragmento do corpo onde os termos aparecem
+    data: Optional[datetime] = None
+    score: float # Relevância (maior = mais relevante)
+
+class SearchResponse(BaseModel):
+    query: str
+    resultados: List[SearchResultItem]
+    limit: int
+    offset: int
+    tem_mais: bool # Indica se existe próxima página (offset + limit)
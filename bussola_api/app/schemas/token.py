@@ -20,4 +20,5 @@ class Token(BaseModel):
 class TokenPayload(BaseModel):
     """Dados contidos dentro do token (Claims)."""
     sub: Optional[str] = None # Subject (ID do usuário)
-    type: Optional[str] = None # 'access' ou 'refresh'
\ No newline at end of file
+    type: Optional[str] = None # 'access' ou 'refresh'
+    jti: Optional[str] = None # ID único do token (cache/revogação)
\ No newline at end of file
@@ -18,17 +18,41 @@ RESPONSABILIDADES:
     2. Persistência Volátil: Armazenar resultados prontos no Redis com expiração automática (TTL).
     3. Serialização: Converter objetos Pydantic (AtomicSuggestion) para JSON e vice-versa.
     4. Failover Silencioso: Se o cache falhar, o sistema deve continuar funcionando (chamando a IA real).
+    5. [NOVO] Dois níveis: L1 em processo (LRU + TTL de sugestões já validadas) na frente do
+       Redis (L2). Acerto no L1 = zero rede, zero JSON, zero Pydantic.
+    6. [NOVO] Coerência L1/L2: toda escrita publica a chave no canal `ai:cache:invalidar` e o
+       L1 também observa keyevent notifications (se habilitadas no Redis) para DEL/expiração.
+       Sem assinatura ativa, o L1 fica desligado (fail-safe, como o PrincipalCache).
+    7. [NOVO] Contadores de acerto/erro por nível (`estatisticas()`).
+    8. [NOVO] Single-flight (`@ai_cache.single_flight` no run() dos agentes): execuções
+       idênticas concorrentes aguardam uma única chamada de LLM (Future no processo,
+       lock curto no Redis entre workers).
+    9. [NOVO] Stale-while-revalidate: TTL suave/rígido por domínio; entre os dois a resposta
+       sai na hora (flag `stale`) e é recalculada em segundo plano. Vale para agentes e
+       para os resultados curados dos orquestradores (que não são gravados quando montados
+       com alguma entrada vencida, via `rastrear_frescor`).
 
 INTEGRAÇÕES:
-    - Redis: Banco de dados em memória para armazenamento chave-valor.
+    - Redis: Banco de dados em memória para armazenamento chave-valor (L2 + Pub/Sub).
+    - Config: settings.AI_CACHE_L1_SIZE, settings.AI_CACHE_L1_TTL_SECONDS,
+      settings.AI_SINGLE_FLIGHT_LOCK_SECONDS, settings.AI_CACHE_TTL_DOMINIOS.
     - Agentes de IA: Consumidores do cache.
     - Pydantic Models: Estrutura de dados que é serializada/deserializada.
 """
 
+import asyncio
+import contextlib
+import functools
 import hashlib
 import json
 import logging
-from typing import List, Optional, Any, Dict
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import List, Optional, Any, Awaitable, Callable, Dict, Tuple
+import redis as redis_sync
 import redis.asyncio as redis
 
 from app.core.config import settings
@@ -36,12 +60,156 @@ from app.services.ai.base.base_schema import AtomicSuggestion
 
 logger = logging.getLogger(__name__)
 
+PREFIXO_CHAVE = "ai:cache:"
+# "Agente" das entradas com o resultado final (curado) de um orquestrador
+AGENTE_CURADORIA = "curadoria"
+
+# Canal de invalidação do L1. Mensagem: "<origem>|<chave>" (a origem ignora o próprio eco).
+CANAL_INVALIDACAO = "ai:cache:invalidar"
+# Keyevent notifications de remoção (requer notify-keyspace-events no Redis, ex: "Egx").
+# Escritas já chegam pelo canal acima; daqui vêm DEL manuais, expiração e eviction.
+PADROES_REMOCAO = ("__keyevent@*__:del", "__keyevent@*__:expired", "__keyevent@*__:evicted")
+
+ESPERA_RECONEXAO_SEGUNDOS = 5.0
+
+# Single-flight entre workers: lock por chave e intervalo de consulta de quem aguarda
+PREFIXO_LOCK = "ai:voo:"
+INTERVALO_ESPERA_LOCK = 0.25
+SCRIPT_LIBERAR_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+
+# run() decorado com single_flight em execução na task atual
+_voo_atual: ContextVar[Optional["_Voo"]] = ContextVar("ai_cache_voo", default=None)
+# Revalidação em segundo plano (stale-while-revalidate): entradas vencidas contam como MISS
+_revalidando: ContextVar[bool] = ContextVar("ai_cache_revalidando", default=False)
+# Marcador da requisição atual: registra se alguma resposta veio de entrada vencida
+_frescor_atual: ContextVar[Optional["Frescor"]] = ContextVar("ai_cache_frescor", default=None)
+
+
+class Frescor:
+    """
+    Criado por `AgentCache.monitorar_frescor()` (endpoint) ou `rastrear_frescor()` (montagem
+    do resultado curado); `stale` vira True se algo vencido foi servido. A marcação sobe
+    para o escopo pai: a requisição continua sabendo o que a montagem serviu vencido.
+    """
+    __slots__ = ("stale", "pai")
+
+    def __init__(self, pai: Optional["Frescor"] = None):
+        self.stale = False
+        self.pai = pai
+
+    def marcar(self) -> None:
+        frescor = self
+        while frescor is not None:
+            frescor.stale = True
+            frescor = frescor.pai
+
+
+class _ResultadoCompartilhado(Exception):
+    """Levantada no `get` de um seguidor; o decorator devolve o resultado do líder."""
+
+    def __init__(self, resultado: List[AtomicSuggestion]):
+        super().__init__()
+        self.resultado = resultado
+
+
+class _Lideranca:
+    __slots__ = ("key", "futuro", "token", "chave_lock")
+
+    def __init__(self, key: str, futuro: "asyncio.Future"):
+        self.key = key
+        self.futuro = futuro
+        self.token = uuid.uuid4().hex
+        self.chave_lock: Optional[str] = None
+
+
+class _Voo:
+    """Estado de um run() decorado: as chaves que ele lidera e a que serviu vencida."""
+    __slots__ = ("liderancas", "revalidar")
+
+    def __init__(self):
+        self.liderancas: List[_Lideranca] = []
+        self.revalidar: Optional[str] = None
+
+
+class _L1:
+    """
+    LRU + TTL em processo (por worker) de listas de AtomicSuggestion já validadas.
+    Thread-safe: lido no event loop e invalidado pela thread do assinante Pub/Sub.
+    """
+
+    def __init__(self, capacidade: int, ttl_segundos: float):
+        self.capacidade = capacidade
+        self.ttl_segundos = ttl_segundos
+        # chave -> (sugestões, expira_em, fresco_ate) em time.monotonic()
+        self._itens: "OrderedDict[str, Tuple[List[AtomicSuggestion], float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._geracao = 0 # Incrementada a cada invalidação (descarta puts concorrentes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.capacidade > 0 and self.ttl_segundos > 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def geracao(self) -> int:
+        return self._geracao
+
+    def get(self, key: str) -> Optional[Tuple[List[AtomicSuggestion], bool]]:
+        """(sugestões, fresca?) ou None."""
+        agora = time.monotonic()
+        with self._lock:
+            entrada = self._itens.get(key)
+            if entrada is None or entrada[1] <= agora:
+                if entrada is not None:
+                    del self._itens[key]
+                self.misses += 1
+                return None
+            self._itens.move_to_end(key)
+            self.hits += 1
+            # Cópia rasa: quem chama pode reordenar/estender a lista sem afetar o cache
+            return list(entrada[0]), entrada[2] > agora
+
+    def put(self, key: str, suggestions: List[AtomicSuggestion], ttl_l2: float, fresca_por: float, geracao: int) -> None:
+        """
+        Grava por no máximo o TTL restante no L2, se nada foi invalidado desde `geracao`.
+        `fresca_por`: segundos até o TTL suave (<= 0 = já vencida).
+        """
+        ttl = min(self.ttl_segundos, ttl_l2)
+        if ttl <= 0:
+            return
+        agora = time.monotonic()
+        with self._lock:
+            if geracao != self._geracao:
+                return
+            self._itens[key] = (list(suggestions), agora + ttl, agora + fresca_por)
+            self._itens.move_to_end(key)
+            while len(self._itens) > self.capacidade:
+                self._itens.popitem(last=False)
+
+    def remover(self, key: str) -> None:
+        with self._lock:
+            self._geracao += 1
+            self._itens.pop(key, None)
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._geracao += 1
+            self._itens.clear()
+
+
 class AgentCache:
     """
     Gerenciador de Cache para Agentes de IA.
     
     Implementa a estratégia de "Cache-Aside" simplificada:
     O agente pergunta se tem cache; se tiver, usa; se não, processa e salva.
+    A consulta passa primeiro pelo L1 (processo) e depois pelo L2 (Redis).
     """
     
     # Tempo de vida (TTL) do cache em segundos.
@@ -54,6 +222,18 @@ class AgentCache:
         # 'decode_responses=True' garante que recebemos strings, não bytes.
         self.redis = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
+        # L1 em processo + assinante (thread) que o mantém coerente com o Redis
+        self.l1 = _L1(settings.AI_CACHE_L1_SIZE, settings.AI_CACHE_L1_TTL_SECONDS)
+        self._origem = uuid.uuid4().hex[:12]
+        self._redis_sync: Optional[redis_sync.Redis] = None
+        self._ouvinte: Optional[threading.Thread] = None
+        self._ouvinte_lock = threading.Lock()
+        self._assinado = False
+        self._em_voo: Dict[str, "asyncio.Future"] = {} # Single-flight local (chave -> resultado do líder)
+        self._revalidacoes: Dict[str, "asyncio.Task"] = {} # Stale-while-revalidate em andamento
+        self.l2_hits = 0
+        self.l2_misses = 0
+
     def _generate_key(self, domain: str, agent_name: str, context: Dict[str, Any]) -> str:
         """
         Gera uma chave de cache única e determinística baseada no conteúdo do contexto.
@@ -82,7 +262,7 @@ class AgentCache:
         context_hash = hashlib.md5(context_str.encode('utf-8')).hexdigest()
         
         # Formato de namespace para facilitar limpeza/debug no Redis se necessário
-        return f"ai:cache:{domain}:{agent_name}:{context_hash}"
+        return f"{PREFIXO_CHAVE}{domain}:{agent_name}:{context_hash}"
 
     async def get(self, domain: str, agent_name: str, context: Dict[str, Any]) -> Optional[List[AtomicSuggestion]]:
         """
@@ -90,27 +270,86 @@ class AgentCache:
 
         FLUXO:
         1. Gera o hash do contexto atual.
-        2. Busca no Redis.
-        3. Se encontrar (HIT), reconstrói os objetos Pydantic originais.
-        4. Se der erro (Redis fora do ar), loga e retorna None para não derrubar o sistema.
+        2. Busca no L1 (processo). Se encontrar, devolve os objetos já validados.
+        3. Busca no Redis (L2). Se encontrar (HIT), reconstrói os objetos Pydantic originais
+           e os guarda no L1 pelo TTL restante da chave.
+        4. Entrada além do TTL suave do domínio (stale-while-revalidate): devolvida na hora,
+           a requisição é marcada como `stale` e o run() agenda a revalidação em segundo plano.
+        5. MISS dentro de um run() com single-flight: aguarda o líder da mesma chave
+           (se houver) ou assume a liderança e devolve None para o agente processar.
+        6. Se der erro (Redis fora do ar), loga e retorna None para não derrubar o sistema.
 
         RETORNO:
         - Lista de AtomicSuggestion se houver HIT.
         - None se houver MISS ou erro.
         """
+        key = self._generate_key(domain, agent_name, context)
+        voo = _voo_atual.get()
+        lido = await self._ler(key, domain, agent_name)
+        if lido is not None:
+            suggestions, fresca = lido
+            if fresca:
+                return suggestions
+            if not _revalidando.get():
+                # Stale-while-revalidate: serve a última versão boa imediatamente
+                frescor = _frescor_atual.get()
+                if frescor is not None:
+                    frescor.marcar()
+                if voo is not None:
+                    voo.revalidar = key
+                return suggestions
+            # Na própria revalidação, a versão vencida conta como MISS
+
+        # MISS dentro de um run() com single-flight: coordena com execuções idênticas
+        if voo is not None:
+            return await self._coordenar(key, voo)
+        return None
+
+    def _ttls(self, domain: str) -> Tuple[int, int]:
+        """(TTL suave, TTL rígido) do domínio. Sem configuração: sem fase "vencida"."""
+        suave, rigido = settings.AI_CACHE_TTL_DOMINIOS.get(domain, (self.TTL_SECONDS, self.TTL_SECONDS))
+        return min(suave, rigido), rigido
+
+    async def _ler(self, key: str, domain: str, agent_name: str) -> Optional[Tuple[List[AtomicSuggestion], bool]]:
+        """
+        Consulta L1 e depois L2: (sugestões, fresca?) ou None.
+        Qualquer falha vira MISS (failover silencioso).
+        """
         try:
-            key = self._generate_key(domain, agent_name, context)
-            cached_data = await self.redis.get(key)
+            # L1: objetos prontos, sem rede (só com a assinatura de invalidação ativa)
+            l1_ativo = self._l1_disponivel()
+            if l1_ativo:
+                lido = self.l1.get(key)
+                if lido is not None:
+                    logger.debug(f"[{agent_name}] Cache L1 HIT ⚡")
+                    return lido
+                geracao = self.l1.geracao()
+
+            # L2: valor + TTL restante na mesma ida ao Redis
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            cached_data, ttl_ms = await pipe.execute()
             
             if not cached_data:
+                self.l2_misses += 1
                 return None
 
+            self.l2_hits += 1
             logger.info(f"[{agent_name}] Cache HIT ⚡ (Key: {key})")
             
             # Deserialização: JSON String -> Lista de Dicts -> Lista de Objetos Pydantic
             # Isso garante que o restante do sistema receba objetos tipados, não dicionários brutos.
             raw_list = json.loads(cached_data)
-            return [AtomicSuggestion(**item) for item in raw_list]
+            suggestions = [AtomicSuggestion(**item) for item in raw_list]
+
+            # Idade derivada do TTL restante (gravado com o TTL rígido): dispensa timestamp no valor
+            suave, rigido = self._ttls(domain)
+            restante = ttl_ms / 1000.0 if ttl_ms and ttl_ms > 0 else 0.0
+            fresca_por = restante - (rigido - suave)
+            if l1_ativo and restante > 0:
+                self.l1.put(key, suggestions, restante, fresca_por, geracao)
+            return suggestions, fresca_por > 0
 
         except Exception as e:
             # Estratégia de Resiliência:
@@ -125,25 +364,232 @@ class AgentCache:
 
         REGRAS DE NEGÓCIO:
         - Não cacheia listas vazias (pode ter sido um erro temporário da IA ou falta de dados).
-        - Aplica TTL para evitar dados obsoletos (stale data).
+        - Aplica o TTL rígido do domínio para evitar dados obsoletos (stale data).
         """
         try:
             if not suggestions:
                 return # Proteção contra cache de falhas ou estados vazios
 
             key = self._generate_key(domain, agent_name, context)
+            suave, rigido = self._ttls(domain)
             
             # Serialização: Objetos Pydantic -> Lista de Dicts -> JSON String
             # 'mode=json' garante que Enums e UUIDs sejam convertidos corretamente para strings.
             data_to_save = json.dumps([s.model_dump(mode='json') for s in suggestions])
             
-            await self.redis.setex(key, self.TTL_SECONDS, data_to_save)
+            # Os demais workers descartam a versão que tiverem no L1
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.setex(key, rigido, data_to_save)
+            pipe.publish(CANAL_INVALIDACAO, f"{self._origem}|{key}")
+            await pipe.execute()
+            if self._l1_disponivel():
+                self.l1.remover(key)
+                self.l1.put(key, suggestions, rigido, suave, self.l1.geracao())
             logger.debug(f"[{agent_name}] Cache SAVED 💾")
 
         except Exception as e:
             # Falha ao salvar não é crítica para o usuário, apenas perde a otimização.
             logger.error(f"Erro ao salvar no cache Redis: {e}")
 
+    # --------------------------------------------------------------------------
+    # SINGLE-FLIGHT (EXECUÇÕES IDÊNTICAS CONCORRENTES)
+    # --------------------------------------------------------------------------
+    # Sem isso, N requisições com o mesmo contexto que erram o cache ao mesmo tempo
+    # (abas abertas em sequência, chave expirando sob carga) pagam N chamadas de LLM.
+    # Com o decorator, o primeiro run() vira LÍDER da chave e os demais aguardam:
+    #   - No processo: um asyncio.Future por chave (sem ida ao Redis).
+    #   - Entre workers: lock curto `ai:voo:<...>` (SET NX PX); quem não obtém o lock
+    #     acompanha o L2 até o líder gravar, o lock sumir ou o prazo estourar.
+
+    def single_flight(self, run: Callable[..., Awaitable[List[AtomicSuggestion]]]):
+        """
+        Decorator para o `run()` dos agentes (abaixo do @classmethod).
+
+        A chave é a mesma de `_generate_key`, descoberta quando o agente chama `get`.
+        Seguidores recebem o resultado do líder (inclusive lista vazia); se o líder
+        falhar com exceção, cada seguidor processa por conta própria.
+        """
+        @functools.wraps(run)
+        async def wrapper(*args, **kwargs):
+            voo = _Voo()
+            token = _voo_atual.set(voo)
+            resultado = None
+            try:
+                resultado = await run(*args, **kwargs)
+                return resultado
+            except _ResultadoCompartilhado as compartilhado:
+                resultado = compartilhado.resultado
+                return resultado
+            finally:
+                _voo_atual.reset(token)
+                await self._encerrar(voo, resultado)
+                if voo.revalidar:
+                    self._agendar_revalidacao(voo.revalidar, wrapper, args, kwargs)
+        return wrapper
+
+    # --------------------------------------------------------------------------
+    # STALE-WHILE-REVALIDATE
+    # --------------------------------------------------------------------------
+    # Cada domínio tem TTL suave e rígido (settings.AI_CACHE_TTL_DOMINIOS). Entre os dois,
+    # a entrada é servida na hora (resposta marcada `stale`) e o mesmo run() é executado
+    # de novo em segundo plano com `_revalidando`: entradas vencidas viram MISS (as frescas
+    # continuam valendo), o resultado novo é gravado e substitui o antigo em L1/L2.
+    # O single-flight garante uma única revalidação por chave no cluster.
+
+    def monitorar_frescor(self) -> Frescor:
+        """Chamado pelo endpoint antes do orquestrador; depois, `frescor.stale` vai na resposta."""
+        frescor = Frescor()
+        _frescor_atual.set(frescor)
+        return frescor
+
+    @contextlib.contextmanager
+    def rastrear_frescor(self):
+        """
+        Escopo da montagem de um resultado curado (fan-out dos agentes no orquestrador).
+
+        Se algum agente serviu entrada vencida, o resultado curado NÃO deve ser gravado:
+        ele nasceria com TTL suave cheio e a revalidação do agente nunca o alcançaria.
+        Uso: `with ai_cache.rastrear_frescor() as montagem: ...; if not montagem.stale: set(...)`.
+        """
+        frescor = Frescor(_frescor_atual.get())
+        token = _frescor_atual.set(frescor)
+        try:
+            yield frescor
+        finally:
+            try:
+                _frescor_atual.reset(token)
+            except ValueError:
+                pass # Gerador (streaming) finalizado em outro contexto após desconexão do cliente
+
+    def _agendar_revalidacao(self, key: str, run: Callable[..., Awaitable[List[AtomicSuggestion]]], args, kwargs) -> None:
+        if key in self._revalidacoes:
+            return # Já em andamento neste processo
+
+        async def revalidar():
+            _revalidando.set(True)
+            _frescor_atual.set(None) # Não marca a requisição que originou a revalidação
+            try:
+                await run(*args, **kwargs)
+                logger.info(f"[AgentCache] Revalidação concluída ({key})")
+            except Exception as e:
+                logger.error(f"[AgentCache] Falha na revalidação de {key}: {e}")
+            finally:
+                self._revalidacoes.pop(key, None)
+
+        # Referência guardada: tasks sem referência podem ser coletadas antes de terminar
+        self._revalidacoes[key] = asyncio.create_task(revalidar())
+
+    async def _coordenar(self, key: str, voo: "_Voo") -> Optional[List[AtomicSuggestion]]:
+        """Chamado no MISS: segue um líder (levanta _ResultadoCompartilhado) ou assume a liderança (None)."""
+        prazo = settings.AI_SINGLE_FLIGHT_LOCK_SECONDS
+
+        # 1. Líder no próprio processo
+        em_voo = self._em_voo.get(key)
+        if em_voo is not None:
+            try:
+                resultado = await asyncio.wait_for(asyncio.shield(em_voo), timeout=prazo)
+            except asyncio.TimeoutError:
+                return None # Líder travado: processa sem liderar
+            if resultado is None:
+                return None # Líder falhou: processa por conta própria
+            raise _ResultadoCompartilhado(resultado)
+
+        lideranca = _Lideranca(key, asyncio.get_running_loop().create_future())
+        self._em_voo[key] = lideranca.futuro
+        voo.liderancas.append(lideranca)
+
+        # 2. Líder em outro worker
+        chave_lock = f"{PREFIXO_LOCK}{key[len(PREFIXO_CHAVE):]}"
+        try:
+            if await self.redis.set(chave_lock, lideranca.token, nx=True, px=int(prazo * 1000)):
+                lideranca.chave_lock = chave_lock
+                return None
+
+            limite = time.monotonic() + prazo
+            while time.monotonic() < limite:
+                await asyncio.sleep(INTERVALO_ESPERA_LOCK)
+                lido = await self._ler(key, key[len(PREFIXO_CHAVE):].split(":", 1)[0], "single-flight")
+                if lido is not None:
+                    raise _ResultadoCompartilhado(lido[0])
+                if not await self.redis.exists(chave_lock):
+                    break # Líder remoto terminou sem gravar (vazio/erro)
+        except redis.RedisError as e:
+            logger.error(f"Erro no lock de single-flight: {e}")
+        return None # Processa como líder local (sem lock entre workers)
+
+    async def _encerrar(self, voo: "_Voo", resultado: Optional[List[AtomicSuggestion]]) -> None:
+        """Entrega o resultado aos seguidores locais e libera os locks deste run()."""
+        for lideranca in voo.liderancas:
+            if not lideranca.futuro.done():
+                lideranca.futuro.set_result(resultado)
+            if self._em_voo.get(lideranca.key) is lideranca.futuro:
+                del self._em_voo[lideranca.key]
+            if lideranca.chave_lock:
+                try:
+                    # Só remove o lock se ainda for nosso (pode ter expirado e sido tomado)
+                    await self.redis.eval(SCRIPT_LIBERAR_LOCK, 1, lideranca.chave_lock, lideranca.token)
+                except redis.RedisError as e:
+                    logger.error(f"Erro ao liberar lock de single-flight: {e}")
+
+    # --------------------------------------------------------------------------
+    # MÉTRICAS
+    # --------------------------------------------------------------------------
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Acertos/erros por nível. Erros no L1 incluem os acertos e erros do L2."""
+        return {
+            "l1": {"hits": self.l1.hits, "misses": self.l1.misses, "itens": len(self.l1), "ativo": self.l1.ativo and self._assinado},
+            "l2": {"hits": self.l2_hits, "misses": self.l2_misses},
+        }
+
+    # --------------------------------------------------------------------------
+    # COERÊNCIA DO L1 (PUB/SUB + KEYSPACE NOTIFICATIONS)
+    # --------------------------------------------------------------------------
+
+    def _l1_disponivel(self) -> bool:
+        if not self.l1.ativo:
+            return False
+        self._garantir_ouvinte()
+        return self._assinado
+
+    def _garantir_ouvinte(self) -> None:
+        if self._ouvinte is not None:
+            return
+        with self._ouvinte_lock:
+            if self._ouvinte is None:
+                self._ouvinte = threading.Thread(target=self._ouvir, name="ai-cache-pubsub", daemon=True)
+                self._ouvinte.start()
+
+    def _aplicar(self, mensagem: Dict[str, Any]) -> None:
+        if mensagem.get("type") == "pmessage":
+            # Keyevent: o nome da chave removida vem no corpo da mensagem
+            if mensagem["data"].startswith(PREFIXO_CHAVE):
+                self.l1.remover(mensagem["data"])
+        elif mensagem.get("type") == "message":
+            origem, _, key = mensagem["data"].partition("|")
+            if origem != self._origem: # Eco da própria escrita: o L1 local já está atualizado
+                self.l1.remover(key)
+
+    def _ouvir(self) -> None:
+        """Loop do assinante (thread daemon). Reconecta com espera fixa em caso de falha."""
+        while True:
+            try:
+                if self._redis_sync is None:
+                    self._redis_sync = redis_sync.from_url(settings.REDIS_URL, decode_responses=True)
+                pubsub = self._redis_sync.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CANAL_INVALIDACAO)
+                pubsub.psubscribe(*PADROES_REMOCAO)
+                self._assinado = True
+                for mensagem in pubsub.listen():
+                    self._aplicar(mensagem)
+            except Exception as e:
+                if self._assinado:
+                    logger.warning(f"[AgentCache] Assinatura Pub/Sub perdida ({e}). L1 desligado até reconectar.")
+            # Invalidações podem ter sido perdidas durante a queda: descarta o L1 inteiro.
+            self._assinado = False
+            self.l1.limpar()
+            time.sleep(ESPERA_RECONEXAO_SEGUNDOS)
+
 # ==============================================================================
 # INSTÂNCIA SINGLETON
 # ==============================================================================
@@ -0,0 +1,94 @@
+"""
+=======================================================================================
+ARQUIVO: streaming.py (Entrega Incremental dos Agentes de IA)
+=======================================================================================
+
+OBJETIVO:
+    Permitir que os orquestradores entreguem as sugestões de cada agente assim que
+    ele termina, em vez de esperar o mais lento (asyncio.gather / ainvoke do grafo).
+    O tempo até o primeiro insight passa a ser o do agente mais rápido.
+
+CAMADA:
+    Services / AI / Base (Backend).
+    Utilitário usado pelos métodos `stream*` dos Orquestradores; o endpoint SSE
+    (`ai.py`) converte o fluxo em eventos.
+
+RESPONSABILIDADES:
+    1. `conforme_concluem`: executa corrotinas nomeadas em paralelo e as entrega na
+       ordem de término (resultado ou exceção, para o orquestrador tratar como no gather).
+    2. `mesclar`: intercala vários fluxos assíncronos (ex: grafos Nutri e Coach do Ritmo).
+    3. Manter vivas as execuções de quem desconectou: os agentes terminam em segundo
+       plano e gravam no cache, então a próxima abertura do painel já é um HIT.
+
+COMUNICAÇÃO:
+    - Usado por: FinancasOrchestrator, RoteiroOrchestrator, RitmoOrchestrator.
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Set, Tuple, TypeVar, Union
+
+from app.services.ai.base.base_schema import AtomicSuggestion
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Referências das tasks em andamento: tasks sem referência podem ser coletadas antes de
+# terminar (ex: cliente fechou o EventSource e o gerador foi descartado).
+_em_andamento: Set["asyncio.Task"] = set()
+
+_FIM = object()
+
+
+def _manter(tarefa: "asyncio.Task") -> "asyncio.Task":
+    _em_andamento.add(tarefa)
+    tarefa.add_done_callback(_descartar)
+    return tarefa
+
+
+def _descartar(tarefa: "asyncio.Task") -> None:
+    _em_andamento.discard(tarefa)
+    # Consome a exceção de quem ninguém mais aguarda (evita "exception was never retrieved")
+    if not tarefa.cancelled() and tarefa.exception() is not None:
+        logger.debug(f"[Streaming] Execução em segundo plano falhou: {tarefa.exception()}")
+
+
+async def conforme_concluem(
+    execucoes: Dict[str, Awaitable[List[AtomicSuggestion]]]
+) -> AsyncIterator[Tuple[str, Union[List[AtomicSuggestion], BaseException]]]:
+    """
+    Dispara todas as execuções e entrega `(nome, resultado)` na ordem de término.
+    Falhas chegam como a própria exceção (mesmo contrato do `return_exceptions=True`).
+    """
+    tarefas = {_manter(asyncio.ensure_future(execucao)): nome for nome, execucao in execucoes.items()}
+    pendentes = set(tarefas)
+    while pendentes:
+        prontas, pendentes = await asyncio.wait(pendentes, return_when=asyncio.FIRST_COMPLETED)
+        for tarefa in prontas:
+            if tarefa.cancelled():
+                continue
+            yield tarefas[tarefa], tarefa.exception() or tarefa.result()
+
+
+async def mesclar(*fluxos: AsyncIterator[T]) -> AsyncIterator[T]:
+    """Intercala os itens de vários fluxos assíncronos na ordem em que ficam prontos."""
+    fila: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    async def drenar(fluxo: AsyncIterator[T]) -> None:
+        try:
+            async for item in fluxo:
+                fila.put_nowait(item)
+        finally:
+            fila.put_nowait(_FIM)
+
+    for fluxo in fluxos:
+        _manter(asyncio.create_task(drenar(fluxo)))
+
+    restantes = len(fluxos)
+    while restantes:
+        item = await fila.get()
+        if item is _FIM:
+            restantes -= 1
+            continue
+        yield item
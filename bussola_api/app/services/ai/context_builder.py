@@ -0,0 +1,237 @@
+"""
+=======================================================================================
+ARQUIVO: context_builder.py (Montagem dos Contextos de IA)
+=======================================================================================
+
+OBJETIVO:
+    Reduzir o tempo até a primeira chamada de LLM nos endpoints de insight. A coleta
+    de dados (antes serial, com objetos ORM e um modelo Pydantic validado por linha)
+    passa a rodar em paralelo e a montar os contextos de forma enxuta.
+
+PARTE DO SISTEMA:
+    Backend / Services / AI (camada entre o Controller `ai.py` e os Orquestradores).
+
+RESPONSABILIDADES:
+    1. Definir as janelas temporais de cada domínio (UTC no banco, Local para a IA).
+    2. Disparar as consultas independentes ao mesmo tempo, cada uma em sua conexão
+       (`consultar_em_paralelo`: AsyncSession com ASYNC_DB_ENABLED, threadpool caso contrário).
+    3. Buscar apenas as colunas usadas (projeções), sem hidratar entidades ORM.
+    4. Montar `FinancasContext`, `RoteiroContext` e `RegistrosContext` com `model_construct`:
+       os dados já saem do banco tipados, então a validação por linha é dispensada.
+
+COMUNICAÇÃO:
+    - Chamado por: app.api.v1.endpoints.ai.
+    - Consome: app.db.async_db.consultar_em_paralelo.
+    - Entrega para: FinancasOrchestrator.analyze_context, RoteiroOrchestrator.analyze_context
+      e RegistrosOrchestrator.analyze.
+
+=======================================================================================
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import exists, func, select
+
+from app.core.timezone import now_local, now_utc, to_local
+from app.db.async_db import consultar_em_paralelo
+from app.models.agenda import Compromisso
+from app.models.financas import Categoria, Transacao
+from app.models.registros import Subtarefa, Tarefa
+from app.services.ai.financas.context import FinancasContext
+from app.services.ai.registros.context import RegistrosContext, TaskItemContext
+from app.services.ai.roteiro.context import RoteiroContext
+
+# Janelas de análise (dias)
+JANELA_HISTORICO_FINANCAS = 90
+JANELA_PROJECAO_FINANCAS = 30
+JANELA_ROTEIRO = 30
+
+
+class ContextBuilder:
+    """Coleta paralela + montagem leve dos contextos de cada domínio de IA."""
+
+    # ----------------------------------------------------------------------------------
+    # FINANÇAS (CFO Digital)
+    # ----------------------------------------------------------------------------------
+
+    @staticmethod
+    async def financas(user_id: int) -> FinancasContext:
+        # --- 1. Janelas temporais (UTC para o banco, Local para os labels) ---
+        utc_agora = now_utc()
+        local_agora = now_local()
+
+        inicio_mes_utc = utc_agora.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        proximo_mes = (inicio_mes_utc.replace(day=28) + timedelta(days=4)).replace(day=1)
+        fim_mes_utc = proximo_mes - timedelta(seconds=1)
+        inicio_historico_utc = inicio_mes_utc - timedelta(days=JANELA_HISTORICO_FINANCAS)
+        fim_projecao_utc = utc_agora + timedelta(days=JANELA_PROJECAO_FINANCAS)
+
+        # --- 2. As 4 consultas são independentes: disparadas juntas ---
+        colunas_transacao = (Transacao.data, Transacao.descricao, Transacao.valor, Transacao.categoria_id)
+        categorias, transacoes_mes, historico, transacoes_futuras = await consultar_em_paralelo(
+            select(Categoria.id, Categoria.nome, Categoria.tipo, Categoria.meta_limite)
+            .where(Categoria.user_id == user_id),
+
+            # Mês atual (BudgetSentinel)
+            select(*colunas_transacao).where(
+                Transacao.user_id == user_id,
+                Transacao.data >= inicio_mes_utc,
+                Transacao.data <= fim_mes_utc
+            ),
+
+            # Histórico agregado de 90 dias, estritamente anterior ao mês atual
+            # (SpendingDetective e StrategyArchitect)
+            select(Transacao.categoria_id, func.sum(Transacao.valor)).where(
+                Transacao.user_id == user_id,
+                Transacao.data >= inicio_historico_utc,
+                Transacao.data < inicio_mes_utc,
+                Transacao.tipo_recorrencia != 'ignorar'
+            ).group_by(Transacao.categoria_id),
+
+            # Próximos 30 dias (CashFlowOracle)
+            select(*colunas_transacao).where(
+                Transacao.user_id == user_id,
+                Transacao.data > utc_agora,
+                Transacao.data <= fim_projecao_utc
+            ),
+        )
+
+        # --- 3. Médias e capacidade de poupança (calculadas aqui, não pela IA) ---
+        mapa_categorias = {cat_id: (nome, tipo) for cat_id, nome, tipo, _ in categorias}
+        total_receita_90d = total_despesa_90d = 0.0
+        historico_medias = []
+        for cat_id, total in historico:
+            if cat_id not in mapa_categorias:
+                continue
+            nome, tipo = mapa_categorias[cat_id]
+            if tipo == 'receita':
+                total_receita_90d += total
+            else:
+                total_despesa_90d += total
+            historico_medias.append({"categoria": nome, "valor_media": round(total / 3.0, 2)})
+        sobra_mensal_real = (total_receita_90d - total_despesa_90d) / 3.0
+
+        # --- 4. Formatação (dicts simples, com saldo corrente estimado) ---
+        lista_transacoes_mes = []
+        saldo_atual_estimado = 0.0
+        for data, descricao, valor, cat_id in transacoes_mes:
+            nome, tipo = mapa_categorias.get(cat_id, ("Outros", 'despesa'))
+            saldo_atual_estimado += valor if tipo == 'receita' else -valor
+            lista_transacoes_mes.append({
+                "data": to_local(data).strftime("%Y-%m-%d"),
+                "descricao": descricao,
+                "valor": valor,
+                "categoria": nome,
+                "tipo": tipo
+            })
+
+        lista_transacoes_futuras = [{
+            "data": to_local(data).strftime("%Y-%m-%d"),
+            "descricao": descricao,
+            "valor": valor,
+            "tipo": mapa_categorias.get(cat_id, (None, 'despesa'))[1]
+        } for data, descricao, valor, cat_id in transacoes_futuras]
+
+        # Metas: receitas (alvos) e despesas (tetos) com limite definido
+        metas_orcamento = [
+            {"categoria": nome, "valor_limite": meta_limite, "tipo": tipo}
+            for _, nome, tipo, meta_limite in categorias if meta_limite > 0
+        ]
+
+        return FinancasContext.model_construct(
+            data_atual=local_agora.strftime("%Y-%m-%d"),
+            periodo_analise_label=local_agora.strftime("%B %Y"),
+            data_fim_projecao=(local_agora + timedelta(days=JANELA_PROJECAO_FINANCAS)).strftime("%Y-%m-%d"),
+            saldo_atual=round(saldo_atual_estimado, 2),
+            transacoes_periodo=lista_transacoes_mes,
+            historico_medias=historico_medias,
+            contas_a_pagar_receber=lista_transacoes_futuras,
+            metas_orcamentarias=metas_orcamento,
+            # Lista vazia intencional: StrategyArchitect usa 'media_sobra_mensal' na ausência de metas
+            metas_provisoes=[],
+            media_sobra_mensal=round(sobra_mensal_real, 2)
+        )
+
+    # ----------------------------------------------------------------------------------
+    # ROTEIRO (Agenda)
+    # ----------------------------------------------------------------------------------
+
+    @staticmethod
+    async def roteiro(user_id: int) -> RoteiroContext:
+        # Janela de 30 dias calculada em UTC (o banco armazena UTC)
+        start_db = now_utc().replace(hour=0, minute=0, second=0, microsecond=0)
+        end_db = start_db + timedelta(days=JANELA_ROTEIRO)
+
+        (compromissos,) = await consultar_em_paralelo(
+            select(
+                Compromisso.id, Compromisso.titulo, Compromisso.data_hora, Compromisso.local,
+                Compromisso.descricao, Compromisso.status
+            ).where(
+                Compromisso.user_id == user_id,
+                Compromisso.data_hora >= start_db,
+                Compromisso.data_hora <= end_db
+            )
+        )
+
+        # A IA "pensa" no horário local do usuário; duração padrão de 1h (fallback)
+        agenda_itens = []
+        for comp_id, titulo, data_hora, local, descricao, status in compromissos:
+            start_local = to_local(data_hora)
+            agenda_itens.append({
+                "id": comp_id,
+                "title": titulo,
+                "start_time": start_local.isoformat(),
+                "end_time": (start_local + timedelta(hours=1)).isoformat(),
+                "location": local if local else "Não especificado",
+                "description": descricao,
+                "status": status,
+                "category": "geral",
+                "priority": "media"
+            })
+
+        local_now = now_local()
+        return RoteiroContext.model_construct(
+            data_atual=local_now.strftime("%Y-%m-%d"),
+            dia_semana=local_now.strftime("%A").capitalize(),
+            data_inicio=local_now.strftime("%Y-%m-%d"),
+            data_fim=(local_now + timedelta(days=JANELA_ROTEIRO)).strftime("%Y-%m-%d"),
+            agenda_itens=agenda_itens,
+            user_preferences={}
+        )
+
+    # ----------------------------------------------------------------------------------
+    # REGISTROS (Tarefas)
+    # ----------------------------------------------------------------------------------
+
+    @staticmethod
+    async def registros(user_id: int) -> RegistrosContext:
+        # 'has_subtasks' via EXISTS correlacionado: nenhuma subtarefa é carregada
+        tem_subtarefas = exists().where(Subtarefa.tarefa_id == Tarefa.id).correlate(Tarefa)
+        (tarefas,) = await consultar_em_paralelo(
+            select(
+                Tarefa.id, Tarefa.titulo, Tarefa.descricao, Tarefa.prioridade, Tarefa.status,
+                Tarefa.prazo, Tarefa.data_criacao, tem_subtarefas
+            ).where(Tarefa.user_id == user_id)
+        )
+
+        now = now_local()
+        hoje = now.strftime("%Y-%m-%d")
+        return RegistrosContext.model_construct(
+            user_id=user_id,
+            data_atual=hoje,
+            hora_atual=now.strftime("%H:%M"),
+            dia_semana=now.strftime("%A").capitalize(),
+            tarefas=[
+                TaskItemContext.model_construct(
+                    id=tarefa_id,
+                    titulo=titulo,
+                    descricao=descricao,
+                    prioridade=prioridade or 'media',
+                    status='concluida' if status == 'Concluído' else 'pendente',
+                    data_vencimento=prazo.strftime("%Y-%m-%d") if prazo else None,
+                    created_at=data_criacao.strftime("%Y-%m-%d") if data_criacao else hoje,
+                    has_subtasks=bool(possui_subtarefas)
+                )
+                for tarefa_id, titulo, descricao, prioridade, status, prazo, data_criacao, possui_subtarefas in tarefas
+            ]
+        )
@@ -55,6 +55,7 @@ class BudgetSentinelAgent:
     AGENT_NAME = "budget_sentinel"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: FinancasContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de Burn Rate.
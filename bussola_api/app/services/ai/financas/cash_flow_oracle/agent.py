@@ -53,6 +53,7 @@ class CashFlowOracleAgent:
     AGENT_NAME = "cash_flow_oracle"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: FinancasContext) -> List[AtomicSuggestion]:
         """
         Executa a projeção de caixa.
@@ -14,21 +14,24 @@ CAMADA:
     Recebe dados do Controller (`ai.py`) e distribui para os Agentes.
 
 RESPONSABILIDADES:
-    1. Preparação de Contexto: Unificar dados brutos em um objeto `FinancasContext`.
+    1. Preparação de Contexto: Unificar dados brutos em um objeto `FinancasContext`
+       (ou recebê-lo pronto do `ContextBuilder` via `analyze_context`).
     2. Concorrência: Executar múltiplos agentes (LLMs) em paralelo para reduzir latência.
     3. Resiliência: Garantir que a falha de um agente não derrube toda a análise.
     4. Curadoria (CFO Logic): Filtrar, desduplicar e priorizar os insights baseados em gravidade e urgência.
+    5. [NOVO] Streaming (`stream_context`): entregar as sugestões de cada agente assim que ele
+       termina e, por último, o resultado curado (endpoint SSE).
 
 COMUNICAÇÃO:
     - Recebe de: `app.api.v1.endpoints.ai.py`
     - Comanda: `SpendingDetective`, `BudgetSentinel`, `CashFlowOracle`, `StrategyArchitect`
-    - Retorna: Lista de `AtomicSuggestion` para o Frontend.
+    - Retorna: Lista de `AtomicSuggestion` para o Frontend (ou um fluxo de parciais + final).
 """
 
 import asyncio
 import logging
 import json
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 
 # Imports dos Agentes Financeiros
 from app.services.ai.financas.spending_detective.agent import SpendingDetectiveAgent
@@ -39,6 +42,8 @@ from app.services.ai.financas.budget_sentinel.agent import BudgetSentinelAgent
 # Contexto e Schema Base
 from app.services.ai.financas.context import FinancasContext
 from app.services.ai.base.base_schema import AtomicSuggestion
+from app.services.ai.base.cache import ai_cache, AGENTE_CURADORIA
+from app.services.ai.base.streaming import conforme_concluem
 
 logger = logging.getLogger(__name__)
 
@@ -95,8 +100,23 @@ class FinancasOrchestrator:
             metas_provisoes=metas_provisoes,
             media_sobra_mensal=media_sobra
         )
-        
-        print(f"\n[FinancasOrchestrator] 💰 Iniciando CFO Digital. Saldo: {saldo_atual} | Transações Mês: {len(transacoes_mes)}")
+        return await FinancasOrchestrator.analyze_context(context)
+
+    @staticmethod
+    @ai_cache.single_flight
+    async def analyze_context(context: FinancasContext) -> List[AtomicSuggestion]:
+        """
+        [NOVO] Mesma análise a partir de um `FinancasContext` já montado
+        (ex: pelo `ContextBuilder`, que coleta os dados em paralelo).
+        """
+        # Resultado curado em cache (stale-while-revalidate + single-flight também neste nível):
+        # um acerto dispensa o fan-out dos agentes e a curadoria.
+        context_dict = context.model_dump()
+        cached_response = await ai_cache.get("financas", AGENTE_CURADORIA, context_dict)
+        if cached_response:
+            return cached_response
+
+        print(f"\n[FinancasOrchestrator] 💰 Iniciando CFO Digital. Saldo: {context.saldo_atual} | Transações Mês: {len(context.transacoes_periodo)}")
 
         # ----------------------------------------------------------------------
         # 2. EXECUÇÃO PARALELA (Asyncio)
@@ -104,13 +124,14 @@ class FinancasOrchestrator:
         # Dispara os 4 agentes simultaneamente. Como cada agente faz chamadas de rede (LLM/Cache),
         # a execução sequencial seria lenta.
         # 'return_exceptions=True' garante que se um agente falhar, os outros continuam (Failover parcial).
-        results = await asyncio.gather(
-            SpendingDetectiveAgent.run(context),   # Passado (Anomalias)
-            BudgetSentinelAgent.run(context),      # Presente (Pacing/Execução)
-            CashFlowOracleAgent.run(context),      # Futuro Curto (Liquidez)
-            StrategyArchitectAgent.run(context),   # Futuro Longo (Estratégia)
-            return_exceptions=True
-        )
+        with ai_cache.rastrear_frescor() as montagem:
+            results = await asyncio.gather(
+                SpendingDetectiveAgent.run(context),   # Passado (Anomalias)
+                BudgetSentinelAgent.run(context),      # Presente (Pacing/Execução)
+                CashFlowOracleAgent.run(context),      # Futuro Curto (Liquidez)
+                StrategyArchitectAgent.run(context),   # Futuro Longo (Estratégia)
+                return_exceptions=True
+            )
 
         # ----------------------------------------------------------------------
         # 3. CONSOLIDAÇÃO E TRATAMENTO DE ERROS
@@ -133,6 +154,51 @@ class FinancasOrchestrator:
                 if len(result) > 0:
                     print(f"   -> {agent_name} gerou {len(result)} insights.")
 
+        final_suggestions = FinancasOrchestrator._curate(all_suggestions)
+        print(f"[FinancasOrchestrator] ✅ Análise Concluída.\n")
+
+        # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+        if not montagem.stale:
+            await ai_cache.set("financas", AGENTE_CURADORIA, context_dict, final_suggestions)
+        return final_suggestions
+
+    @staticmethod
+    async def stream_context(context: FinancasContext) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze_context` (endpoint SSE).
+
+        Entrega `(agente, sugestões)` assim que cada agente termina e, por último,
+        `(AGENTE_CURADORIA, lista curada)`. Com o resultado curado em cache, só o final é emitido.
+        """
+        context_dict = context.model_dump()
+        if await ai_cache.get("financas", AGENTE_CURADORIA, context_dict):
+            # Via analyze_context: single-flight e revalidação em segundo plano se estiver vencido
+            yield AGENTE_CURADORIA, await FinancasOrchestrator.analyze_context(context)
+            return
+
+        print(f"\n[FinancasOrchestrator] 💰 Iniciando CFO Digital (streaming). Saldo: {context.saldo_atual}")
+
+        all_suggestions: List[AtomicSuggestion] = []
+        with ai_cache.rastrear_frescor() as montagem:
+            async for agent_name, result in conforme_concluem({
+                agent.AGENT_NAME: agent.run(context)
+                for agent in (SpendingDetectiveAgent, BudgetSentinelAgent, CashFlowOracleAgent, StrategyArchitectAgent)
+            }):
+                if isinstance(result, Exception):
+                    logger.error(f"[FinancasOrchestrator] Erro no agente {agent_name}: {result}")
+                    continue
+                all_suggestions.extend(result)
+                yield agent_name, result
+
+        final_suggestions = FinancasOrchestrator._curate(all_suggestions)
+        # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+        if not montagem.stale:
+            await ai_cache.set("financas", AGENTE_CURADORIA, context_dict, final_suggestions)
+        yield AGENTE_CURADORIA, final_suggestions
+
+    @staticmethod
+    def _curate(all_suggestions: List[AtomicSuggestion]) -> List[AtomicSuggestion]:
+        """Curadoria comum às versões completa e incremental (deduplicação, pesos e corte)."""
         # ----------------------------------------------------------------------
         # 4. LÓGICA DE PRIORIZAÇÃO E CORTE (CFO Logic)
         # ----------------------------------------------------------------------
@@ -186,6 +252,4 @@ class FinancasOrchestrator:
 
         # Log final de auditoria
         print(f"\n[FinancasOrchestrator] ✂️ Filtro Aplicado: De {len(all_suggestions)} para {len(final_suggestions)} insights.")
-        print(f"[FinancasOrchestrator] ✅ Análise Concluída.\n")
-        
-        return final_suggestions
\ No newline at end of file
+        return final_suggestions
@@ -52,6 +52,7 @@ class SpendingDetectiveAgent:
     AGENT_NAME = "spending_detective"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: FinancasContext) -> List[AtomicSuggestion]:
         """
         Executa o fluxo de auditoria financeira.
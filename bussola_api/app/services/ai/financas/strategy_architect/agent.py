@@ -66,6 +66,7 @@ class StrategyArchitectAgent:
     MINIMO_RELEVANTE = 50.0  
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: FinancasContext) -> List[AtomicSuggestion]:
         """
         Executa a auditoria de aderência das metas.
@@ -54,6 +54,7 @@ class FlowArchitectAgent:
     AGENT_NAME = "flow_architect"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RegistrosContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de fluxo de tarefas.
@@ -17,6 +17,8 @@ RESPONSABILIDADES:
     2. Paralelismo: Executar 4 agentes simultaneamente para garantir performance.
     3. Agregação: Juntar as sugestões de todos os agentes em uma lista única.
     4. Priorização: Ordenar os insights finais por severidade antes de devolver ao usuário.
+    5. [NOVO] Streaming (`stream`): repassar a saída de cada nó do grafo assim que ele termina
+       (`astream` em modo "updates") e, por último, a lista priorizada (endpoint SSE).
 
 INTEGRAÇÕES:
     - LangGraph: Framework para orquestração de fluxo de trabalho (Workflows).
@@ -29,7 +31,7 @@ INTEGRAÇÕES:
 
 import logging
 import operator
-from typing import List, Annotated, TypedDict
+from typing import AsyncIterator, List, Annotated, Tuple, TypedDict
 
 # Imports do LangGraph (Framework de Orquestração)
 # START é o ponto de partida do grafo, END é o ponto de saída.
@@ -38,6 +40,7 @@ from langgraph.graph import StateGraph, END, START
 # Imports de Models Base e Contexto
 from app.services.ai.registros.context import RegistrosContext
 from app.services.ai.base.base_schema import AtomicSuggestion
+from app.services.ai.base.cache import ai_cache, AGENTE_CURADORIA
 
 # --- IMPORTS DOS AGENTES ESPECIALISTAS ---
 from app.services.ai.registros.time_strategist.agent import TimeStrategistAgent
@@ -47,6 +50,10 @@ from app.services.ai.registros.task_breaker.agent import TaskBreakerAgent
 
 logger = logging.getLogger(__name__)
 
+# A partir deste horário o TimeStrategist aplica a "Regra de Ouro das 18h".
+# A chave do resultado curado usa só o lado da regra (antes/depois), não o HH:MM.
+HORA_REGRA_PANICO = "18:00"
+
 # ==============================================================================
 # 1. STATE DEFINITION (O Estado Compartilhado do Grafo)
 # ==============================================================================
@@ -159,6 +166,7 @@ class RegistrosOrchestrator:
     """
     
     @staticmethod
+    @ai_cache.single_flight
     async def analyze(context: RegistrosContext) -> List[AtomicSuggestion]:
         """
         Método principal de análise.
@@ -170,6 +178,13 @@ class RegistrosOrchestrator:
             Lista ordenada e priorizada de sugestões.
         """
         logger.info(f"Iniciando RegistrosOrchestrator para UserID: {context.user_id}")
+
+        # Resultado curado em cache (stale-while-revalidate + single-flight também neste nível):
+        # um acerto dispensa a execução do grafo.
+        context_dict = RegistrosOrchestrator._chave_curadoria(context)
+        cached_response = await ai_cache.get("registros", AGENTE_CURADORIA, context_dict)
+        if cached_response:
+            return cached_response
         
         initial_state = {
             "context": context, 
@@ -178,21 +193,77 @@ class RegistrosOrchestrator:
         
         try:
             # Invoca o Grafo de forma assíncrona
-            final_state = await registros_graph.ainvoke(initial_state)
-            
-            # --- Lógica de Priorização Final ---
-            # O LangGraph nos devolve uma lista misturada. Precisamos ordenar
-            # para que os alertas CRÍTICOS apareçam no topo da UI.
-            def severity_key(s):
-                # Mapeia Enum para Inteiro (Menor = Mais Prioritário)
-                order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "none": 4}
-                return order.get(s.severity, 5)
-            
-            sorted_suggestions = sorted(final_state["suggestions"], key=severity_key)
-            
+            with ai_cache.rastrear_frescor() as montagem:
+                final_state = await registros_graph.ainvoke(initial_state)
+            sorted_suggestions = RegistrosOrchestrator._prioritize(final_state["suggestions"])
+
+            # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+            if not montagem.stale:
+                await ai_cache.set("registros", AGENTE_CURADORIA, context_dict, sorted_suggestions)
             return sorted_suggestions
             
         except Exception as e:
             # Catch-all de segurança máxima. O orquestrador não pode derrubar a API.
             logger.critical(f"Erro CATÁSTROFICO no RegistrosOrchestrator: {e}", exc_info=True)
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    async def stream(context: RegistrosContext) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze` (endpoint SSE).
+
+        Entrega `(nó, sugestões)` conforme cada agente do grafo termina e, por último,
+        `(AGENTE_CURADORIA, lista priorizada)`. Com o resultado em cache, só o final é emitido.
+        """
+        context_dict = RegistrosOrchestrator._chave_curadoria(context)
+        if await ai_cache.get("registros", AGENTE_CURADORIA, context_dict):
+            # Via analyze: single-flight e revalidação em segundo plano se estiver vencido
+            yield AGENTE_CURADORIA, await RegistrosOrchestrator.analyze(context)
+            return
+
+        suggestions: List[AtomicSuggestion] = []
+        try:
+            # Modo "updates": um item por nó concluído ({nome_do_nó: {"suggestions": [...]}})
+            with ai_cache.rastrear_frescor() as montagem:
+                async for update in registros_graph.astream({"context": context, "suggestions": []}, stream_mode="updates"):
+                    for node_name, node_output in update.items():
+                        suggestions.extend(node_output["suggestions"])
+                        yield node_name, node_output["suggestions"]
+        except Exception as e:
+            # O que já chegou ao cliente continua valendo; só não vai para o cache
+            logger.critical(f"Erro CATÁSTROFICO no RegistrosOrchestrator (streaming): {e}", exc_info=True)
+            yield AGENTE_CURADORIA, RegistrosOrchestrator._prioritize(suggestions)
+            return
+
+        sorted_suggestions = RegistrosOrchestrator._prioritize(suggestions)
+        # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+        if not montagem.stale:
+            await ai_cache.set("registros", AGENTE_CURADORIA, context_dict, sorted_suggestions)
+        yield AGENTE_CURADORIA, sorted_suggestions
+
+    @staticmethod
+    def _chave_curadoria(context: RegistrosContext) -> dict:
+        """
+        Contexto usado na chave do resultado curado, estável ao longo do dia.
+
+        `hora_atual` (HH:MM) mudaria a chave a cada minuto: o curado quase nunca seria
+        reaproveitado nem chegaria à janela stale. Fica apenas o período relevante à
+        regra das 18h, como nos contextos de Finanças e Roteiro (que só mudam com a data).
+        """
+        chave = context.model_dump(exclude={"hora_atual"})
+        chave["periodo"] = "apos_regra_18h" if context.hora_atual >= HORA_REGRA_PANICO else "antes_regra_18h"
+        return chave
+
+    @staticmethod
+    def _prioritize(suggestions: List[AtomicSuggestion]) -> List[AtomicSuggestion]:
+        """
+        Lógica de Priorização Final.
+        O LangGraph nos devolve uma lista misturada. Precisamos ordenar
+        para que os alertas CRÍTICOS apareçam no topo da UI.
+        """
+        def severity_key(s):
+            # Mapeia Enum para Inteiro (Menor = Mais Prioritário)
+            order = {"critical": 0, "high": 1, "medium": 2, "low": 3, "none": 4}
+            return order.get(s.severity, 5)
+
+        return sorted(suggestions, key=severity_key)
@@ -53,6 +53,7 @@ class PriorityAlchemistAgent:
     AGENT_NAME = "priority_alchemist"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RegistrosContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de priorização de tarefas.
@@ -61,6 +61,7 @@ class TaskBreakerAgent:
     ]
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RegistrosContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de granularidade das tarefas.
@@ -53,6 +53,7 @@ class TimeStrategistAgent:
     AGENT_NAME = "time_strategist"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RegistrosContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de urgência e prazos.
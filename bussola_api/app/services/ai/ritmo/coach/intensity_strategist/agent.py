@@ -46,6 +46,7 @@ class IntensityStrategistAgent:
     AGENT_NAME = "intensity_strategist"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: IntensityStrategistContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de intensidade do treino.
@@ -17,6 +17,7 @@ RESPONSABILIDADES:
     2. Execução Paralela: Rodar VolumeArchitect, TechniqueMaster e IntensityStrategist simultaneamente.
     3. Agregação: Consolidar todas as sugestões geradas em uma lista única.
     4. Tolerância a Falhas: Garantir que a falha de um agente não impeça o retorno dos outros.
+    5. [NOVO] Streaming (`stream`): repassar a saída de cada agente assim que ele termina.
 
 INTEGRAÇÕES:
     - LangGraph: Framework de orquestração de fluxo.
@@ -26,12 +27,12 @@ INTEGRAÇÕES:
 
 import logging
 import operator
-from typing import List, Annotated, TypedDict
+from typing import AsyncIterator, Dict, List, Annotated, Optional, TypedDict, Tuple
 
 from langgraph.graph import StateGraph, END
 
 # Imports Models (Dados do Banco)
-from app.models.ritmo import RitmoBio, RitmoPlanoTreino
+from app.models.ritmo import RitmoBio, RitmoPlanoTreino, GRUPO_MUSCULAR_PADRAO
 from app.services.ai.base.base_schema import AtomicSuggestion
 
 # Imports Agents (Inteligência Especializada)
@@ -57,6 +58,9 @@ class CoachState(TypedDict):
     # Inputs (Dados Brutos do Banco)
     bio: RitmoBio
     plano: RitmoPlanoTreino
+    # [OTIMIZAÇÃO] Séries por grupo já agregadas no banco (RitmoService.get_volume_semanal).
+    # Quando ausente, o nó recalcula percorrendo o plano.
+    volume_semanal: Optional[Dict[str, int]]
     
     # Output Acumulado
     # Annotated com operator.add instrui o LangGraph a SOMAR as listas retornadas
@@ -75,27 +79,24 @@ async def run_volume_architect(state: CoachState):
     Nó executor do Arquiteto de Volume.
     
     Lógica de Adaptação:
-    Percorre todo o plano de treino para somar as séries por grupo muscular.
+    Usa o volume já agregado via SQL (mesmo resultado do endpoint /ritmo/saude).
+    Sem ele, percorre todo o plano de treino para somar as séries por grupo muscular.
     Isso evita que o Agente precise iterar sobre dias e exercícios complexos.
     """
     bio = state["bio"]
     plano = state["plano"]
     
     # Agregação de Volume (Séries por Grupo Muscular)
-    volume_map = {}
-    if plano.dias:
-        for dia in plano.dias:
+    volume_map = state.get("volume_semanal")
+    if volume_map is None:
+        volume_map = {}
+        for dia in plano.dias or []:
             # Model: O relacionamento correto é 'exercicios'
-            if dia.exercicios:
-                for exercicio in dia.exercicios:
-                    # Fallback para "Geral" caso grupo muscular esteja vazio
-                    grupo = getattr(exercicio, "grupo_muscular", "Geral") or "Geral"
-                    series = getattr(exercicio, "series", 3)
-                    
-                    if grupo in volume_map:
-                        volume_map[grupo] += int(series)
-                    else:
-                        volume_map[grupo] = int(series)
+            for exercicio in dia.exercicios or []:
+                # Fallback para o grupo padrão (mesmo do RitmoService.get_volume_semanal)
+                grupo = getattr(exercicio, "grupo_muscular", None) or GRUPO_MUSCULAR_PADRAO
+                series = getattr(exercicio, "series", 3)
+                volume_map[grupo] = volume_map.get(grupo, 0) + int(series)
 
     # Mapeamento de Perfil
     # Usamos 'nivel_atividade' como proxy para experiência, já que 'experiencia_treino' não existe no model
@@ -133,7 +134,7 @@ async def run_technique_master(state: CoachState):
                     if nome and nome not in seen_names:
                         unique_exercises.append(ExerciseItem(
                             nome=str(nome),
-                            categoria=getattr(item, "grupo_muscular", "Geral") or "Geral"
+                            categoria=getattr(item, "grupo_muscular", None) or GRUPO_MUSCULAR_PADRAO
                         ))
                         seen_names.add(nome)
 
@@ -208,24 +209,25 @@ class CoachOrchestrator:
     """
     
     @staticmethod
-    async def analyze(bio: RitmoBio, plano: RitmoPlanoTreino) -> List[AtomicSuggestion]:
+    async def analyze(
+        bio: RitmoBio,
+        plano: RitmoPlanoTreino,
+        volume_semanal: Optional[Dict[str, int]] = None
+    ) -> List[AtomicSuggestion]:
         """
         Executa a análise completa de treino.
         
         Args:
             bio: Dados biométricos e perfil do usuário.
             plano: Estrutura do treino (dias, exercícios, séries).
+            volume_semanal: Séries por grupo muscular pré-agregadas (opcional).
             
         Returns:
             Lista consolidada de sugestões de todos os agentes.
         """
         logger.info(f"Iniciando CoachOrchestrator para BioID: {bio.id}")
         
-        initial_state = {
-            "bio": bio, 
-            "plano": plano, 
-            "suggestions": []
-        }
+        initial_state = CoachOrchestrator._initial_state(bio, plano, volume_semanal)
         
         try:
             # Invoca o Grafo Assíncrono
@@ -235,4 +237,35 @@ class CoachOrchestrator:
         except Exception as e:
             # Catch-all para evitar que falhas na IA quebrem a aplicação principal
             logger.error(f"Erro crítico no CoachOrchestrator: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    async def stream(
+        bio: RitmoBio,
+        plano: RitmoPlanoTreino,
+        volume_semanal: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze` (endpoint SSE): entrega `(nó, sugestões)`
+        conforme cada agente do grafo termina (`astream` em modo "updates").
+        """
+        try:
+            async for update in coach_graph.astream(CoachOrchestrator._initial_state(bio, plano, volume_semanal), stream_mode="updates"):
+                for node_name, node_output in update.items():
+                    yield node_name, node_output["suggestions"]
+        except Exception as e:
+            logger.error(f"Erro crítico no CoachOrchestrator (streaming): {e}")
+
+    @staticmethod
+    def _initial_state(
+        bio: RitmoBio,
+        plano: RitmoPlanoTreino,
+        volume_semanal: Optional[Dict[str, int]] = None
+    ) -> dict:
+        """Estado inicial do grafo (comum a `analyze` e `stream`)."""
+        return {
+            "bio": bio, 
+            "plano": plano, 
+            "volume_semanal": volume_semanal,
+            "suggestions": []
+        }
@@ -45,6 +45,7 @@ class TechniqueMasterAgent:
     AGENT_NAME = "technique_master"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: TechniqueMasterContext) -> List[AtomicSuggestion]:
         """
         Gera dicas técnicas para os exercícios listados.
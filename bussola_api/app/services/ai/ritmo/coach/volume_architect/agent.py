@@ -45,6 +45,7 @@ class VolumeArchitectAgent:
     AGENT_NAME = "volume_architect"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: VolumeArchitectContext) -> List[AtomicSuggestion]:
         """
         Analisa o volume de treino e sugere ajustes.
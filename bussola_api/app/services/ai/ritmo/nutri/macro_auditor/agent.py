@@ -46,6 +46,7 @@ class MacroAuditorAgent:
     AGENT_NAME = "macro_auditor"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: MacroAuditorContext) -> List[AtomicSuggestion]:
         """
         Executa a análise quantitativa da dieta.
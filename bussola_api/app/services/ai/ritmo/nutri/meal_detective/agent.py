@@ -45,6 +45,7 @@ class MealDetectiveAgent:
     AGENT_NAME = "meal_detective"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: MealDetectiveContext) -> List[AtomicSuggestion]:
         """
         Analisa a estrutura das refeições individuais.
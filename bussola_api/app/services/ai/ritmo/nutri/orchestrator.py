@@ -18,6 +18,7 @@ RESPONSABILIDADES:
     2. Recálculo de Métricas: Agregar macros (Prot/Carb/Gord) a partir dos alimentos, caso o banco tenha apenas totais.
     3. Execução Paralela: Rodar MacroAuditor, MealDetective e VarietyExpert simultaneamente via LangGraph.
     4. Resiliência: Garantir que falhas em um agente não impeçam o retorno dos outros.
+    5. [NOVO] Streaming (`stream`): repassar a saída de cada agente assim que ele termina.
 
 INTEGRAÇÕES:
     - LangGraph: Framework de orquestração de fluxo.
@@ -27,7 +28,7 @@ INTEGRAÇÕES:
 
 import logging
 import operator
-from typing import List, Annotated, TypedDict
+from typing import AsyncIterator, List, Annotated, TypedDict, Tuple
 
 from langgraph.graph import StateGraph, END
 
@@ -77,25 +78,11 @@ async def run_macro_auditor(state: NutriState):
     Nó executor do Auditor de Macros.
     
     Responsabilidade de Adaptação:
-    O modelo `RitmoDietaConfig` pode armazenar apenas calorias totais.
-    Este nó itera sobre todos os alimentos para somar Proteínas, Carbos e Gorduras
-    manualmente, garantindo que o agente receba dados precisos para a auditoria matemática.
+    [OTIMIZAÇÃO] Usa os totais de macros persistidos em `RitmoDietaConfig`
+    (mantidos incrementalmente pelo RitmoService), sem percorrer Refeição -> Alimento.
     """
     bio = state["bio"]
     dieta = state["dieta"]
-    
-    # Recálculo de totais agregados (Regra de Negócio: Precisão vem dos itens)
-    total_prot = 0.0
-    total_carb = 0.0
-    total_gord = 0.0
-    
-    if dieta.refeicoes:
-        for ref in dieta.refeicoes:
-            if ref.alimentos:
-                for alim in ref.alimentos:
-                    total_prot += float(alim.proteina or 0)
-                    total_carb += float(alim.carbo or 0)
-                    total_gord += float(alim.gordura or 0)
 
     context = MacroAuditorContext(
         # Mapeamento com defaults seguros para evitar crash se o perfil estiver incompleto
@@ -105,9 +92,9 @@ async def run_macro_auditor(state: NutriState):
         get=float(bio.gasto_calorico_total or 2000.0),
         
         dieta_calorias=float(dieta.calorias_calculadas or 0),
-        dieta_proteina=total_prot,
-        dieta_carbo=total_carb,
-        dieta_gordura=total_gord,
+        dieta_proteina=float(dieta.total_proteina or 0),
+        dieta_carbo=float(dieta.total_carbo or 0),
+        dieta_gordura=float(dieta.total_gordura or 0),
         
         agua_ml=float(bio.meta_agua or 2000.0),
         user_level=bio.nivel_atividade or "moderado"
@@ -132,15 +119,12 @@ async def run_meal_detective(state: NutriState):
     if dieta.refeicoes:
         for ref in dieta.refeicoes:
             alimentos_ctx = []
-            total_cal = 0.0
             
             if ref.alimentos:
                 for item in ref.alimentos:
                     prot = float(item.proteina or 0)
                     carb = float(item.carbo or 0)
                     fat = float(item.gordura or 0)
-                    cal = float(item.calorias or 0)
-                    total_cal += cal
 
                     alimentos_ctx.append(AlimentoItemContext(
                         nome=str(item.nome), 
@@ -157,7 +141,7 @@ async def run_meal_detective(state: NutriState):
                 # Contexto temporal inferido pela ordem, crucial para crononutrição
                 horario=f"{ref.nome} (Ref {ref.ordem})", 
                 alimentos=alimentos_ctx,
-                total_calorias=total_cal
+                total_calorias=float(ref.total_calorias or 0)
             ))
 
     context = MealDetectiveContext(
@@ -250,11 +234,7 @@ class NutriOrchestrator:
         """
         logger.info(f"Iniciando NutriOrchestrator para BioID: {bio.id}")
         
-        initial_state = {
-            "bio": bio, 
-            "dieta": dieta, 
-            "suggestions": []
-        }
+        initial_state = NutriOrchestrator._initial_state(bio, dieta)
         
         try:
             # Invoca o Grafo Assíncrono
@@ -264,4 +244,26 @@ class NutriOrchestrator:
         except Exception as e:
             # Catch-all de segurança: Retorna lista vazia em vez de derrubar a request
             logger.error(f"Erro crítico no NutriOrchestrator Graph: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    async def stream(bio: RitmoBio, dieta: RitmoDietaConfig) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze` (endpoint SSE): entrega `(nó, sugestões)`
+        conforme cada agente do grafo termina (`astream` em modo "updates").
+        """
+        try:
+            async for update in nutri_graph.astream(NutriOrchestrator._initial_state(bio, dieta), stream_mode="updates"):
+                for node_name, node_output in update.items():
+                    yield node_name, node_output["suggestions"]
+        except Exception as e:
+            logger.error(f"Erro crítico no NutriOrchestrator Graph (streaming): {e}")
+
+    @staticmethod
+    def _initial_state(bio: RitmoBio, dieta: RitmoDietaConfig) -> dict:
+        """Estado inicial do grafo (comum a `analyze` e `stream`)."""
+        return {
+            "bio": bio, 
+            "dieta": dieta, 
+            "suggestions": []
+        }
@@ -45,6 +45,7 @@ class VarietyExpertAgent:
     AGENT_NAME = "variety_expert"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, context: VarietyExpertContext) -> List[AtomicSuggestion]:
         context_dict = context.model_dump()
 
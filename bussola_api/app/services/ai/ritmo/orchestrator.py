@@ -17,6 +17,8 @@ RESPONSABILIDADES:
     3. Agregação e Resiliência: Juntar todos os insights e garantir que a falha de um lado (ex: Treino)
        não impeça o retorno do outro (ex: Nutrição).
     4. Priorização Global: Ordenar a lista final mista para que o usuário veja o mais crítico primeiro.
+    5. [NOVO] Streaming (`stream_profile`): intercalar as saídas dos grafos de Nutri e Treino
+       conforme cada agente termina e, por último, entregar a lista priorizada (endpoint SSE).
 
 INTEGRAÇÕES:
     - NutriOrchestrator: Especialista em Dieta.
@@ -26,13 +28,15 @@ INTEGRAÇÕES:
 
 import logging
 import asyncio
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # Models SQL
 from app.models.ritmo import RitmoBio, RitmoDietaConfig, RitmoPlanoTreino
 
 # Base Schemas
 from app.services.ai.base.base_schema import AtomicSuggestion
+from app.services.ai.base.cache import AGENTE_CURADORIA
+from app.services.ai.base.streaming import mesclar
 from app.services.ai.ritmo.schema import RitmoAnalysisResponse
 
 # Sub-Orchestrators (Especialistas de Domínio)
@@ -51,7 +55,8 @@ class RitmoOrchestrator:
         cls, 
         bio: RitmoBio, 
         dieta: Optional[RitmoDietaConfig] = None, 
-        plano_treino: Optional[RitmoPlanoTreino] = None
+        plano_treino: Optional[RitmoPlanoTreino] = None,
+        volume_semanal: Optional[Dict[str, int]] = None
     ) -> RitmoAnalysisResponse:
         """
         Executa a análise 360º do perfil do usuário.
@@ -64,6 +69,7 @@ class RitmoOrchestrator:
             bio: Dados biológicos e antropométricos (Peso, Altura, Objetivo) - OBRIGATÓRIO.
             dieta: Configuração de dieta ativa (Refeições, Alimentos) - OPCIONAL.
             plano_treino: Plano de treino ativo (Fichas, Exercícios) - OPCIONAL.
+            volume_semanal: Séries por grupo muscular já agregadas no banco - OPCIONAL.
             
         Returns:
             Objeto contendo a lista unificada e priorizada de sugestões.
@@ -87,7 +93,7 @@ class RitmoOrchestrator:
             tasks.append(NutriOrchestrator.analyze(bio, dieta))
         
         if plano_treino:
-            tasks.append(CoachOrchestrator.analyze(bio, plano_treino))
+            tasks.append(CoachOrchestrator.analyze(bio, plano_treino, volume_semanal))
 
         # ----------------------------------------------------------------------
         # 2. EXECUÇÃO CONCORRENTE (Asyncio)
@@ -112,6 +118,41 @@ class RitmoOrchestrator:
                 logger.error(f"Erro em um dos sub-orquestradores: {result}")
                 # Apenas logamos. O fluxo continua com o que tivermos de sucesso.
 
+        cls._prioritize(final_suggestions)
+        logger.info(f"Análise Ritmo concluída. Total de insights: {len(final_suggestions)}")
+        
+        return RitmoAnalysisResponse(suggestions=final_suggestions)
+
+    @classmethod
+    async def stream_profile(
+        cls,
+        bio: RitmoBio,
+        dieta: Optional[RitmoDietaConfig] = None,
+        plano_treino: Optional[RitmoPlanoTreino] = None,
+        volume_semanal: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze_profile` (endpoint SSE).
+
+        Entrega `(agente, sugestões)` conforme cada agente de Nutri ou Treino termina e,
+        por último, `(AGENTE_CURADORIA, lista priorizada)`.
+        """
+        fluxos = []
+        if bio and dieta:
+            fluxos.append(NutriOrchestrator.stream(bio, dieta))
+        if bio and plano_treino:
+            fluxos.append(CoachOrchestrator.stream(bio, plano_treino, volume_semanal))
+
+        final_suggestions: List[AtomicSuggestion] = []
+        async for agent_name, suggestions in mesclar(*fluxos):
+            final_suggestions.extend(suggestions)
+            yield agent_name, suggestions
+
+        yield AGENTE_CURADORIA, cls._prioritize(final_suggestions)
+
+    @staticmethod
+    def _prioritize(suggestions: List[AtomicSuggestion]) -> List[AtomicSuggestion]:
+        """Ordena a lista (in-place) e a devolve; comum às versões completa e incremental."""
         # ----------------------------------------------------------------------
         # 4. ORDENAÇÃO INTELIGENTE (Priorização Global)
         # ----------------------------------------------------------------------
@@ -132,11 +173,8 @@ class RitmoOrchestrator:
 
         # Ordenação reversa (Maior peso primeiro)
         # Soma o peso da severidade + peso do tipo para desempate.
-        final_suggestions.sort(
+        suggestions.sort(
             key=lambda x: severity_weight.get(x.severity, 0) + severity_weight.get(x.type, 0),
             reverse=True
         )
-
-        logger.info(f"Análise Ritmo concluída. Total de insights: {len(final_suggestions)}")
-        
-        return RitmoAnalysisResponse(suggestions=final_suggestions)
\ No newline at end of file
+        return suggestions
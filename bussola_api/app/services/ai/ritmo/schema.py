@@ -9,4 +9,7 @@ class RitmoAnalysisResponse(BaseModel):
     (ex: 'analysis_timestamp', 'tokens_used') no futuro sem quebrar o front.
     """
     suggestions: List[AtomicSuggestion]
-    generated_at: Optional[str] = None
\ No newline at end of file
+    generated_at: Optional[str] = None
+    # [NOVO] True se alguma parte veio de cache vencido (stale-while-revalidate): a versão
+    # nova está sendo calculada em segundo plano e aparece na próxima consulta.
+    stale: bool = False
\ No newline at end of file
@@ -55,6 +55,7 @@ class ConflictGuardianAgent:
     AGENT_NAME = "conflict_guardian"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RoteiroContext) -> List[AtomicSuggestion]:
         """
         Executa a varredura de conflitos na agenda.
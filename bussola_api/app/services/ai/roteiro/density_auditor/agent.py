@@ -54,6 +54,7 @@ class DensityAuditorAgent:
     AGENT_NAME = "density_auditor"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RoteiroContext) -> List[AtomicSuggestion]:
         """
         Executa a auditoria de densidade da agenda.
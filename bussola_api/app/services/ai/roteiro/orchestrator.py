@@ -13,10 +13,13 @@ CAMADA:
     É o ponto de entrada chamado pelo `ai.py` (Controller).
 
 RESPONSABILIDADES:
-    1. Unificação de Contexto: Transformar dados brutos da agenda em um objeto de contexto imutável.
+    1. Unificação de Contexto: Transformar dados brutos da agenda em um objeto de contexto imutável
+       (ou recebê-lo pronto do `ContextBuilder` via `analyze_context`).
     2. Execução Paralela: Disparar ConflictGuardian, DensityAuditor, RecoveryAgent e TravelMarshal simultaneamente.
     3. Resiliência: Garantir que a falha de um agente não impeça o retorno dos insights dos outros.
     4. Curadoria (CFO Logic): Filtrar ruídos (ex: checklists genéricos), deduplicar e ordenar por severidade.
+    5. [NOVO] Streaming (`stream_context`): entregar as sugestões de cada agente assim que ele
+       termina e, por último, o resultado curado (endpoint SSE).
 
 INTEGRAÇÕES:
     - Agentes: ConflictGuardian, DensityAuditor, RecoveryAgent, TravelMarshal.
@@ -26,7 +29,7 @@ INTEGRAÇÕES:
 import asyncio
 import logging
 import json
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 
 # Imports dos Agentes Especialistas
 from app.services.ai.roteiro.conflict_guardian.agent import ConflictGuardianAgent
@@ -37,6 +40,8 @@ from app.services.ai.roteiro.travel_marshal.agent import TravelMarshalAgent
 # Contexto e Schema Base
 from app.services.ai.roteiro.context import RoteiroContext
 from app.services.ai.base.base_schema import AtomicSuggestion
+from app.services.ai.base.cache import ai_cache, AGENTE_CURADORIA
+from app.services.ai.base.streaming import conforme_concluem
 
 logger = logging.getLogger(__name__)
 
@@ -82,8 +87,23 @@ class RoteiroOrchestrator:
             agenda_itens=agenda_itens,
             user_preferences=preferences or {}
         )
-        
-        print(f"\n[RoteiroOrchestrator] 🚀 Iniciando análise. Itens na agenda: {len(agenda_itens)}")
+        return await RoteiroOrchestrator.analyze_context(context)
+
+    @staticmethod
+    @ai_cache.single_flight
+    async def analyze_context(context: RoteiroContext) -> List[AtomicSuggestion]:
+        """
+        [NOVO] Mesma análise a partir de um `RoteiroContext` já montado
+        (ex: pelo `ContextBuilder`).
+        """
+        # Resultado curado em cache (stale-while-revalidate + single-flight também neste nível):
+        # um acerto dispensa o fan-out dos agentes e a curadoria.
+        context_dict = context.model_dump()
+        cached_response = await ai_cache.get("roteiro", AGENTE_CURADORIA, context_dict)
+        if cached_response:
+            return cached_response
+
+        print(f"\n[RoteiroOrchestrator] 🚀 Iniciando análise. Itens na agenda: {len(context.agenda_itens)}")
 
         # ----------------------------------------------------------------------
         # 2. EXECUÇÃO PARALELA (Asyncio)
@@ -91,13 +111,14 @@ class RoteiroOrchestrator:
         # Dispara todos os agentes simultaneamente para reduzir a latência total.
         # 'return_exceptions=True' implementa Degradação Graciosa:
         # Se um agente falhar, os outros continuam e o fluxo não quebra.
-        results = await asyncio.gather(
-            ConflictGuardianAgent.run(context),
-            DensityAuditorAgent.run(context),
-            RecoveryAgent.run(context),
-            TravelMarshalAgent.run(context),
-            return_exceptions=True
-        )
+        with ai_cache.rastrear_frescor() as montagem:
+            results = await asyncio.gather(
+                ConflictGuardianAgent.run(context),
+                DensityAuditorAgent.run(context),
+                RecoveryAgent.run(context),
+                TravelMarshalAgent.run(context),
+                return_exceptions=True
+            )
 
         # ----------------------------------------------------------------------
         # 3. CONSOLIDAÇÃO E TRATAMENTO DE ERROS
@@ -127,6 +148,50 @@ class RoteiroOrchestrator:
                 else:
                     print(f"⚪ {agent_name}: Sem sugestões.")
 
+        cleaned_suggestions = RoteiroOrchestrator._curate(raw_suggestions)
+
+        # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+        if not montagem.stale:
+            await ai_cache.set("roteiro", AGENTE_CURADORIA, context_dict, cleaned_suggestions)
+        return cleaned_suggestions
+
+    @staticmethod
+    async def stream_context(context: RoteiroContext) -> AsyncIterator[Tuple[str, List[AtomicSuggestion]]]:
+        """
+        [NOVO] Versão incremental de `analyze_context` (endpoint SSE).
+
+        Entrega `(agente, sugestões)` assim que cada agente termina e, por último,
+        `(AGENTE_CURADORIA, lista curada)`. Com o resultado curado em cache, só o final é emitido.
+        """
+        context_dict = context.model_dump()
+        if await ai_cache.get("roteiro", AGENTE_CURADORIA, context_dict):
+            # Via analyze_context: single-flight e revalidação em segundo plano se estiver vencido
+            yield AGENTE_CURADORIA, await RoteiroOrchestrator.analyze_context(context)
+            return
+
+        print(f"\n[RoteiroOrchestrator] 🚀 Iniciando análise (streaming). Itens na agenda: {len(context.agenda_itens)}")
+
+        raw_suggestions: List[AtomicSuggestion] = []
+        with ai_cache.rastrear_frescor() as montagem:
+            async for agent_name, result in conforme_concluem({
+                agent.AGENT_NAME: agent.run(context)
+                for agent in (ConflictGuardianAgent, DensityAuditorAgent, RecoveryAgent, TravelMarshalAgent)
+            }):
+                if isinstance(result, Exception):
+                    logger.error(f"[RoteiroOrchestrator] Erro no agente {agent_name}: {result}")
+                    continue
+                raw_suggestions.extend(result)
+                yield agent_name, result
+
+        cleaned_suggestions = RoteiroOrchestrator._curate(raw_suggestions)
+        # Algum agente serviu versão vencida: o curado não é gravado (nasceria "fresco")
+        if not montagem.stale:
+            await ai_cache.set("roteiro", AGENTE_CURADORIA, context_dict, cleaned_suggestions)
+        yield AGENTE_CURADORIA, cleaned_suggestions
+
+    @staticmethod
+    def _curate(raw_suggestions: List[AtomicSuggestion]) -> List[AtomicSuggestion]:
+        """Curadoria comum às versões completa e incremental (filtros de UX, deduplicação e ordem)."""
         # ----------------------------------------------------------------------
         # 4. PÓS-PROCESSAMENTO E FILTROS DE UX
         # ----------------------------------------------------------------------
@@ -165,5 +230,4 @@ class RoteiroOrchestrator:
 
         print(f"[RoteiroOrchestrator] ✅ Análise concluída.")
         print(f"📊 Redução de Ruído: {len(raw_suggestions)} insights originais -> {len(cleaned_suggestions)} insights finais.\n")
-        
-        return cleaned_suggestions
\ No newline at end of file
+        return cleaned_suggestions
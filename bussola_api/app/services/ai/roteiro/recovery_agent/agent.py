@@ -54,6 +54,7 @@ class RecoveryAgent:
     AGENT_NAME = "recovery_agent"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RoteiroContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de recuperação de agenda.
@@ -53,6 +53,7 @@ class TravelMarshalAgent:
     AGENT_NAME = "travel_marshal"
 
     @classmethod
+    @ai_cache.single_flight # Execuções idênticas concorrentes: uma única chamada de LLM
     async def run(cls, global_context: RoteiroContext) -> List[AtomicSuggestion]:
         """
         Executa a análise de logística e deslocamento.
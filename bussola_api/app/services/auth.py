@@ -37,8 +37,9 @@ from app.schemas.token import Token
 from app.core import security
 from app.core.config import settings
 from app.utils.email import send_password_reset_email, send_account_verification_email
-from app.api.deps import redis_client
-from app.core.timezone import now_utc # [NOVO]
+from app.core.principal_cache import principal_cache
+from app.core.token_revocation import token_revocation
+from app.services.system import system_service
 
 class AuthService:
     """
@@ -77,12 +78,20 @@ class AuthService:
         # 1. Busca Usuário
         user = self.session.query(User).filter(User.email == email).first()
         
-        # 2. Verifica Credenciais (Hash seguro)
-        if not user or not user.hashed_password or not security.verify_password(password, user.hashed_password):
+        # 2. Verifica Credenciais (Hash seguro, no pool de processos do bcrypt)
+        senha_ok, novo_hash = False, None
+        if user and user.hashed_password:
+            senha_ok, novo_hash = security.verify_and_update_password(password, user.hashed_password)
+        if not senha_ok:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email ou senha incorretos.",
             )
+
+        # [NOVO] Re-hash transparente: custo (BCRYPT_ROUNDS) mudou desde o último login
+        if novo_hash:
+            user.hashed_password = novo_hash
+            self.session.commit()
         
         # 3. Verifica Status (Soft Delete / Banimento)
         if not user.is_active:
@@ -171,6 +180,8 @@ class AuthService:
                 self.session.add(user)
                 self.session.commit()
                 self.session.refresh(user)
+                # [NOVO] Perfil alterado: descarta o principal em cache (todos os workers)
+                principal_cache.invalidar_usuario(user.id)
         
         if not user.is_active:
             raise HTTPException(status_code=400, detail="Usuário inativo.")
@@ -185,10 +196,6 @@ class AuthService:
         """
         Valida o Refresh Token e emite um novo par Access/Refresh.
         """
-        # Checa Blacklist
-        if redis_client.exists(f"blacklist:{refresh_token}"):
-            raise HTTPException(status_code=401, detail="Refresh token revogado.")
-
         try:
             payload = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
             
@@ -202,6 +209,10 @@ class AuthService:
         except (JWTError, ValueError):
             raise HTTPException(status_code=401, detail="Refresh token expirado ou inválido.")
 
+        # Checa Revogação (por 'jti'; tokens legados pela chave antiga)
+        if token_revocation.esta_revogado(payload.get("jti"), refresh_token):
+            raise HTTPException(status_code=401, detail="Refresh token revogado.")
+
         # Opcional: Rotacionar o Refresh Token (Segurança Máxima)
         # Queimamos o anterior e emitimos um novo.
         self.logout(refresh_token) # Revoga o atual
@@ -213,17 +224,15 @@ class AuthService:
     # ----------------------------------------------------------------------------------
     def logout(self, token: str) -> None:
         """
-        Adiciona o token à Blacklist do Redis até sua expiração natural.
+        Revoga o token até sua expiração natural.
+        [OTIMIZAÇÃO] Guarda apenas o 'jti' (não o token inteiro) e publica no stream
+        de revogações, que alimenta o Filtro de Bloom de cada worker.
         """
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-            # Calcula tempo restante de vida (TTL)
-            exp_timestamp = payload.get("exp")
-            now_timestamp = now_utc().timestamp() # [CORREÇÃO]
-            ttl = int(exp_timestamp - now_timestamp)
-            
-            if ttl > 0:
-                redis_client.setex(f"blacklist:{token}", ttl, "revoked")
+            token_revocation.revogar(payload.get("jti"), payload.get("exp"), token)
+            # [NOVO] Derruba o principal em cache de todos os workers
+            principal_cache.invalidar_token(payload.get("jti"))
                 
         except Exception:
             # Se token já inválido, ignora erro
@@ -243,7 +252,8 @@ class AuthService:
            ganha privilégios de Superusuário automaticamente.
         3. E-mail Único: Impede duplicidade.
         """
-        user_count = self.session.query(User).count()
+        # [OTIMIZAÇÃO] Contador mantido em 'sistema_estado' (sem COUNT(*) em 'user')
+        user_count = system_service.get_total_usuarios(self.session)
         
         if not settings.ENABLE_PUBLIC_REGISTRATION:
             if user_count > 0:
@@ -355,5 +365,6 @@ class AuthService:
         user.hashed_password = security.get_password_hash(payload.new_password)
         self.session.add(user)
         self.session.commit()
+        principal_cache.invalidar_usuario(user.id)
         
         return "Senha alterada com sucesso."
\ No newline at end of file
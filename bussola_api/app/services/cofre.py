@@ -16,6 +16,8 @@ RESPONSABILIDADES:
     2. Descriptografar dados apenas sob demanda explícita (Read).
     3. Gerenciar metadados dos segredos (CRUD).
     4. Garantir isolamento estrito de dados por usuário (user_id).
+    5. Rotacionar a ENCRYPTION_KEY (MultiFernet + re-criptografia em lotes retomável).
+    6. Manter contadores por usuário (ativos/expirados) e o resumo diário de expirações.
 
 COMUNICAÇÃO:
     - Config: Utiliza settings.ENCRYPTION_KEY para inicializar o cipher.
@@ -25,11 +27,23 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
+import hashlib
+import logging
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import update, bindparam, func, case
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from cryptography.fernet import Fernet
+from cryptography.fernet import Fernet, MultiFernet, InvalidToken
 from app.core.config import settings
-from app.models.cofre import Segredo
+from app.core.timezone import now_utc, now_local
+from app.models.cofre import Segredo, CofreRotacaoChave, CofreContador
+from app.models.user import User
 from app.schemas.cofre import SegredoCreate, SegredoUpdate
+from app.utils.email import build_cofre_expiry_digest, send_bulk_emails
+
+logger = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------------------
 # INICIALIZAÇÃO DO MOTOR CRIPTOGRÁFICO
@@ -37,11 +51,34 @@ from app.schemas.cofre import SegredoCreate, SegredoUpdate
 # Tenta carregar a chave de criptografia simétrica (Fernet/AES) das variáveis de ambiente.
 # Se a chave falhar ou não existir, o serviço inicia, mas operações de escrita/leitura
 # de senhas falharão de forma controlada.
+#
+# [NOVO] Rotação de chave (MultiFernet):
+#   - Criptografa SEMPRE com a ENCRYPTION_KEY (primária).
+#   - Descriptografa com a primária ou qualquer chave em ENCRYPTION_KEYS_ANTIGAS.
+#   A API continua servindo normalmente enquanto o job re-criptografa os registros.
+def _carregar_chaves():
+    antigas = [k.strip() for k in settings.ENCRYPTION_KEYS_ANTIGAS.split(",") if k.strip()]
+    primaria = Fernet(settings.ENCRYPTION_KEY.encode())
+    return primaria, MultiFernet([primaria] + [Fernet(k.encode()) for k in antigas])
+
 try:
-    cipher_suite = Fernet(settings.ENCRYPTION_KEY.encode())
+    cipher_primario, cipher_suite = _carregar_chaves()
 except Exception as e:
     print(f"AVISO: Falha ao carregar ENCRYPTION_KEY no CofreService: {e}")
-    cipher_suite = None
+    cipher_primario, cipher_suite = None, None
+
+# Fingerprint da chave primária (identifica o progresso da rotação sem expor a chave)
+CHAVE_PRIMARIA_ID = hashlib.sha256(settings.ENCRYPTION_KEY.encode()).hexdigest()[:16]
+
+# Mensagens controladas devolvidas no lugar do valor quando a descriptografia não é possível
+ERRO_DESCRIPTOGRAFIA = "!! ERRO DE DESCRIPTOGRAFIA !!"
+ERRO_SEM_CHAVE = "!! ERRO: SISTEMA SEM CHAVE !!"
+
+# Colunas da listagem: apenas metadados, nunca o ciphertext
+COLUNAS_METADADOS = (
+    Segredo.id, Segredo.titulo, Segredo.servico, Segredo.notas,
+    Segredo.data_criacao, Segredo.data_expiracao
+)
 
 class CofreService:
     
@@ -51,11 +88,13 @@ class CofreService:
 
         DECISÃO TÉCNICA (PERFORMANCE & SEGURANÇA):
         Este método retorna apenas os METADADOS (título, serviço, notas).
-        A coluna 'valor_criptografado' é retornada do banco, mas não é descriptografada aqui.
-        Isso evita o custo computacional de descriptografar uma lista inteira e 
-        reduz a superfície de ataque (senhas não ficam em memória desnecessariamente).
+        [OTIMIZAÇÃO] A query projeta só as colunas de metadados (linhas leves, sem
+        instanciar o ORM): o ciphertext nem sai do banco. Isso evita o custo de
+        transferir/descriptografar uma lista inteira e reduz a superfície de ataque
+        (senhas não ficam em memória desnecessariamente).
         """
-        return db.query(Segredo).filter(Segredo.user_id == user_id).order_by(Segredo.servico, Segredo.titulo).all()
+        return db.query(*COLUNAS_METADADOS).filter(Segredo.user_id == user_id)\
+            .order_by(Segredo.servico, Segredo.titulo).all()
 
     def create(self, db: Session, dados: SegredoCreate, user_id: int):
         """
@@ -92,6 +131,7 @@ class CofreService:
         )
         
         db.add(novo)
+        self._ajustar_contador(db, user_id, data_nova=novo.data_expiracao, delta_total=1)
         db.commit()
         db.refresh(novo)
         return novo
@@ -120,11 +160,14 @@ class CofreService:
                  raise Exception("Erro de configuração: Chave de criptografia ausente.")
 
         # Lógica de data
+        data_antiga = segredo.data_expiracao
         if dados.model_fields_set and 'data_expiracao' in dados.model_dump(exclude_unset=True):
              segredo.data_expiracao = dados.data_expiracao
         elif dados.data_expiracao is not None:
              segredo.data_expiracao = dados.data_expiracao
 
+        if segredo.data_expiracao != data_antiga:
+            self._ajustar_contador(db, user_id, data_antiga=data_antiga, data_nova=segredo.data_expiracao)
         db.commit()
         db.refresh(segredo)
         return segredo
@@ -134,6 +177,7 @@ class CofreService:
         segredo = db.query(Segredo).filter(Segredo.id == id, Segredo.user_id == user_id).first()
         if segredo:
             db.delete(segredo)
+            self._ajustar_contador(db, user_id, data_antiga=segredo.data_expiracao, delta_total=-1)
             db.commit()
             return True
         return False
@@ -150,19 +194,267 @@ class CofreService:
             str: A senha original ou uma mensagem de erro controlada se a chave
                  tiver mudado ou estiver incorreta.
         """
-        segredo = db.query(Segredo).filter(Segredo.id == id, Segredo.user_id == user_id).first()
-        
-        if not segredo: 
+        # [OTIMIZAÇÃO] Busca apenas a coluna do ciphertext (não a linha inteira)
+        token = db.query(Segredo.valor_criptografado)\
+            .filter(Segredo.id == id, Segredo.user_id == user_id).scalar()
+        if token is None:
             return None
-            
-        if cipher_suite and segredo.valor_criptografado:
+        return self._descriptografar(token)
+
+    def revelar_lote(self, db: Session, ids: List[int], user_id: int) -> Dict[int, str]:
+        """
+        Descriptografa um conjunto de segredos em UMA query.
+
+        Mesmas garantias da rota unitária: filtro por user_id (IDs de outros usuários
+        simplesmente não retornam) e mensagens controladas em caso de falha.
+        Usa a mesma instância de Fernet (`cipher_suite`) para todos os itens.
+
+        Retorno:
+            dict {id: valor}. IDs inexistentes ficam de fora.
+        """
+        if not ids:
+            return {}
+        linhas = db.query(Segredo.id, Segredo.valor_criptografado)\
+            .filter(Segredo.user_id == user_id, Segredo.id.in_(set(ids))).all()
+        return {segredo_id: self._descriptografar(token) for segredo_id, token in linhas}
+
+    def _descriptografar(self, token: str) -> str:
+        if not token:
+            return "" # Nada armazenado: não é falha de chave nem de descriptografia
+        if not cipher_suite:
+            return ERRO_SEM_CHAVE
+        try:
+            # Tenta reverter a criptografia usando a chave atual
+            return cipher_suite.decrypt(token.encode()).decode()
+        except Exception:
+            # Ocorre se a ENCRYPTION_KEY mudou ou os dados estão corrompidos
+            return ERRO_DESCRIPTOGRAFIA
+
+    # ==========================================================
+    # CONTADORES (KPIs do Panorama) E RESUMO DE EXPIRAÇÕES
+    # ==========================================================
+
+    def get_contadores(self, db: Session, user_id: int) -> Tuple[int, int]:
+        """
+        Retorna (ativos, expirados) do cofre do usuário.
+
+        [OTIMIZAÇÃO] Lê a linha de CofreContador (busca por PK). Só recalcula
+        (uma consulta agregada no índice user_id/data_expiracao) quando algum
+        segredo cruzou a data de expiração desde o último cálculo.
+        """
+        hoje = now_local().date()
+        contador = db.get(CofreContador, user_id)
+        if not self._contador_valido(contador, hoje):
+            contador = self._recalcular_contador(db, user_id, hoje)
             try:
-                # Tenta reverter a criptografia usando a chave atual
-                return cipher_suite.decrypt(segredo.valor_criptografado.encode()).decode()
-            except Exception:
-                # Ocorre se a ENCRYPTION_KEY mudou ou os dados estão corrompidos
-                return "!! ERRO DE DESCRIPTOGRAFIA !!"
-        
-        return "!! ERRO: SISTEMA SEM CHAVE !!"
+                db.commit()
+            except IntegrityError:
+                # Outra requisição criou o contador ao mesmo tempo: os números calculados seguem válidos
+                db.rollback()
+        return contador.total - contador.expirados, contador.expirados
+
+    @staticmethod
+    def _contador_valido(contador: Optional[CofreContador], hoje: date) -> bool:
+        """Nenhum segredo expirou desde `calculado_em` (e não voltamos no tempo)."""
+        if not contador or hoje < contador.calculado_em:
+            return False
+        return contador.proxima_expiracao is None or hoje <= contador.proxima_expiracao
+
+    def _recalcular_contador(self, db: Session, user_id: int, hoje: date) -> CofreContador:
+        db.flush() # Garante que escritas pendentes da transação entrem na contagem
+        total, expirados, proxima = db.query(
+            func.count(Segredo.id),
+            func.count(case((Segredo.data_expiracao < hoje, 1))),
+            func.min(case((Segredo.data_expiracao >= hoje, Segredo.data_expiracao))),
+        ).filter(Segredo.user_id == user_id).one()
+
+        contador = db.get(CofreContador, user_id)
+        if not contador:
+            contador = CofreContador(user_id=user_id)
+            db.add(contador)
+        contador.total, contador.expirados = total, expirados
+        contador.proxima_expiracao, contador.calculado_em = proxima, hoje
+        return contador
+
+    def _ajustar_contador(
+        self, db: Session, user_id: int,
+        data_antiga: Optional[date] = None, data_nova: Optional[date] = None, delta_total: int = 0
+    ):
+        """
+        Atualiza os contadores na mesma transação da escrita, pelo delta da operação.
+        Recalcula do zero apenas se o contador estiver desatualizado ou se a
+        `proxima_expiracao` atual for a data que está saindo.
+        """
+        hoje = now_local().date()
+        contador = db.get(CofreContador, user_id)
+        if not self._contador_valido(contador, hoje) or (data_antiga is not None and data_antiga == contador.proxima_expiracao):
+            self._recalcular_contador(db, user_id, hoje)
+            return
+
+        # UPDATE relativo (total = total + delta) no banco: escritas concorrentes do mesmo
+        # usuário não se sobrescrevem (sem read-modify-write em Python).
+        delta_expirados = 0
+        if data_antiga is not None and data_antiga < hoje:
+            delta_expirados -= 1
+        valores = {"calculado_em": hoje}
+        if delta_total:
+            valores["total"] = CofreContador.total + delta_total
+        if data_nova is not None:
+            if data_nova < hoje:
+                delta_expirados += 1
+            else:
+                valores["proxima_expiracao"] = case(
+                    (CofreContador.proxima_expiracao.is_(None), data_nova),
+                    (CofreContador.proxima_expiracao > data_nova, data_nova),
+                    else_=CofreContador.proxima_expiracao,
+                )
+        if delta_expirados:
+            valores["expirados"] = CofreContador.expirados + delta_expirados
+
+        db.flush() # Contador recém-criado na transação precisa existir para o UPDATE
+        db.execute(
+            update(CofreContador).where(CofreContador.user_id == user_id).values(**valores),
+            execution_options={"synchronize_session": False},
+        )
+        db.expire(contador, list(valores)) # Próxima leitura na sessão busca os valores do banco
+
+    def coletar_expiracoes(self, db: Session, dias: int, hoje: Optional[date] = None) -> Dict[int, dict]:
+        """
+        Segredos que expiram entre hoje e hoje + `dias`, de TODOS os usuários ativos,
+        em uma única query (range scan em data_expiracao), agrupados por usuário.
+
+        Retorno:
+            {user_id: {"email": str, "itens": [(titulo, servico, data_expiracao), ...]}}
+        """
+        hoje = hoje or now_local().date()
+        linhas = db.query(Segredo.user_id, User.email, Segredo.titulo, Segredo.servico, Segredo.data_expiracao)\
+            .join(User, User.id == Segredo.user_id)\
+            .filter(
+                Segredo.data_expiracao >= hoje,
+                Segredo.data_expiracao <= hoje + timedelta(days=dias),
+                User.is_active == True
+            ).order_by(Segredo.user_id, Segredo.data_expiracao).all()
+
+        por_usuario: Dict[int, dict] = {}
+        for user_id, email, titulo, servico, data_expiracao in linhas:
+            por_usuario.setdefault(user_id, {"email": email, "itens": []})["itens"].append((titulo, servico, data_expiracao))
+        return por_usuario
+
+    async def enviar_digest_expiracao(self, db: Session, dias: Optional[int] = None) -> dict:
+        """
+        Job diário: um e-mail de resumo por usuário (não um por segredo), enviados em
+        lote reaproveitando conexões SMTP. Sem SMTP configurado, apenas reporta.
+        """
+        dias = dias or settings.COFRE_DIGEST_DIAS
+        por_usuario = self.coletar_expiracoes(db, dias)
+        resumo = {
+            "usuarios": len(por_usuario),
+            "segredos": sum(len(d["itens"]) for d in por_usuario.values()),
+            "enviados": 0,
+        }
+        if not por_usuario:
+            return resumo
+        if not settings.EMAILS_ENABLED:
+            logger.warning("[Cofre] Resumo de expirações não enviado: SMTP não configurado.")
+            return resumo
+
+        mensagens = [build_cofre_expiry_digest(d["email"], d["itens"], dias) for d in por_usuario.values()]
+        resumo["enviados"] = await send_bulk_emails(mensagens)
+        return resumo
+
+    # ==========================================================
+    # ROTAÇÃO DE CHAVE (Re-criptografia em lote)
+    # ==========================================================
+
+    def get_status_rotacao(self, db: Session) -> Optional[CofreRotacaoChave]:
+        """Progresso da re-criptografia para a chave primária atual (None se nunca iniciada)."""
+        return db.query(CofreRotacaoChave).filter(CofreRotacaoChave.chave_id == CHAVE_PRIMARIA_ID).first()
+
+    def rotacionar_chave(self, db: Session, tamanho_lote: Optional[int] = None, max_lotes: Optional[int] = None) -> dict:
+        """
+        Re-criptografa todos os segredos com a chave primária atual.
+
+        FLUXO (Online e Retomável):
+        1. Paginação por keyset (id > watermark ORDER BY id LIMIT lote): custo constante
+           por lote, sem OFFSET.
+        2. Tokens que a primária já abre são pulados (retomadas não reescrevem nada).
+        3. Os demais passam por `MultiFernet.rotate` (abre com a antiga, grava com a primária).
+        4. UPDATE em lote condicionado ao ciphertext lido: se o usuário alterou o segredo
+           durante a rotação, o valor novo (já na primária) é preservado.
+        5. O watermark é salvo no MESMO commit do lote: após um crash, o job retoma
+           exatamente do último lote confirmado.
+
+        Retorno:
+            Resumo do progresso com a vazão (linhas/s) desta execução.
+        """
+        if not cipher_suite:
+            raise Exception("Encryption Key não configurada. Não é possível rotacionar segredos.")
+        tamanho_lote = tamanho_lote or settings.COFRE_ROTACAO_LOTE
+
+        estado = self.get_status_rotacao(db)
+        if not estado:
+            estado = CofreRotacaoChave(chave_id=CHAVE_PRIMARIA_ID, ultimo_id=0, processados=0, reescritos=0, falhas=0)
+            db.add(estado)
+            db.commit()
+
+        stmt = update(Segredo.__table__).where(
+            Segredo.__table__.c.id == bindparam("b_id"),
+            Segredo.__table__.c._valor_criptografado == bindparam("b_antigo"),
+        ).values(_valor_criptografado=bindparam("b_novo"))
+
+        inicio, processados_execucao, lotes = time.perf_counter(), 0, 0
+        while not estado.concluido_em and (max_lotes is None or lotes < max_lotes):
+            linhas = db.query(Segredo.id, Segredo.valor_criptografado)\
+                .filter(Segredo.id > estado.ultimo_id)\
+                .order_by(Segredo.id).limit(tamanho_lote).all()
+            if not linhas:
+                estado.concluido_em = now_utc()
+                db.commit()
+                break
+
+            inicio_lote = time.perf_counter()
+            trocas, falhas = [], 0
+            for segredo_id, token in linhas:
+                if not token:
+                    continue
+                try:
+                    cipher_primario.decrypt(token.encode())
+                    continue # Já está na chave atual
+                except InvalidToken:
+                    pass
+                try:
+                    novo = cipher_suite.rotate(token.encode()).decode()
+                except InvalidToken:
+                    falhas += 1 # Nenhuma chave conhecida abre este token: mantém intacto
+                    continue
+                trocas.append({"b_id": segredo_id, "b_antigo": token, "b_novo": novo})
+
+            if trocas:
+                db.execute(stmt, trocas)
+
+            estado.ultimo_id = linhas[-1][0]
+            estado.processados += len(linhas)
+            estado.reescritos += len(trocas)
+            estado.falhas += falhas
+            db.commit()
+
+            lotes += 1
+            processados_execucao += len(linhas)
+            duracao_lote = time.perf_counter() - inicio_lote
+            logger.info(
+                f"[Cofre] Rotação: lote até id={estado.ultimo_id} ({len(linhas)} linhas, "
+                f"{len(trocas)} reescritas, {falhas} falhas) a {len(linhas) / max(duracao_lote, 1e-9):.0f} linhas/s"
+            )
+
+        duracao = time.perf_counter() - inicio
+        return {
+            "chave_id": estado.chave_id,
+            "ultimo_id": estado.ultimo_id,
+            "processados": estado.processados,
+            "reescritos": estado.reescritos,
+            "falhas": estado.falhas,
+            "concluido": estado.concluido_em is not None,
+            "linhas_por_segundo": round(processados_execucao / duracao, 1) if duracao > 0 and processados_execucao else 0.0,
+        }
 
 cofre_service = CofreService()
\ No newline at end of file
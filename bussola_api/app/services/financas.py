@@ -35,6 +35,7 @@ import random
 
 from app.models.financas import Transacao, Categoria 
 from app.schemas.financas import TransacaoCreate, TransacaoUpdate
+from app.services.search import search_service
 
 # Catálogo de ícones FontAwesome disponíveis para escolha no frontend
 ICONES_DISPONIVEIS = [
@@ -280,11 +281,14 @@ class FinancasService:
         grupo_id = alvo.id_grupo_recorrencia
 
         # Remove Futuro
-        deletadas = db.query(Transacao).filter(
+        query_futuro = db.query(Transacao).filter(
             Transacao.id_grupo_recorrencia == grupo_id,
             Transacao.user_id == user_id,
             Transacao.status == 'Pendente'
-        ).delete()
+        )
+        # [NOVO] Delete em lote não dispara eventos ORM: removemos do índice de busca manualmente.
+        search_service.remove_ids(db, "transacao", [tid for (tid,) in query_futuro.with_entities(Transacao.id)])
+        deletadas = query_futuro.delete()
 
         # Blinda Passado/Restante
         db.query(Transacao).filter(
@@ -403,11 +407,16 @@ class FinancasService:
 
         if grupo_id and campos_para_propagar and tipo == 'recorrente':
             # Atualiza transações do mesmo grupo que possuem data maior que a atual
-            db.query(Transacao).filter(
+            query_futuro = db.query(Transacao).filter(
                 Transacao.id_grupo_recorrencia == grupo_id,
                 Transacao.user_id == user_id,
                 Transacao.data > data_original
-            ).update(campos_para_propagar, synchronize_session=False)
+            )
+            query_futuro.update(campos_para_propagar, synchronize_session=False)
+
+            # [NOVO] Update em lote não dispara eventos ORM: reindexa a busca se o texto mudou.
+            if 'descricao' in campos_para_propagar:
+                search_service.reindex_ids(db, "transacao", [tid for (tid,) in query_futuro.with_entities(Transacao.id)])
 
         db.commit()
         db.refresh(transacao)
@@ -0,0 +1,150 @@
+"""
+=======================================================================================
+ARQUIVO: metabolismo.py (Calculadora Metabólica Vetorizada)
+=======================================================================================
+
+OBJETIVO:
+    Concentrar a matemática de TMB, GET e divisão de macros em funções PURAS
+    (sem banco, sem sessão), capazes de avaliar milhares de cenários de uma vez.
+
+PARTE DO SISTEMA:
+    Backend / Service Layer (Domínio Ritmo).
+
+RESPONSABILIDADES:
+    1. TMB pela fórmula de Harris-Benedict Revisada (por gênero).
+    2. GET (TMB * fator de atividade) e ajuste calórico pelo objetivo.
+    3. Metas de macros (proteína e gordura por kg; carboidrato preenche o restante) e água.
+    4. Grade de cenários "what-if" (pesos x níveis de atividade x objetivos) e
+       projeção semanal de peso para o planejador de metas.
+
+COMUNICAÇÃO:
+    - Utilizado por: RitmoService.create_bio (cálculo ao registrar uma avaliação).
+    - Utilizado por: Endpoint /ritmo/bio/simular (planejador, sem persistência).
+
+=======================================================================================
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+# --------------------------------------------------------------------------------------
+# PARÂMETROS DO MODELO
+# --------------------------------------------------------------------------------------
+FATORES_ATIVIDADE = {'sedentario': 1.2, 'leve': 1.375, 'moderado': 1.55, 'alto': 1.725, 'atleta': 1.9}
+FATOR_ATIVIDADE_PADRAO = 1.2
+
+# Ajuste calórico (kcal/dia) sobre o GET conforme o objetivo
+AJUSTE_OBJETIVO = {'perda_peso': -500.0, 'ganho_massa': 300.0}
+
+PROTEINA_G_POR_KG = 2.0
+GORDURA_G_POR_KG = 1.0
+AGUA_L_POR_KG = 0.045
+KCAL_POR_G = {'proteina': 4.0, 'carbo': 4.0, 'gordura': 9.0}
+
+
+def calcular_metas(peso, altura, idade, genero, nivel_atividade, objetivo) -> Dict[str, np.ndarray]:
+    """
+    Calcula TMB, GET e metas para um ou muitos cenários.
+
+    Todos os argumentos aceitam escalar ou sequência; são combinados por broadcasting
+    do NumPy (ex: 1 altura/idade/gênero e N pesos). Categorias desconhecidas seguem
+    os mesmos defaults do cadastro: fator 1.2 e nenhum ajuste de objetivo.
+
+    Retorna arrays (float) com as chaves: tmb, get_basal, gasto_calorico_total,
+    meta_proteina, meta_carbo, meta_gordura, meta_agua.
+    """
+    peso = np.asarray(peso, dtype=float)
+    altura = np.asarray(altura, dtype=float)
+    idade = np.asarray(idade, dtype=float)
+
+    masculino = np.char.upper(np.asarray(genero, dtype=str)) == 'M'
+    fator = _mapear(nivel_atividade, FATORES_ATIVIDADE, FATOR_ATIVIDADE_PADRAO)
+    ajuste = _mapear(objetivo, AJUSTE_OBJETIVO, 0.0)
+
+    # 1. TMB (Harris-Benedict Revisada)
+    tmb = np.where(
+        masculino,
+        88.36 + 13.4 * peso + 4.8 * altura - 5.7 * idade,
+        447.6 + 9.2 * peso + 3.1 * altura - 4.3 * idade,
+    )
+
+    # 2. GET e ajuste pelo objetivo
+    get_basal = tmb * fator
+    gasto_total = get_basal + ajuste
+
+    # 3. Macros: proteína e gordura por kg, carboidrato completa as calorias restantes
+    meta_proteina = peso * PROTEINA_G_POR_KG
+    meta_gordura = peso * GORDURA_G_POR_KG
+    restantes = gasto_total - (meta_proteina * KCAL_POR_G['proteina'] + meta_gordura * KCAL_POR_G['gordura'])
+    meta_carbo = np.maximum(restantes, 0.0) / KCAL_POR_G['carbo']
+
+    return {
+        "tmb": tmb,
+        "get_basal": get_basal,
+        "gasto_calorico_total": gasto_total,
+        "meta_proteina": meta_proteina,
+        "meta_carbo": meta_carbo,
+        "meta_gordura": meta_gordura,
+        "meta_agua": peso * AGUA_L_POR_KG,
+    }
+
+
+def projetar_pesos(peso_inicial: float, variacao_semanal_kg: float, semanas: int) -> np.ndarray:
+    """Curva de peso semana a semana (semana 0 = peso inicial)."""
+    return peso_inicial + variacao_semanal_kg * np.arange(semanas + 1, dtype=float)
+
+
+def simular_cenarios(
+    altura: float,
+    idade: int,
+    genero: str,
+    pesos: Sequence[float],
+    niveis_atividade: Sequence[str],
+    objetivos: Sequence[str],
+    semanas: Optional[Sequence[int]] = None,
+) -> list:
+    """
+    Avalia a grade completa pesos x níveis x objetivos em uma única passada vetorizada.
+    `semanas` (opcional, alinhado a `pesos`) rotula cada peso na projeção semanal.
+    """
+    idx_peso, idx_nivel, idx_obj = (
+        grade.ravel() for grade in np.meshgrid(
+            np.arange(len(pesos)), np.arange(len(niveis_atividade)), np.arange(len(objetivos)), indexing="ij"
+        )
+    )
+    pesos_arr = np.asarray(pesos, dtype=float)[idx_peso]
+    niveis_arr = np.asarray(niveis_atividade, dtype=object)[idx_nivel]
+    objetivos_arr = np.asarray(objetivos, dtype=object)[idx_obj]
+
+    metas = calcular_metas(pesos_arr, altura, idade, genero, niveis_arr, objetivos_arr)
+    arredondado = {
+        "tmb": np.round(metas["tmb"], 2).tolist(),
+        "gasto_calorico_total": np.round(metas["gasto_calorico_total"], 2).tolist(),
+        "meta_proteina": np.round(metas["meta_proteina"], 1).tolist(),
+        "meta_carbo": np.round(metas["meta_carbo"], 1).tolist(),
+        "meta_gordura": np.round(metas["meta_gordura"], 1).tolist(),
+        "meta_agua": np.round(metas["meta_agua"], 1).tolist(),
+    }
+
+    cenarios = []
+    for i in range(len(pesos_arr)):
+        cenario = {campo: valores[i] for campo, valores in arredondado.items()}
+        cenario.update(
+            peso=round(float(pesos_arr[i]), 2),
+            nivel_atividade=niveis_arr[i],
+            objetivo=objetivos_arr[i],
+            semana=int(semanas[idx_peso[i]]) if semanas is not None else None,
+        )
+        cenarios.append(cenario)
+    return cenarios
+
+
+def _mapear(valores, tabela: dict, padrao: float) -> np.ndarray:
+    """Converte categorias (escalar ou sequência) em array numérico via tabela de lookup."""
+    arr = np.asarray(valores, dtype=object)
+    if arr.ndim == 0:
+        return np.asarray(tabela.get(arr.item(), padrao), dtype=float)
+    # Lookup por categoria única (poucas) em vez de por elemento
+    unicos, inverso = np.unique(arr.astype(str), return_inverse=True)
+    return np.array([tabela.get(u, padrao) for u in unicos], dtype=float)[inverso.reshape(arr.shape)]
@@ -34,8 +34,8 @@ from dateutil.relativedelta import relativedelta
 # Importação dos Models de todos os domínios para agregação
 from app.models.financas import Transacao, Categoria
 from app.models.agenda import Compromisso 
-from app.models.registros import Anotacao, Tarefa, GrupoAnotacao
-from app.models.cofre import Segredo 
+from app.models.registros import Anotacao, Tarefa, GrupoAnotacao, PRIORIDADE_RANK
+from app.services.cofre import cofre_service 
 
 class PanoramaService:
     
@@ -139,23 +139,24 @@ class PanoramaService:
         ).scalar() or 0
         
         # Tarefas Pendentes
+        # [OTIMIZAÇÃO] Agrupa pelo rank inteiro (indexado) em vez da string livre.
         tarefas_stats = db.query(
-            Tarefa.prioridade, 
+            Tarefa.prioridade_rank, 
             func.count(Tarefa.id)
         ).filter(
             Tarefa.user_id == user_id,
             Tarefa.status != 'Concluído',
             Tarefa.data_criacao >= start_date, 
             Tarefa.data_criacao < end_date
-        ).group_by(Tarefa.prioridade).all()
+        ).group_by(Tarefa.prioridade_rank).all()
         
-        t_dict = {prioridade: count for prioridade, count in tarefas_stats}
+        t_dict = {rank: count for rank, count in tarefas_stats}
         
         tarefas_pendentes_detalhe = {
-            "critica": t_dict.get('Crítica', 0),
-            "alta": t_dict.get('Alta', 0),
-            "media": t_dict.get('Média', 0),
-            "baixa": t_dict.get('Baixa', 0)
+            "critica": t_dict.get(PRIORIDADE_RANK['Crítica'], 0),
+            "alta": t_dict.get(PRIORIDADE_RANK['Alta'], 0),
+            "media": t_dict.get(PRIORIDADE_RANK['Média'], 0),
+            "baixa": t_dict.get(PRIORIDADE_RANK['Baixa'], 0)
         }
         
         # Tarefas Concluídas
@@ -171,16 +172,9 @@ class PanoramaService:
         # ==============================================================================
         # 4. BLOCO DO COFRE (Segurança de Senhas)
         # ==============================================================================
+        # [OTIMIZAÇÃO] Contadores pré-calculados (CofreContador) em vez de dois COUNT na tabela.
         try:
-            chaves_ativas = db.query(func.count(Segredo.id)).filter(
-                Segredo.user_id == user_id,
-                or_(Segredo.data_expiracao == None, Segredo.data_expiracao >= today)
-            ).scalar() or 0
-            
-            chaves_expiradas = db.query(func.count(Segredo.id)).filter(
-                Segredo.user_id == user_id,
-                Segredo.data_expiracao < today
-            ).scalar() or 0
+            chaves_ativas, chaves_expiradas = cofre_service.get_contadores(db, user_id)
         except:
             chaves_ativas = 0
             chaves_expiradas = 0
@@ -26,12 +26,27 @@ COMUNICAÇÃO:
 =======================================================================================
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+import hashlib
+import json
+import re
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from app.models.registros import GrupoAnotacao, Anotacao, Link, Tarefa, Subtarefa
+from app.models.registros import (
+    GrupoAnotacao, Anotacao, Link, Tarefa, Subtarefa, StatusTarefa, PRIORIDADE_RANK, rank_prioridade
+)
+from app.services.search import search_service
+from app.utils.text import strip_html
+from collections import Counter, defaultdict
 from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+# Nomes dos meses fixos (Locale-safe), usados nas chaves "Mês Ano" do feed de notas.
+MESES_PT = [
+    '', 'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
+    'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
+]
 
 class RegistrosService:
     
@@ -123,37 +138,46 @@ class RegistrosService:
             ).first()
             if not grupo: raise HTTPException(status_code=400, detail="Grupo inválido ou não pertence a você.")
 
+        links = self._links_validos(nota_data.links)
         nova_nota = Anotacao(
             titulo=nota_data.titulo, conteudo=nota_data.conteudo,
+            conteudo_hash=self._hash_nota(nota_data.titulo, nota_data.conteudo, links),
             fixado=nota_data.fixado, grupo_id=nota_data.grupo_id if nota_data.grupo_id else None,
             user_id=user_id
         )
+        # Links entram pelo relacionamento: o flush grava a nota e os links em sequência
+        nova_nota.links = [Link(url=url) for url in links]
         db.add(nova_nota)
         
-        # Flush gera o ID da nota sem comitar a transação, permitindo salvar os links
-        db.flush() 
-        
-        if nota_data.links:
-            for link_url in nota_data.links:
-                if link_url.strip(): db.add(Link(url=link_url, anotacao_id=nova_nota.id))
-        
         db.commit()
         db.refresh(nova_nota)
         return nova_nota
 
     def update_anotacao(self, db: Session, nota_id: int, nota_data, user_id: int):
         """
-        Atualiza nota e substitui os links.
+        Atualiza nota e reconcilia os links.
         
-        Estratégia de Atualização de Links:
-            Remove TODOS os links antigos e recria os novos enviados no payload.
-            Isso simplifica a lógica de diff (saber qual editou/removeu/criou).
+        Curto-circuito (Autosave):
+            Se o hash de (titulo, conteudo, links) enviado for igual ao armazenado e
+            fixado/grupo não mudaram, nenhuma escrita é feita (nem commit).
+
+        Estratégia de Atualização de Links (Diff):
+            Compara o conjunto atual com o enviado: insere apenas URLs novas, remove
+            apenas as retiradas e mantém as demais (sem churn de IDs/índices).
         """
         nota = db.query(Anotacao).filter(Anotacao.id == nota_id, Anotacao.user_id == user_id).first()
         if not nota: return None
+
+        links = self._links_validos(nota_data.links)
+        novo_hash = self._hash_nota(nota_data.titulo, nota_data.conteudo, links)
+
+        if (nota.conteudo_hash == novo_hash
+                and nota.fixado == nota_data.fixado
+                and nota.grupo_id == nota_data.grupo_id):
+            return nota
         
         # Validação de segurança do novo grupo
-        if nota_data.grupo_id:
+        if nota_data.grupo_id and nota_data.grupo_id != nota.grupo_id:
             grupo = db.query(GrupoAnotacao).filter(
                 GrupoAnotacao.id == nota_data.grupo_id, 
                 GrupoAnotacao.user_id == user_id
@@ -165,17 +189,47 @@ class RegistrosService:
         nota.conteudo = nota_data.conteudo
         nota.fixado = nota_data.fixado
         nota.grupo_id = nota_data.grupo_id
-        
-        # Substituição de Links (Wipe & Recreate)
-        db.query(Link).filter(Link.anotacao_id == nota.id).delete()
-        if nota_data.links:
-            for link_url in nota_data.links:
-                if link_url.strip(): db.add(Link(url=link_url, anotacao_id=nota.id))
+
+        # Reconciliação de Links só é necessária se o hash mudou
+        if nota.conteudo_hash != novo_hash:
+            self._reconciliar_links(db, nota, links)
+            nota.conteudo_hash = novo_hash
                 
         db.commit()
         db.refresh(nota)
         return nota
 
+    @staticmethod
+    def _links_validos(links) -> list:
+        """Filtra URLs vazias mantendo a ordem enviada."""
+        return [url for url in (links or []) if url.strip()]
+
+    @staticmethod
+    def _hash_nota(titulo, conteudo, links) -> str:
+        """Assinatura determinística do conteúdo editável da nota (ordem dos links é irrelevante)."""
+        payload = json.dumps([titulo or "", conteudo or "", sorted(links)], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _reconciliar_links(self, db: Session, nota: Anotacao, links: list):
+        """
+        Diff de multiconjunto entre os links persistidos e os enviados.
+        URLs repetidas são respeitadas (Counter), e os registros mantidos não são tocados.
+        """
+        desejados = Counter(links)
+        remover = []
+        for link in nota.links:
+            if desejados[link.url] > 0:
+                desejados[link.url] -= 1
+            else:
+                remover.append(link)
+
+        for link in remover:
+            nota.links.remove(link)  # delete-orphan emite o DELETE no flush
+
+        for url, quantidade in desejados.items():
+            for _ in range(quantidade):
+                nota.links.append(Link(url=url))
+
     def delete_anotacao(self, db: Session, nota_id: int, user_id: int):
         nota = db.query(Anotacao).filter(Anotacao.id == nota_id, Anotacao.user_id == user_id).first()
         if not nota: return None
@@ -291,6 +345,85 @@ class RegistrosService:
         db.commit()
         return True
 
+    def aplicar_operacoes_lote(self, db: Session, operacoes, user_id: int):
+        """
+        Aplica várias operações (status, prioridade, prazo, excluir) em UMA transação.
+
+        Estratégia Set-Based:
+            1. Uma query valida a posse de todos os IDs envolvidos.
+            2. Operações iguais (mesma ação + mesmo valor) são agrupadas e executadas
+               como um único UPDATE/DELETE ... WHERE id IN (...).
+            Assim, 12 tarefas adiadas para a mesma data custam 1 statement, não 12 commits.
+
+        Retorno:
+            Lista de resultados na MESMA ordem do payload (sucesso/erro por item).
+            Itens inválidos não abortam o lote; erros de banco fazem rollback de tudo.
+        """
+        ids = {op.id for op in operacoes}
+        existentes = {
+            tid for (tid,) in db.query(Tarefa.id).filter(Tarefa.user_id == user_id, Tarefa.id.in_(ids))
+        } if ids else set()
+
+        resultados = []
+        grupos = defaultdict(list)  # (acao, valor) -> [ids]
+        vistos = set()
+
+        for op in operacoes:
+            erro = None
+            valor = None
+            if (op.id, op.acao) in vistos:
+                erro = "Ação repetida para a mesma tarefa."
+            elif op.id not in existentes:
+                erro = "Tarefa não encontrada"
+            elif op.acao == "status":
+                valor = op.status
+                if valor not in {s.value for s in StatusTarefa}:
+                    erro = f"Status inválido: {valor}"
+            elif op.acao == "prioridade":
+                valor = op.prioridade
+                if valor not in PRIORIDADE_RANK:
+                    erro = f"Prioridade inválida: {valor}"
+            elif op.acao == "prazo":
+                valor = op.prazo  # None remove o prazo
+
+            resultados.append({"id": op.id, "acao": op.acao, "sucesso": erro is None, "erro": erro})
+            if erro is None:
+                vistos.add((op.id, op.acao))
+                grupos[(op.acao, valor)].append(op.id)
+
+        try:
+            for (acao, valor), alvo_ids in grupos.items():
+                alvo = db.query(Tarefa).filter(Tarefa.user_id == user_id, Tarefa.id.in_(alvo_ids))
+
+                if acao == "status":
+                    alvo.update({
+                        Tarefa.status: valor,
+                        Tarefa.data_conclusao: datetime.now() if valor == StatusTarefa.CONCLUIDO.value else None
+                    }, synchronize_session=False)
+                elif acao == "prioridade":
+                    # Query.update não passa pelo @validates: gravamos string e rank juntos.
+                    alvo.update({
+                        Tarefa.prioridade: valor,
+                        Tarefa.prioridade_rank: rank_prioridade(valor)
+                    }, synchronize_session=False)
+                elif acao == "prazo":
+                    alvo.update({Tarefa.prazo: valor}, synchronize_session=False)
+                    search_service.reindex_ids(db, "tarefa", alvo_ids)
+                elif acao == "excluir":
+                    # Sem eventos ORM: removemos filhos e índice de busca explicitamente.
+                    db.query(Subtarefa).filter(Subtarefa.tarefa_id.in_(alvo_ids)).delete(synchronize_session=False)
+                    search_service.remove_ids(db, "tarefa", alvo_ids)
+                    alvo.delete(synchronize_session=False)
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        # Objetos já carregados na sessão podem estar desatualizados após UPDATE em lote
+        db.expire_all()
+        return {"resultados": resultados, "aplicadas": sum(1 for r in resultados if r["sucesso"])}
+
     # ==============================================================================
     # 4. OPERAÇÕES EM SUBTAREFAS (Nós da Árvore)
     # ==============================================================================
@@ -339,51 +472,120 @@ class RegistrosService:
         return sub
 
     # ==============================================================================
-    # 5. DASHBOARD AGREGADO (Home de Registros)
+    # 5. FEED DE ANOTAÇÕES (Paginação por Mês)
+    # ==============================================================================
+
+    # Tamanho do trecho (preview) enviado no feed. O corpo completo é buscado sob demanda.
+    PREVIEW_CHARS = 300
+    # Quantidade padrão de meses por página.
+    FEED_MESES = 3
+
+    def get_anotacao(self, db: Session, nota_id: int, user_id: int):
+        """Retorna a nota completa (com `conteudo` integral) para visualização/edição."""
+        return db.query(Anotacao).options(selectinload(Anotacao.links), selectinload(Anotacao.grupo))\
+            .filter(Anotacao.id == nota_id, Anotacao.user_id == user_id).first()
+
+    def get_feed_anotacoes(self, db: Session, user_id: int, meses: int = FEED_MESES, antes_de: str = None):
+        """
+        Retorna as notas NÃO fixadas de `meses` meses de calendário, do mais recente ao mais antigo.
+
+        Paginação por Keyset (cursor = "AAAA-MM", limite superior exclusivo):
+            1. Descobre a nota mais recente antes do cursor (MAX indexado).
+            2. A janela vai do início desse mês até `meses - 1` meses para trás.
+               Meses vazios entre páginas são pulados automaticamente pelo passo 1.
+            3. O próximo cursor é o início da janela, se existir nota mais antiga.
+        Não há OFFSET: o custo de cada página independe de quantas notas já existem.
+
+        Carga Reduzida:
+            - Apenas as notas da janela são carregadas (e não o histórico inteiro).
+            - `conteudo` não é carregado (defer) nem enviado; o SQL devolve apenas os primeiros
+              PREVIEW_CHARS caracteres (`trecho`) e uma flag indicando se houve truncamento.
+              Visualização/edição buscam o corpo completo em GET /anotacoes/{id}.
+            - Links e grupos vêm em uma única query em lote (selectinload) por página.
+        """
+        base = db.query(Anotacao).filter(Anotacao.user_id == user_id, Anotacao.fixado == False)
+
+        limite_superior = None
+        if antes_de:
+            try:
+                limite_superior = datetime.strptime(antes_de, "%Y-%m")
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Cursor inválido. Use o formato AAAA-MM.")
+
+        query_max = base.with_entities(func.max(Anotacao.data_criacao))
+        if limite_superior:
+            query_max = query_max.filter(Anotacao.data_criacao < limite_superior)
+        mais_recente = query_max.scalar()
+
+        if not mais_recente:
+            return {"anotacoes_por_mes": {}, "proximo_cursor": None}
+
+        if isinstance(mais_recente, str):  # SQLite pode devolver string em agregações
+            mais_recente = datetime.fromisoformat(mais_recente)
+
+        fim_janela = datetime(mais_recente.year, mais_recente.month, 1) + relativedelta(months=1)
+        if limite_superior and fim_janela > limite_superior:
+            fim_janela = limite_superior
+        inicio_janela = datetime(mais_recente.year, mais_recente.month, 1) - relativedelta(months=max(meses, 1) - 1)
+
+        preview = func.substr(Anotacao.conteudo, 1, self.PREVIEW_CHARS).label("preview")
+        truncado = (func.length(Anotacao.conteudo) > self.PREVIEW_CHARS).label("truncado")
+
+        linhas = base.filter(Anotacao.data_criacao >= inicio_janela, Anotacao.data_criacao < fim_janela)\
+            .options(defer(Anotacao.conteudo), selectinload(Anotacao.links), selectinload(Anotacao.grupo))\
+            .add_columns(preview, truncado)\
+            .order_by(Anotacao.data_criacao.desc(), Anotacao.id.desc())\
+            .all()
+
+        por_mes = {}
+        for nota, trecho, foi_truncado in linhas:
+            mes_ano = f"{MESES_PT[nota.data_criacao.month]} {nota.data_criacao.year}"
+            por_mes.setdefault(mes_ano, []).append(self._nota_preview(nota, trecho, foi_truncado))
+
+        tem_mais = db.query(base.filter(Anotacao.data_criacao < inicio_janela).exists()).scalar()
+
+        return {
+            "anotacoes_por_mes": por_mes,
+            "proximo_cursor": inicio_janela.strftime("%Y-%m") if tem_mais else None
+        }
+
+    @staticmethod
+    def _nota_preview(nota: Anotacao, trecho: str, truncado: bool) -> dict:
+        """Monta a nota do feed com o trecho em texto puro (sem o `conteudo` HTML)."""
+        # Remove eventual tag HTML cortada no limite do substr (ex: '<a hre')
+        texto = strip_html(re.sub(r"<[^>]*$", "", trecho or ""))
+        return {
+            "id": nota.id, "titulo": nota.titulo,
+            "trecho": texto, "trecho_truncado": bool(truncado), "fixado": nota.fixado,
+            "grupo_id": nota.grupo_id, "grupo": nota.grupo,
+            "data_criacao": nota.data_criacao, "links": nota.links,
+        }
+
+    # ==============================================================================
+    # 6. DASHBOARD AGREGADO (Home de Registros)
     # ==============================================================================
     def get_dashboard_data(self, db: Session, user_id: int):
         """
         Prepara os dados para a tela principal de Registros.
         
         Processamento:
-        1. Anotações: Separa em Fixadas vs Normais. Normais são agrupadas por Mês.
+        1. Anotações: Fixadas completas + apenas a PRIMEIRA página do feed mensal
+           (demais meses via GET /registros/anotacoes?antes_de=<cursor>).
         2. Tarefas: Ordenação complexa personalizada por prioridade (Crítica > Alta > Média...).
         """
         
-        # 1. Busca e Agrupamento de Anotações
-        fixadas = db.query(Anotacao).filter(Anotacao.fixado == True, Anotacao.user_id == user_id).all()
-        nao_fixadas = db.query(Anotacao).filter(Anotacao.fixado == False, Anotacao.user_id == user_id).order_by(Anotacao.data_criacao.desc()).all()
-        
-        # [CORREÇÃO PONTO 1] Formatação de data robusta (Locale-safe)
-        meses_pt = [
-            '', 'Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho',
-            'Julho', 'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro'
-        ]
-        
-        por_mes = {}
-        for nota in nao_fixadas:
-            # Extrai mês e ano diretamente do objeto datetime (Inteiros)
-            # Evita strftime dependente de locale do SO
-            nome_mes = meses_pt[nota.data_criacao.month]
-            ano = nota.data_criacao.year
-            mes_ano = f"{nome_mes} {ano}"
-            
-            if mes_ano not in por_mes: por_mes[mes_ano] = []
-            por_mes[mes_ano].append(nota)
+        # 1. Anotações: Fixadas (completas) + primeira página do feed mensal
+        fixadas = db.query(Anotacao).options(selectinload(Anotacao.links), selectinload(Anotacao.grupo))\
+            .filter(Anotacao.fixado == True, Anotacao.user_id == user_id).all()
+        feed = self.get_feed_anotacoes(db, user_id)
 
         # 2. Busca e Ordenação de Tarefas
-        # Define a ordem de relevância no SQL
-        ordenacao_prioridade = case(
-            (Tarefa.prioridade == 'Crítica', 1),
-            (Tarefa.prioridade == 'Alta', 2),
-            (Tarefa.prioridade == 'Média', 3),
-            (Tarefa.prioridade == 'Baixa', 4),
-            else_=5
-        )
-
+        # [OTIMIZAÇÃO] Ordena pelo rank numérico (coluna indexada) em vez de um CASE sobre a string,
+        # permitindo que o índice parcial ix_tarefa_fila_prioridade entregue as linhas já ordenadas.
+        # Sem prazo por último via chave 'prazo IS NULL' (a mesma expressão do índice).
         t_pendentes = db.query(Tarefa)\
             .filter(Tarefa.status != 'Concluído', Tarefa.user_id == user_id)\
-            .order_by(ordenacao_prioridade.asc(), Tarefa.prazo.asc().nullslast(), Tarefa.id.desc())\
+            .order_by(Tarefa.prioridade_rank.asc(), Tarefa.prazo.is_(None), Tarefa.prazo.asc(), Tarefa.id.desc())\
             .all()
 
         t_concluidas = db.query(Tarefa).filter(Tarefa.status == 'Concluído', Tarefa.user_id == user_id).order_by(Tarefa.data_conclusao.desc()).limit(10).all()
@@ -391,7 +593,8 @@ class RegistrosService:
         grupos = db.query(GrupoAnotacao).filter(GrupoAnotacao.user_id == user_id).all()
 
         return {
-            "anotacoes_fixadas": fixadas, "anotacoes_por_mes": por_mes,
+            "anotacoes_fixadas": fixadas, "anotacoes_por_mes": feed["anotacoes_por_mes"],
+            "anotacoes_proximo_cursor": feed["proximo_cursor"],
             "tarefas_pendentes": t_pendentes, "tarefas_concluidas": t_concluidas,
             "grupos_disponiveis": grupos
         }
@@ -19,25 +19,50 @@ RESPONSABILIDADES:
 
 COMUNICAÇÃO:
     - Models: Módulo app.models.ritmo (todas as tabelas).
-    - Config: Acessa settings.DATA_DIR para ler o JSON da TACO.
+    - TACO: Busca delegada ao índice em memória (app.services.taco).
 
 =======================================================================================
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, insert, update, delete, or_, func
 from app.models.ritmo import (
     RitmoBio, RitmoPlanoTreino, RitmoDiaTreino, RitmoExercicioItem,
-    RitmoDietaConfig, RitmoRefeicao, RitmoAlimentoItem
+    RitmoDietaConfig, RitmoRefeicao, RitmoAlimentoItem, GRUPO_MUSCULAR_PADRAO
 )
 from app.schemas.ritmo import (
-    BioCreate, PlanoTreinoCreate, DietaConfigCreate
+    BioCreate, PlanoTreinoCreate, DietaConfigCreate, SimulacaoMetabolicaRequest
 )
 from app.core.config import settings
+from app.services.taco import taco_index
+from app.services.metabolismo import calcular_metas, projetar_pesos, simular_cenarios
+from app.utils.series import lttb, media_movel_tempo, tendencia_linear, to_epoch_days
 from datetime import datetime
+from typing import Dict, Optional
 import json
 import os
 
+import numpy as np
+
+# --------------------------------------------------------------------------------------
+# CAMPOS EDITÁVEIS POR NÍVEL (usados no diff em memória das árvores Plano/Dieta)
+# --------------------------------------------------------------------------------------
+CAMPOS_DIA = ("nome", "ordem")
+CAMPOS_EXERCICIO = (
+    "nome_exercicio", "api_id", "grupo_muscular", "series",
+    "repeticoes_min", "repeticoes_max", "descanso_segundos", "observacao"
+)
+CAMPOS_REFEICAO = ("nome", "ordem")
+CAMPOS_ALIMENTO = ("nome", "quantidade", "unidade", "calorias", "proteina", "carbo", "gordura")
+
+# Totais persistidos (mesma ordem de MACROS): Alimento -> Refeição -> Dieta
+MACROS = ("calorias", "proteina", "carbo", "gordura")
+TOTAIS_REFEICAO = ("total_calorias", "total_proteina", "total_carbo", "total_gordura")
+TOTAIS_DIETA = ("calorias_calculadas", "total_proteina", "total_carbo", "total_gordura")
+
+# Métricas expostas na série temporal biométrica
+METRICAS_BIO = ("peso", "bf_estimado", "tmb", "gasto_calorico_total")
+
 class RitmoService:
     
     # ==========================================================
@@ -50,6 +75,85 @@ class RitmoService:
         return db.query(RitmoBio).filter(RitmoBio.user_id == user_id)\
             .order_by(desc(RitmoBio.data_registro)).first()
 
+    @staticmethod
+    def get_bio_series(
+        db: Session,
+        user_id: int,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        max_pontos: int = 200,
+        janela_dias: int = 7
+    ) -> dict:
+        """
+        Série temporal de peso, BF, TMB e GET para gráficos de evolução.
+
+        [OTIMIZAÇÃO]
+            - Lê apenas as colunas da série (sem instanciar RitmoBio), usando o
+              índice (user_id, data_registro).
+            - Média móvel e tendência calculadas vetorizadas (NumPy) sobre todos
+              os registros do intervalo.
+            - Downsampling LTTB para no máximo `max_pontos` por métrica: o payload
+              tem tamanho constante, independente do tamanho do histórico.
+        """
+        query = db.query(RitmoBio.data_registro, *[getattr(RitmoBio, m) for m in METRICAS_BIO])\
+            .filter(RitmoBio.user_id == user_id, RitmoBio.data_registro.isnot(None))
+        if inicio:
+            query = query.filter(RitmoBio.data_registro >= inicio)
+        if fim:
+            query = query.filter(RitmoBio.data_registro <= fim)
+        linhas = query.order_by(RitmoBio.data_registro).all()
+
+        resposta = {"inicio": inicio, "fim": fim, "max_pontos": max_pontos, "janela_dias": janela_dias, "metricas": {}}
+        if not linhas:
+            return resposta
+
+        datas = [linha[0] for linha in linhas]
+        dias = to_epoch_days(datas)
+        valores = np.array([linha[1:] for linha in linhas], dtype=float)  # None -> NaN
+
+        for col, metrica in enumerate(METRICAS_BIO):
+            # Métricas opcionais (ex: bf_estimado) só contam nos registros preenchidos
+            validos = np.flatnonzero(~np.isnan(valores[:, col]))
+            x, y = dias[validos], valores[validos, col]
+            if len(x) == 0:
+                continue
+
+            media = media_movel_tempo(x, y, janela_dias)
+            inclinacao, _ = tendencia_linear(x, y)
+            escolhidos = lttb(x, y, max_pontos)
+
+            resposta["metricas"][metrica] = {
+                "total_registros": len(x),
+                "inclinacao_dia": round(inclinacao, 4),
+                "inclinacao_semana": round(inclinacao * 7, 4),
+                "pontos": [
+                    {"data": datas[validos[i]], "valor": round(float(y[i]), 2), "media_movel": round(float(media[i]), 2)}
+                    for i in escolhidos
+                ],
+            }
+        return resposta
+
+    @staticmethod
+    def simular_metas(sim_in: SimulacaoMetabolicaRequest) -> dict:
+        """
+        Planejador de metas "what-if" (stateless): nenhuma linha é criada no banco.
+        Avalia a grade pesos x níveis x objetivos, ou a curva semanal de peso da
+        `projecao`, em uma única passada vetorizada.
+        """
+        semanas = None
+        pesos = sim_in.pesos
+        if sim_in.projecao:
+            pesos = projetar_pesos(
+                sim_in.projecao.peso_inicial, sim_in.projecao.variacao_semanal_kg, sim_in.projecao.semanas
+            ).tolist()
+            semanas = list(range(len(pesos)))
+
+        cenarios = simular_cenarios(
+            sim_in.altura, sim_in.idade, sim_in.genero,
+            pesos, sim_in.niveis_atividade, sim_in.objetivos, semanas
+        )
+        return {"total": len(cenarios), "cenarios": cenarios}
+
     @staticmethod
     def create_bio(db: Session, user_id: int, bio_in: BioCreate):
         """
@@ -57,34 +161,16 @@ class RitmoService:
         Permite override manual das metas se fornecidas no payload.
         """
         
-        # 1. Cálculo da TMB (Fórmula de Harris-Benedict Revisada)
-        if bio_in.genero.upper() == 'M':
-            tmb = 88.36 + (13.4 * bio_in.peso) + (4.8 * bio_in.altura) - (5.7 * bio_in.idade)
-        else:
-            tmb = 447.6 + (9.2 * bio_in.peso) + (3.1 * bio_in.altura) - (4.3 * bio_in.idade)
-
-        # 2. Definição do Fator de Atividade
-        fatores = {'sedentario': 1.2, 'leve': 1.375, 'moderado': 1.55, 'alto': 1.725, 'atleta': 1.9}
-        fator = fatores.get(bio_in.nivel_atividade, 1.2)
-        get_basal = tmb * fator
-
-        # 3. Ajuste pelo Objetivo (Sugestão do Sistema)
-        gasto_total_sugestao = get_basal
-        if bio_in.objetivo == 'perda_peso':
-            gasto_total_sugestao -= 500
-        elif bio_in.objetivo == 'ganho_massa':
-            gasto_total_sugestao += 300
-
-        # 4. Distribuição de Macros (Sugestão do Sistema)
-        meta_prot_sugestao = bio_in.peso * 2.0
-        meta_gord_sugestao = bio_in.peso * 1.0
-        
-        calorias_prot_gord = (meta_prot_sugestao * 4) + (meta_gord_sugestao * 9)
-        calorias_restantes = gasto_total_sugestao - calorias_prot_gord
-        if calorias_restantes < 0: calorias_restantes = 0
-        meta_carb_sugestao = calorias_restantes / 4
-
-        meta_agua_sugestao = bio_in.peso * 0.045 
+        # 1-4. TMB, GET, ajuste pelo objetivo e macros (calculadora pura, ver app.services.metabolismo)
+        metas = calcular_metas(
+            bio_in.peso, bio_in.altura, bio_in.idade, bio_in.genero, bio_in.nivel_atividade, bio_in.objetivo
+        )
+        tmb = float(metas["tmb"])
+        gasto_total_sugestao = float(metas["gasto_calorico_total"])
+        meta_prot_sugestao = float(metas["meta_proteina"])
+        meta_carb_sugestao = float(metas["meta_carbo"])
+        meta_gord_sugestao = float(metas["meta_gordura"])
+        meta_agua_sugestao = float(metas["meta_agua"])
 
         # 5. Aplicação Final (Override se o usuário enviou customizado)
         # Se o campo veio no payload (não é None), usa ele. Senão usa a sugestão.
@@ -155,14 +241,15 @@ class RitmoService:
     @staticmethod
     def update_plano_completo(db: Session, user_id: int, plano_id: int, plano_in: PlanoTreinoCreate):
         """
-        Atualiza um plano existente usando Reconciliação (Smart Diff).
+        Atualiza um plano existente usando Reconciliação (Smart Diff) em LOTE.
         Preserva IDs de dias e exercícios para manter histórico.
+
+        Fluxo (custo constante em queries, independente do tamanho do plano):
+            1. Carrega a árvore inteira (Plano -> Dias -> Exercícios) com selectinload.
+            2. Calcula o diff em memória (inserir / atualizar só o que mudou / remover).
+            3. Aplica um statement em lote por tabela e operação.
         """
-        db_plano = db.query(RitmoPlanoTreino).filter(
-            RitmoPlanoTreino.id == plano_id, 
-            RitmoPlanoTreino.user_id == user_id
-        ).first()
-        
+        db_plano = RitmoService._carregar_plano(db, user_id, plano_id)
         if not db_plano:
             return None
 
@@ -172,94 +259,102 @@ class RitmoService:
         db_plano.nome = plano_in.nome
         db_plano.ativo = plano_in.ativo
 
-        # Reconciliação de DIAS
-        # Mapa dos itens atuais no banco
-        dias_existentes = {dia.id: dia for dia in db_plano.dias}
-        ids_dias_processados = []
+        # 1. Diff dos DIAS
+        ins_dias, upd_dias, del_dias = RitmoService._diff_colecao(
+            db_plano.dias, plano_in.dias, CAMPOS_DIA, {"plano_id": db_plano.id}
+        )
 
+        # 2. Diff dos EXERCÍCIOS (dias existentes) + filhos dos dias novos (aguardam o ID)
+        dias_atuais = {d.id: d for d in db_plano.dias}
+        ins_ex, upd_ex, del_ex = [], [], []
+        exercicios_dias_novos = []
         for dia_in in plano_in.dias:
-            if dia_in.id and dia_in.id in dias_existentes:
-                # UPDATE DIA
-                db_dia = dias_existentes[dia_in.id]
-                db_dia.nome = dia_in.nome
-                db_dia.ordem = dia_in.ordem
-                ids_dias_processados.append(dia_in.id)
-                
-                # Reconcilia Exercícios (Recursivo)
-                RitmoService._reconciliar_exercicios(db, db_dia, dia_in.exercicios)
-            else:
-                # CREATE DIA
-                novo_dia = RitmoDiaTreino(
-                    plano_id=db_plano.id,
-                    nome=dia_in.nome,
-                    ordem=dia_in.ordem
+            if dia_in.id and dia_in.id in dias_atuais:
+                i, u, d = RitmoService._diff_colecao(
+                    dias_atuais[dia_in.id].exercicios, dia_in.exercicios,
+                    CAMPOS_EXERCICIO, {"dia_treino_id": dia_in.id}
                 )
-                db.add(novo_dia)
-                db.commit()
-                db.refresh(novo_dia)
-                
-                # Adiciona exercícios do novo dia
-                for ex_in in dia_in.exercicios:
-                    novo_ex = RitmoExercicioItem(
-                        dia_treino_id=novo_dia.id,
-                        nome_exercicio=ex_in.nome_exercicio,
-                        api_id=ex_in.api_id,
-                        grupo_muscular=ex_in.grupo_muscular,
-                        series=ex_in.series,
-                        repeticoes_min=ex_in.repeticoes_min,
-                        repeticoes_max=ex_in.repeticoes_max,
-                        descanso_segundos=ex_in.descanso_segundos,
-                        observacao=ex_in.observacao
-                    )
-                    db.add(novo_ex)
-
-        # DELETE ORPHANS (Dias que sumiram)
-        for dia_id, dia_obj in dias_existentes.items():
-            if dia_id not in ids_dias_processados:
-                db.delete(dia_obj)
+                ins_ex += i; upd_ex += u; del_ex += d
+            else:
+                exercicios_dias_novos.append(dia_in.exercicios)
+
+        # 3. Aplicação: filhos removidos antes dos pais (sem ON DELETE CASCADE no banco)
+        if del_ex or del_dias:
+            db.execute(delete(RitmoExercicioItem).where(or_(
+                RitmoExercicioItem.id.in_(del_ex), RitmoExercicioItem.dia_treino_id.in_(del_dias)
+            )))
+        novos_dias_ids = RitmoService._aplicar_diff(
+            db, RitmoDiaTreino, ins_dias, upd_dias, del_dias, retornar_ids=True
+        )
+
+        for dia_id, exercicios_in in zip(novos_dias_ids, exercicios_dias_novos):
+            ins_ex += [
+                {"dia_treino_id": dia_id, **{c: getattr(ex, c) for c in CAMPOS_EXERCICIO}}
+                for ex in exercicios_in
+            ]
+        RitmoService._aplicar_diff(db, RitmoExercicioItem, ins_ex, upd_ex, [])
 
         db.commit()
-        db.refresh(db_plano)
-        return db_plano
+        return RitmoService._carregar_plano(db, user_id, plano_id)
+
+    @staticmethod
+    def _carregar_plano(db: Session, user_id: int, plano_id: int):
+        """Carrega a árvore completa do plano em queries fixas (1 por nível)."""
+        return db.query(RitmoPlanoTreino).options(
+            selectinload(RitmoPlanoTreino.dias).selectinload(RitmoDiaTreino.exercicios)
+        ).filter(
+            RitmoPlanoTreino.id == plano_id,
+            RitmoPlanoTreino.user_id == user_id
+        ).populate_existing().first()
+
+    # ==========================================================
+    # HELPERS DE DIFF EM LOTE (Plano e Dieta)
+    # ==========================================================
 
     @staticmethod
-    def _reconciliar_exercicios(db: Session, db_dia: RitmoDiaTreino, exercicios_in: list):
-        """Helper para diff inteligente de exercícios."""
-        ex_existentes = {ex.id: ex for ex in db_dia.exercicios}
-        ids_ex_processados = []
-
-        for ex_in in exercicios_in:
-            if ex_in.id and ex_in.id in ex_existentes:
-                # UPDATE
-                db_ex = ex_existentes[ex_in.id]
-                db_ex.nome_exercicio = ex_in.nome_exercicio
-                db_ex.api_id = ex_in.api_id
-                db_ex.grupo_muscular = ex_in.grupo_muscular
-                db_ex.series = ex_in.series
-                db_ex.repeticoes_min = ex_in.repeticoes_min
-                db_ex.repeticoes_max = ex_in.repeticoes_max
-                db_ex.descanso_segundos = ex_in.descanso_segundos
-                db_ex.observacao = ex_in.observacao
-                ids_ex_processados.append(ex_in.id)
+    def _diff_colecao(existentes, itens_in, campos, chave_pai: dict):
+        """
+        Compara uma coleção carregada do banco com o payload.
+
+        Retorna:
+            inserts: lista de dicts para INSERT (itens sem ID ou com ID de outra árvore).
+            updates: lista de dicts {id, ...} apenas dos itens que REALMENTE mudaram.
+            removidos: IDs existentes ausentes do payload.
+        """
+        atuais = {obj.id: obj for obj in existentes}
+        inserts, updates, mantidos = [], [], set()
+
+        for item in itens_in or []:
+            dados = {c: getattr(item, c) for c in campos}
+            if item.id and item.id in atuais:
+                mantidos.add(item.id)
+                obj = atuais[item.id]
+                if any(getattr(obj, c) != v for c, v in dados.items()):
+                    updates.append({"id": item.id, **dados})
             else:
-                # CREATE
-                novo_ex = RitmoExercicioItem(
-                    dia_treino_id=db_dia.id,
-                    nome_exercicio=ex_in.nome_exercicio,
-                    api_id=ex_in.api_id,
-                    grupo_muscular=ex_in.grupo_muscular,
-                    series=ex_in.series,
-                    repeticoes_min=ex_in.repeticoes_min,
-                    repeticoes_max=ex_in.repeticoes_max,
-                    descanso_segundos=ex_in.descanso_segundos,
-                    observacao=ex_in.observacao
-                )
-                db.add(novo_ex)
-        
-        # DELETE
-        for ex_id, ex_obj in ex_existentes.items():
-            if ex_id not in ids_ex_processados:
-                db.delete(ex_obj)
+                inserts.append({**chave_pai, **dados})
+
+        removidos = [obj_id for obj_id in atuais if obj_id not in mantidos]
+        return inserts, updates, removidos
+
+    @staticmethod
+    def _aplicar_diff(db: Session, model, inserts: list, updates: list, removidos: list, retornar_ids: bool = False) -> list:
+        """
+        Aplica o diff com um statement por operação:
+            DELETE ... WHERE id IN (...) | UPDATE em lote por PK | INSERT em lote (executemany).
+        Com `retornar_ids=True` devolve os IDs gerados na mesma ordem de `inserts`
+        (necessário apenas para pais novos, cujos filhos dependem do ID).
+        """
+        if removidos:
+            db.execute(delete(model).where(model.id.in_(removidos)))
+        if updates:
+            db.execute(update(model), updates)
+        if not inserts:
+            return []
+        if not retornar_ids:
+            db.execute(insert(model), inserts)
+            return []
+        return list(db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), inserts))
 
     @staticmethod
     def _adicionar_dias_plano(db: Session, plano_id: int, dias_in: list):
@@ -311,13 +406,11 @@ class RitmoService:
 
     @staticmethod
     def _desativar_outros_planos(db: Session, user_id: int):
-        planos_ativos = db.query(RitmoPlanoTreino).filter(
+        # UPDATE único; o commit fica a cargo do fluxo chamador (mesma transação)
+        db.query(RitmoPlanoTreino).filter(
             RitmoPlanoTreino.user_id == user_id, 
             RitmoPlanoTreino.ativo == True
-        ).all()
-        for p in planos_ativos:
-            p.ativo = False
-        db.commit()
+        ).update({RitmoPlanoTreino.ativo: False})
 
     # ==========================================================
     # 3. NUTRIÇÃO (DIETAS, REFEIÇÕES, ALIMENTOS)
@@ -346,12 +439,12 @@ class RitmoService:
             calorias_calculadas=0 
         )
         db.add(db_dieta)
-        db.commit()
-        db.refresh(db_dieta)
+        db.flush()
 
-        total_calorias = RitmoService._adicionar_refeicoes_dieta(db, db_dieta.id, dieta_in.refeicoes)
+        totais = RitmoService._adicionar_refeicoes_dieta(db, db_dieta.id, dieta_in.refeicoes)
+        for campo, valor in zip(TOTAIS_DIETA, totais):
+            setattr(db_dieta, campo, valor)
 
-        db_dieta.calorias_calculadas = total_calorias
         db.commit()
         db.refresh(db_dieta)
         return db_dieta
@@ -359,13 +452,11 @@ class RitmoService:
     @staticmethod
     def update_dieta_completa(db: Session, user_id: int, dieta_id: int, dieta_in: DietaConfigCreate):
         """
-        Atualiza dieta preservando IDs (Smart Diff).
+        Atualiza dieta preservando IDs (Smart Diff) em LOTE.
+        Mesmo fluxo de `update_plano_completo`: árvore carregada de uma vez,
+        diff em memória e um statement por tabela/operação.
         """
-        db_dieta = db.query(RitmoDietaConfig).filter(
-            RitmoDietaConfig.id == dieta_id, 
-            RitmoDietaConfig.user_id == user_id
-        ).first()
-        
+        db_dieta = RitmoService._carregar_dieta(db, user_id, dieta_id)
         if not db_dieta:
             return None
 
@@ -375,128 +466,154 @@ class RitmoService:
         db_dieta.nome = dieta_in.nome
         db_dieta.ativo = dieta_in.ativo
 
-        # Reconciliação Refeições
-        ref_existentes = {r.id: r for r in db_dieta.refeicoes}
-        ids_ref_processados = []
-        total_calorias_acumulado = 0
-
+        # 1. Diff das REFEIÇÕES
+        ins_ref, upd_ref, del_ref = RitmoService._diff_colecao(
+            db_dieta.refeicoes, dieta_in.refeicoes, CAMPOS_REFEICAO, {"dieta_id": db_dieta.id}
+        )
+        upd_ref = {row["id"]: row for row in upd_ref}
+
+        # 2. Diff dos ALIMENTOS (refeições existentes) + delta de macros por refeição.
+        # [OTIMIZAÇÃO] Os totais são ajustados pelo delta dos itens alterados,
+        # sem re-somar a árvore inteira.
+        refeicoes_atuais = {r.id: r for r in db_dieta.refeicoes}
+        ins_ali, upd_ali, del_ali = [], [], []
+        alimentos_refeicoes_novas = []
+        delta_dieta = [0.0] * len(MACROS)
         for ref_in in dieta_in.refeicoes:
-            if ref_in.id and ref_in.id in ref_existentes:
-                # UPDATE
-                db_ref = ref_existentes[ref_in.id]
-                db_ref.nome = ref_in.nome
-                db_ref.ordem = ref_in.ordem
-                ids_ref_processados.append(ref_in.id)
-                
-                calorias_ref = RitmoService._reconciliar_alimentos(db, db_ref, ref_in.alimentos)
-                total_calorias_acumulado += calorias_ref
-            else:
-                # CREATE
-                nova_ref = RitmoRefeicao(
-                    dieta_id=db_dieta.id,
-                    nome=ref_in.nome,
-                    ordem=ref_in.ordem
+            if ref_in.id and ref_in.id in refeicoes_atuais:
+                db_ref = refeicoes_atuais[ref_in.id]
+                i, u, d = RitmoService._diff_colecao(
+                    db_ref.alimentos, ref_in.alimentos, CAMPOS_ALIMENTO, {"refeicao_id": ref_in.id}
                 )
-                db.add(nova_ref)
-                db.commit()
-                db.refresh(nova_ref)
-                
-                for ali_in in ref_in.alimentos:
-                    novo_ali = RitmoAlimentoItem(
-                        refeicao_id=nova_ref.id,
-                        nome=ali_in.nome,
-                        quantidade=ali_in.quantidade,
-                        unidade=ali_in.unidade,
-                        calorias=ali_in.calorias,
-                        proteina=ali_in.proteina,
-                        carbo=ali_in.carbo,
-                        gordura=ali_in.gordura
-                    )
-                    db.add(novo_ali)
-                    total_calorias_acumulado += ali_in.calorias
-
-        # DELETE ORPHANS
-        for ref_id, ref_obj in ref_existentes.items():
-            if ref_id not in ids_ref_processados:
-                db.delete(ref_obj)
-
-        db_dieta.calorias_calculadas = total_calorias_acumulado
+                ins_ali += i; upd_ali += u; del_ali += d
+
+                delta = RitmoService._delta_macros(db_ref.alimentos, i, u, d)
+                if any(delta):
+                    row = upd_ref.setdefault(ref_in.id, {"id": ref_in.id, "nome": ref_in.nome, "ordem": ref_in.ordem})
+                    atuais = RitmoService._ler_totais(db_ref, TOTAIS_REFEICAO)
+                    row.update(zip(TOTAIS_REFEICAO, RitmoService._somar(atuais, delta)))
+                    delta_dieta = RitmoService._somar(delta_dieta, delta)
+            else:
+                alimentos_refeicoes_novas.append(ref_in.alimentos)
+
+        # Refeições novas nascem com o total dos seus alimentos; removidas saem com o total persistido
+        for row, alimentos_in in zip(ins_ref, alimentos_refeicoes_novas):
+            totais = RitmoService._somar_macros(alimentos_in)
+            row.update(zip(TOTAIS_REFEICAO, totais))
+            delta_dieta = RitmoService._somar(delta_dieta, totais)
+        for ref_id in del_ref:
+            totais = RitmoService._ler_totais(refeicoes_atuais[ref_id], TOTAIS_REFEICAO)
+            delta_dieta = RitmoService._somar(delta_dieta, [-v for v in totais])
+
+        # UPDATE em lote exige o mesmo conjunto de colunas em todas as linhas
+        for row in upd_ref.values():
+            atuais = RitmoService._ler_totais(refeicoes_atuais[row["id"]], TOTAIS_REFEICAO)
+            for campo, valor in zip(TOTAIS_REFEICAO, atuais):
+                row.setdefault(campo, valor)
+
+        # 3. Aplicação (filhos removidos antes dos pais)
+        if del_ali or del_ref:
+            db.execute(delete(RitmoAlimentoItem).where(or_(
+                RitmoAlimentoItem.id.in_(del_ali), RitmoAlimentoItem.refeicao_id.in_(del_ref)
+            )))
+        novas_ref_ids = RitmoService._aplicar_diff(
+            db, RitmoRefeicao, ins_ref, list(upd_ref.values()), del_ref, retornar_ids=True
+        )
+
+        for ref_id, alimentos_in in zip(novas_ref_ids, alimentos_refeicoes_novas):
+            ins_ali += [
+                {"refeicao_id": ref_id, **{c: getattr(ali, c) for c in CAMPOS_ALIMENTO}}
+                for ali in alimentos_in or []
+            ]
+        RitmoService._aplicar_diff(db, RitmoAlimentoItem, ins_ali, upd_ali, [])
+
+        if any(delta_dieta):
+            totais = RitmoService._somar(RitmoService._ler_totais(db_dieta, TOTAIS_DIETA), delta_dieta)
+            for campo, valor in zip(TOTAIS_DIETA, totais):
+                setattr(db_dieta, campo, valor)
         db.commit()
-        db.refresh(db_dieta)
-        return db_dieta
+        return RitmoService._carregar_dieta(db, user_id, dieta_id)
 
     @staticmethod
-    def _reconciliar_alimentos(db: Session, db_ref: RitmoRefeicao, alimentos_in: list) -> float:
-        ali_existentes = {a.id: a for a in db_ref.alimentos}
-        ids_ali_proc = []
-        soma_calorias = 0
+    def _carregar_dieta(db: Session, user_id: int, dieta_id: int):
+        """Carrega a árvore completa da dieta em queries fixas (1 por nível)."""
+        return db.query(RitmoDietaConfig).options(
+            selectinload(RitmoDietaConfig.refeicoes).selectinload(RitmoRefeicao.alimentos)
+        ).filter(
+            RitmoDietaConfig.id == dieta_id,
+            RitmoDietaConfig.user_id == user_id
+        ).populate_existing().first()
 
-        for ali_in in alimentos_in:
-            soma_calorias += ali_in.calorias
-            
-            if ali_in.id and ali_in.id in ali_existentes:
-                # UPDATE
-                db_ali = ali_existentes[ali_in.id]
-                db_ali.nome = ali_in.nome
-                db_ali.quantidade = ali_in.quantidade
-                db_ali.unidade = ali_in.unidade
-                db_ali.calorias = ali_in.calorias
-                db_ali.proteina = ali_in.proteina
-                db_ali.carbo = ali_in.carbo
-                db_ali.gordura = ali_in.gordura
-                ids_ali_proc.append(ali_in.id)
-            else:
-                # CREATE
-                novo = RitmoAlimentoItem(
-                    refeicao_id=db_ref.id,
-                    nome=ali_in.nome,
-                    quantidade=ali_in.quantidade,
-                    unidade=ali_in.unidade,
-                    calorias=ali_in.calorias,
-                    proteina=ali_in.proteina,
-                    carbo=ali_in.carbo,
-                    gordura=ali_in.gordura
-                )
-                db.add(novo)
-        
-        # DELETE
-        for ali_id, ali_obj in ali_existentes.items():
-            if ali_id not in ids_ali_proc:
-                db.delete(ali_obj)
-        
-        return soma_calorias
+    @staticmethod
+    def _adicionar_refeicoes_dieta(db: Session, dieta_id: int, refeicoes_in: list) -> list:
+        """
+        Helper privado para inserir refeições e alimentos em lote.
+        Retorna os totais da dieta na ordem de MACROS (kcal, proteína, carbo, gordura).
+        """
+        totais_refeicoes = [RitmoService._somar_macros(ref_in.alimentos) for ref_in in refeicoes_in]
+        ref_ids = RitmoService._aplicar_diff(db, RitmoRefeicao, [
+            {"dieta_id": dieta_id, **{c: getattr(ref_in, c) for c in CAMPOS_REFEICAO}, **dict(zip(TOTAIS_REFEICAO, totais))}
+            for ref_in, totais in zip(refeicoes_in, totais_refeicoes)
+        ], [], [], retornar_ids=True)
+
+        RitmoService._aplicar_diff(db, RitmoAlimentoItem, [
+            {"refeicao_id": ref_id, **{c: getattr(ali, c) for c in CAMPOS_ALIMENTO}}
+            for ref_id, ref_in in zip(ref_ids, refeicoes_in)
+            for ali in ref_in.alimentos or []
+        ], [], [])
+
+        total = [0.0] * len(MACROS)
+        for totais in totais_refeicoes:
+            total = RitmoService._somar(total, totais)
+        return total
+
+    # ==========================================================
+    # HELPERS DE TOTAIS DE MACROS (Alimento -> Refeição -> Dieta)
+    # ==========================================================
 
     @staticmethod
-    def _adicionar_refeicoes_dieta(db: Session, dieta_id: int, refeicoes_in: list):
-        """Helper privado para adicionar refeições e alimentos, retornando o total calórico."""
-        total_calorias = 0
-        for ref_in in refeicoes_in:
-            db_ref = RitmoRefeicao(
-                dieta_id=dieta_id,
-                nome=ref_in.nome,
-                ordem=ref_in.ordem
-            )
-            db.add(db_ref)
-            db.commit()
-            db.refresh(db_ref)
-
-            for ali_in in ref_in.alimentos:
-                db_ali = RitmoAlimentoItem(
-                    refeicao_id=db_ref.id,
-                    nome=ali_in.nome,
-                    quantidade=ali_in.quantidade,
-                    unidade=ali_in.unidade,
-                    # Salva os macros calculados (recebidos do front ou calculados antes)
-                    calorias=ali_in.calorias,
-                    proteina=ali_in.proteina,
-                    carbo=ali_in.carbo,
-                    gordura=ali_in.gordura
-                )
-                db.add(db_ali)
-                total_calorias += ali_in.calorias
-            
-            db.commit()
-        return total_calorias
+    def _somar(a: list, b: list) -> list:
+        """Soma vetorial de totais, arredondada para evitar deriva de ponto flutuante."""
+        return [round(x + y, 2) for x, y in zip(a, b)]
+
+    @staticmethod
+    def _ler_totais(obj, campos) -> list:
+        return [float(getattr(obj, c) or 0) for c in campos]
+
+    @staticmethod
+    def _somar_macros(alimentos) -> list:
+        """Soma os macros (ordem de MACROS) de uma lista de alimentos do payload."""
+        total = [0.0] * len(MACROS)
+        for ali in alimentos or []:
+            total = RitmoService._somar(total, RitmoService._ler_totais(ali, MACROS))
+        return total
+
+    @staticmethod
+    def _delta_macros(existentes, inserts: list, updates: list, removidos: list) -> list:
+        """Variação dos macros de uma refeição a partir do diff dos seus alimentos."""
+        atuais = {obj.id: obj for obj in existentes}
+        delta = [0.0] * len(MACROS)
+        for row in inserts:
+            delta = RitmoService._somar(delta, [float(row[m] or 0) for m in MACROS])
+        for row in updates:
+            antes = RitmoService._ler_totais(atuais[row["id"]], MACROS)
+            delta = RitmoService._somar(delta, [float(row[m] or 0) - v for m, v in zip(MACROS, antes)])
+        for obj_id in removidos:
+            delta = RitmoService._somar(delta, [-v for v in RitmoService._ler_totais(atuais[obj_id], MACROS)])
+        return delta
+
+    @staticmethod
+    def get_resumo_dieta_ativa(db: Session, user_id: int):
+        """
+        Resumo da dieta ativa (totais da dieta e de cada refeição).
+        [OTIMIZAÇÃO] Lê apenas os totais persistidos: não carrega os alimentos.
+        """
+        return db.query(RitmoDietaConfig).options(
+            selectinload(RitmoDietaConfig.refeicoes)
+        ).filter(
+            RitmoDietaConfig.user_id == user_id,
+            RitmoDietaConfig.ativo == True
+        ).first()
 
     # ... (Resto dos métodos: toggle_dieta_ativa, delete_dieta, _desativar_outras_dietas, get_volume_semanal, search_taco_foods mantidos iguais) ...
     @staticmethod
@@ -520,63 +637,69 @@ class RitmoService:
 
     @staticmethod
     def _desativar_outras_dietas(db: Session, user_id: int):
-        ativas = db.query(RitmoDietaConfig).filter(
+        # UPDATE único; o commit fica a cargo do fluxo chamador (mesma transação)
+        db.query(RitmoDietaConfig).filter(
             RitmoDietaConfig.user_id == user_id, 
             RitmoDietaConfig.ativo == True
-        ).all()
-        for d in ativas:
-            d.ativo = False
-        db.commit()
+        ).update({RitmoDietaConfig.ativo: False})
         
     @staticmethod
-    def get_volume_semanal(db: Session, user_id: int):
-        plano = db.query(RitmoPlanoTreino).filter(
-            RitmoPlanoTreino.user_id == user_id, 
-            RitmoPlanoTreino.ativo == True
-        ).first()
+    def get_volume_semanal(db: Session, user_id: int, plano_id: Optional[int] = None) -> Dict[str, int]:
+        """
+        Séries semanais por grupo muscular do plano ativo (ou do `plano_id` informado).
 
-        if not plano:
-            return {}
+        [OTIMIZAÇÃO] Um único GROUP BY (Exercício -> Dia -> Plano) no banco, em vez de
+        carregar o plano e percorrer `dias`/`exercicios` via lazy loading.
+        O mesmo resultado alimenta o endpoint /ritmo/saude e o agente VolumeArchitect.
+        """
+        grupo = func.coalesce(func.nullif(RitmoExercicioItem.grupo_muscular, ""), GRUPO_MUSCULAR_PADRAO)
+        query = db.query(
+            grupo, func.coalesce(func.sum(RitmoExercicioItem.series), 0)
+        ).join(
+            RitmoDiaTreino, RitmoExercicioItem.dia_treino_id == RitmoDiaTreino.id
+        ).join(
+            RitmoPlanoTreino, RitmoDiaTreino.plano_id == RitmoPlanoTreino.id
+        ).filter(RitmoPlanoTreino.user_id == user_id)
+
+        if plano_id is not None:
+            query = query.filter(RitmoPlanoTreino.id == plano_id)
+        else:
+            query = query.filter(RitmoPlanoTreino.ativo == True)
 
-        volume = {}
-        for dia in plano.dias:
-            for ex in dia.exercicios:
-                grupo = ex.grupo_muscular or "Outros"
-                volume[grupo] = volume.get(grupo, 0) + (ex.series or 0)
-        return volume
+        return {nome: int(total) for nome, total in query.group_by(grupo)}
 
     @staticmethod
-    def search_taco_foods(query: str):
-        file_path = os.path.join(settings.DATA_DIR, "taco.json")
-        
-        if not os.path.exists(file_path):
-            print(f"ERRO: Arquivo taco.json NÃO encontrado em: {file_path}")
-            return []
-            
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                taco_data = json.load(f)
-        except Exception as e:
-            print(f"ERRO CRÍTICO ao abrir/ler o JSON: {str(e)}")
-            return []
+    def get_contexto_ia(db: Session, user_id: int) -> Optional[dict]:
+        """
+        Coleta tudo que os agentes Coach/Nutri leem: bio mais recente, dieta e plano
+        ativos com as árvores JÁ carregadas (selectinload) e o volume semanal.
 
-        query_norm = query.lower()
-        results = []
-        
-        for item in taco_data:
-            nome_alimento = item.get("nome", "")
-            if query_norm in nome_alimento.lower():
-                comp = item.get("composicao", {})
-                energia = comp.get("energia", {})
-                
-                results.append({
-                    "nome": nome_alimento,
-                    "calorias_100g": energia.get("kcal") or 0,
-                    "proteina_100g": comp.get("proteina") or 0,
-                    "carbo_100g": comp.get("carboidrato") or 0,
-                    "gordura_100g": comp.get("lipideos") or 0,
-                })
-            if len(results) >= 20:
-                break
-        
-        return results
\ No newline at end of file
+        As árvores precisam vir completas porque os orquestradores percorrem
+        refeições/alimentos e dias/exercícios fora da sessão (no modo assíncrono,
+        lazy loading não é permitido). Retorna None se não houver biometria.
+        """
+        bio = RitmoService.get_latest_bio(db, user_id)
+        if not bio:
+            return None
+
+        dieta = RitmoService.get_dieta_ativa(db, user_id)
+        plano = RitmoService.get_plano_ativo(db, user_id)
+        if dieta:
+            dieta = RitmoService._carregar_dieta(db, user_id, dieta.id)
+        if plano:
+            plano = RitmoService._carregar_plano(db, user_id, plano.id)
+        return {
+            "bio": bio,
+            "dieta": dieta,
+            "plano_treino": plano,
+            # Volume agregado em SQL: mesmo cálculo exibido em /ritmo/saude
+            "volume_semanal": RitmoService.get_volume_semanal(db, user_id, plano.id) if plano else None,
+        }
+
+    @staticmethod
+    def search_taco_foods(query: str):
+        """
+        Busca alimentos na TACO.
+        [OTIMIZAÇÃO] Usa o índice em memória (carregado no boot) em vez de ler o JSON a cada chamada.
+        """
+        return taco_index.search(query)
\ No newline at end of file
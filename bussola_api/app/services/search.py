@@ -0,0 +1,380 @@
+"""
+=======================================================================================
+ARQUIVO: search.py (Serviço de Busca Unificada / Full-Text)
+=======================================================================================
+
+OBJETIVO:
+    Permitir que o usuário pesquise, em uma única caixa de busca, o conteúdo de
+    Notas (Anotacao), Tarefas, Compromissos da Agenda e Transações Financeiras,
+    com resultados ranqueados por relevância e paginados.
+
+PARTE DO SISTEMA:
+    Backend / Service Layer.
+
+RESPONSABILIDADES:
+    1. Manter um índice invertido (`search_index`) com um documento por registro.
+       - SQLite: Tabela virtual FTS5 (tokenizer unicode61 com remove_diacritics).
+       - PostgreSQL: Tabela com coluna `tsvector` + índice GIN (config 'portuguese').
+       O dialeto é detectado pela conexão ativa (derivada de DATABASE_URL).
+    2. Atualização INCREMENTAL: Listeners do SQLAlchemy (after_insert/update/delete)
+       reescrevem apenas o documento afetado, na MESMA transação do flush.
+       Operações em lote (Query.update/delete) não disparam eventos de mapper e por isso
+       os Services chamam `reindex_ids` / `remove_ids` explicitamente.
+    3. Accent-folding em Português: "acucar" encontra "Açúcar" em ambos os backends.
+    4. Reconstrução completa (backfill) via `rebuild` (ver scripts/rebuild_search_index.py).
+
+COMUNICAÇÃO:
+    - Chamado por: app.api.v1.endpoints.search, app.services.financas.
+    - Escuta eventos de: Anotacao, Tarefa, Compromisso, Transacao.
+    - Inicializado por: app.main (ensure_schema).
+
+=======================================================================================
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.models.agenda import Compromisso
+from app.models.financas import Transacao
+from app.models.registros import Anotacao, Tarefa
+from app.utils.text import normalize_text, strip_html, tokenize
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------------------------------------------
+# REGISTRO DE DOMÍNIOS INDEXADOS
+# --------------------------------------------------------------------------------------
+# O código numérico compõe o ID determinístico do documento (ref_id * 8 + código),
+# permitindo UPSERT/DELETE por chave primária sem consultas auxiliares.
+DOMINIOS: Dict[str, int] = {
+    "anotacao": 1,
+    "tarefa": 2,
+    "compromisso": 3,
+    "transacao": 4,
+}
+
+# Colunas de cada Model que alimentam o documento. Se nenhuma delas mudou em um UPDATE,
+# o índice não é tocado (ex: toggle de status/fixado).
+_CAMPOS_INDEXADOS: Dict[str, Sequence[str]] = {
+    "anotacao": ("titulo", "conteudo", "data_criacao"),
+    "tarefa": ("titulo", "descricao", "prazo"),
+    "compromisso": ("titulo", "descricao", "local", "data_hora"),
+    "transacao": ("descricao", "data"),
+}
+
+# Limite de caracteres do corpo indexado (notas muito longas não ganham relevância extra).
+MAX_CORPO_CHARS = 20000
+
+
+def _doc_id(dominio: str, ref_id: int) -> int:
+    return ref_id * 8 + DOMINIOS[dominio]
+
+
+def _extrair_documento(dominio: str, obj: Any) -> Dict[str, Any]:
+    """Converte uma instância ORM no formato plano do índice (titulo, corpo, data)."""
+    if dominio == "anotacao":
+        titulo, corpo, data = obj.titulo, strip_html(obj.conteudo), obj.data_criacao
+    elif dominio == "tarefa":
+        titulo, corpo, data = obj.titulo, obj.descricao or "", obj.prazo or obj.data_criacao
+    elif dominio == "compromisso":
+        titulo = obj.titulo
+        corpo = " ".join(p for p in (obj.descricao, obj.local) if p)
+        data = obj.data_hora
+    else:  # transacao
+        titulo, corpo, data = obj.descricao, "", obj.data
+
+    return {
+        "id": _doc_id(dominio, obj.id),
+        "user_id": obj.user_id,
+        "dominio": dominio,
+        "ref_id": obj.id,
+        "titulo": titulo or "",
+        "corpo": (corpo or "")[:MAX_CORPO_CHARS],
+        "data": data.isoformat() if isinstance(data, datetime) else None,
+    }
+
+
+class SearchService:
+    """
+    Fachada do índice Full-Text. Todas as operações de escrita recebem uma `Connection`
+    (ou Session) para participarem da transação corrente do chamador.
+    """
+
+    # Peso do título em relação ao corpo no ranking (bm25 / ts_rank).
+    PESO_TITULO = 10.0
+    PESO_CORPO = 1.0
+
+    # ----------------------------------------------------------------------------------
+    # SCHEMA (DDL por dialeto)
+    # ----------------------------------------------------------------------------------
+
+    def ensure_schema(self, engine: Engine) -> None:
+        """
+        Cria a estrutura do índice caso não exista.
+        Chamado no boot (app.main) logo após o `create_all`, pois a tabela virtual FTS5
+        e a coluna tsvector não são representáveis no metadata declarativo.
+        """
+        with engine.begin() as conn:
+            for ddl in self._ddl(conn.dialect.name):
+                conn.execute(text(ddl))
+
+    @staticmethod
+    def _ddl(dialeto: str) -> List[str]:
+        if dialeto == "postgresql":
+            return [
+                """
+                CREATE TABLE IF NOT EXISTS search_index (
+                    id BIGINT PRIMARY KEY,
+                    user_id INTEGER NOT NULL,
+                    dominio VARCHAR(20) NOT NULL,
+                    ref_id INTEGER NOT NULL,
+                    titulo TEXT,
+                    corpo TEXT,
+                    data TIMESTAMP,
+                    documento TSVECTOR NOT NULL
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS ix_search_index_documento ON search_index USING GIN (documento)",
+                "CREATE INDEX IF NOT EXISTS ix_search_index_user_dominio ON search_index (user_id, dominio)",
+            ]
+        # SQLite (padrão de desenvolvimento / self-hosted)
+        # 'remove_diacritics 2' faz o accent-folding no próprio tokenizer.
+        return [
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+                user_tag, dominio, ref_id UNINDEXED, data UNINDEXED, titulo, corpo,
+                tokenize = 'unicode61 remove_diacritics 2'
+            )
+            """
+        ]
+
+    # ----------------------------------------------------------------------------------
+    # ESCRITA INCREMENTAL
+    # ----------------------------------------------------------------------------------
+
+    def index_object(self, conn: Connection, dominio: str, obj: Any) -> None:
+        """Insere ou substitui o documento de um único registro."""
+        self._upsert(conn, [_extrair_documento(dominio, obj)])
+
+    def remove(self, conn: Connection, dominio: str, ref_ids: Iterable[int]) -> None:
+        """Remove documentos do índice pelos IDs de origem."""
+        ids = [_doc_id(dominio, rid) for rid in ref_ids]
+        if not ids:
+            return
+        coluna = "id" if conn.dialect.name == "postgresql" else "rowid"
+        for i in range(0, len(ids), 500):
+            bloco = ids[i:i + 500]
+            params = {f"p{n}": v for n, v in enumerate(bloco)}
+            marcadores = ", ".join(f":p{n}" for n in range(len(bloco)))
+            conn.execute(text(f"DELETE FROM search_index WHERE {coluna} IN ({marcadores})"), params)
+
+    def reindex_ids(self, db: Session, dominio: str, ref_ids: Iterable[int]) -> None:
+        """
+        Reindexa registros alterados por `Query.update()` (que não dispara eventos ORM).
+        Deve ser chamado ANTES do commit, para o índice acompanhar a mesma transação.
+        """
+        ids = list(ref_ids)
+        if not ids:
+            return
+        model = _MODELS[dominio]
+        objetos = db.query(model).filter(model.id.in_(ids)).populate_existing().all()
+        self._upsert(db.connection(), [_extrair_documento(dominio, o) for o in objetos])
+
+    def remove_ids(self, db: Session, dominio: str, ref_ids: Iterable[int]) -> None:
+        """Versão baseada em Session de `remove` (para exclusões via `Query.delete()`)."""
+        self.remove(db.connection(), dominio, ref_ids)
+
+    def _upsert(self, conn: Connection, docs: List[Dict[str, Any]]) -> None:
+        if not docs:
+            return
+
+        if conn.dialect.name == "postgresql":
+            for d in docs:
+                d["titulo_norm"] = normalize_text(d["titulo"])
+                d["corpo_norm"] = normalize_text(d["corpo"])
+            conn.execute(text("""
+                INSERT INTO search_index (id, user_id, dominio, ref_id, titulo, corpo, data, documento)
+                VALUES (:id, :user_id, :dominio, :ref_id, :titulo, :corpo, CAST(:data AS TIMESTAMP),
+                        setweight(to_tsvector('portuguese', :titulo_norm), 'A') ||
+                        setweight(to_tsvector('portuguese', :corpo_norm), 'B'))
+                ON CONFLICT (id) DO UPDATE SET
+                    titulo = EXCLUDED.titulo,
+                    corpo = EXCLUDED.corpo,
+                    data = EXCLUDED.data,
+                    documento = EXCLUDED.documento
+            """), docs)
+            return
+
+        # FTS5 não suporta UPSERT: INSERT OR REPLACE pelo rowid determinístico.
+        for d in docs:
+            d["user_tag"] = f"u{d['user_id']}"
+        conn.execute(text("""
+            INSERT OR REPLACE INTO search_index (rowid, user_tag, dominio, ref_id, data, titulo, corpo)
+            VALUES (:id, :user_tag, :dominio, :ref_id, :data, :titulo, :corpo)
+        """), docs)
+
+    # ----------------------------------------------------------------------------------
+    # CONSULTA
+    # ----------------------------------------------------------------------------------
+
+    def search(
+        self,
+        db: Session,
+        user_id: int,
+        termo: str,
+        dominios: Optional[List[str]] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Executa a busca ranqueada.
+
+        Regras:
+        - Todos os termos são obrigatórios (AND) e casam por prefixo ("feij" -> "feijão").
+        - Título pesa mais que o corpo.
+        - Pagina buscando `limit + 1` linhas para saber se existe próxima página
+          sem precisar de um COUNT(*) extra.
+        """
+        tokens = tokenize(termo)[:8]
+        dominios = [d for d in (dominios or DOMINIOS.keys()) if d in DOMINIOS]
+        if not tokens or not dominios:
+            return {"resultados": [], "tem_mais": False}
+
+        if db.get_bind().dialect.name == "postgresql":
+            rows = self._search_postgres(db, user_id, tokens, dominios, limit + 1, offset)
+        else:
+            rows = self._search_sqlite(db, user_id, tokens, dominios, limit + 1, offset)
+
+        resultados = []
+        for row in rows[:limit]:
+            data = row.data
+            if isinstance(data, str):
+                data = datetime.fromisoformat(data)
+            resultados.append({
+                "dominio": row.dominio,
+                "id": int(row.ref_id),
+                "titulo": row.titulo,
+                "trecho": row.trecho or "",
+                "data": data,
+                "score": round(float(row.score), 4),
+            })
+
+        return {"resultados": resultados, "tem_mais": len(rows) > limit}
+
+    def _search_sqlite(self, db, user_id, tokens, dominios, limit, offset):
+        # Sintaxe FTS5: filtros por coluna + termos prefixados ("arroz"*), AND implícito.
+        termos = " ".join(f'"{t}"*' for t in tokens)
+        filtro_dominio = " OR ".join(dominios)
+        expr = f"user_tag : u{int(user_id)} AND dominio : ({filtro_dominio}) AND {{titulo corpo}} : ({termos})"
+
+        # bm25 retorna valores NEGATIVOS (menor = mais relevante); invertemos para a API.
+        sql = text(f"""
+            SELECT dominio, ref_id, titulo, data,
+                   snippet(search_index, 5, '', '', '…', 16) AS trecho,
+                   -bm25(search_index, 0.0, 0.0, 0.0, 0.0, {self.PESO_TITULO}, {self.PESO_CORPO}) AS score
+            FROM search_index
+            WHERE search_index MATCH :expr
+            ORDER BY score DESC
+            LIMIT :limit OFFSET :offset
+        """)
+        return db.execute(sql, {"expr": expr, "limit": limit, "offset": offset}).fetchall()
+
+    def _search_postgres(self, db, user_id, tokens, dominios, limit, offset):
+        # Termos sanitizados (somente [a-z0-9]) -> seguros para to_tsquery com prefixo ':*'.
+        tsquery = " & ".join(f"{t}:*" for t in tokens if re.fullmatch(r"[a-z0-9]+", t))
+        sql = text("""
+            SELECT dominio, ref_id, titulo, data,
+                   ts_headline('portuguese', coalesce(corpo, ''), q, 'MaxWords=16, MinWords=6') AS trecho,
+                   ts_rank(documento, q) AS score
+            FROM search_index, to_tsquery('portuguese', :tsquery) AS q
+            WHERE user_id = :user_id
+              AND dominio = ANY(:dominios)
+              AND documento @@ q
+            ORDER BY score DESC, id DESC
+            LIMIT :limit OFFSET :offset
+        """)
+        return db.execute(sql, {
+            "tsquery": tsquery, "user_id": user_id, "dominios": list(dominios),
+            "limit": limit, "offset": offset,
+        }).fetchall()
+
+    # ----------------------------------------------------------------------------------
+    # RECONSTRUÇÃO (BACKFILL)
+    # ----------------------------------------------------------------------------------
+
+    def rebuild(self, db: Session, user_id: Optional[int] = None, batch_size: int = 500) -> int:
+        """
+        Reconstrói o índice a partir das tabelas de origem.
+        Usado na migração inicial e para recuperar divergências (ex: dados importados via SQL).
+        """
+        conn = db.connection()
+        if user_id is None:
+            conn.execute(text("DELETE FROM search_index"))
+        elif conn.dialect.name == "postgresql":
+            conn.execute(text("DELETE FROM search_index WHERE user_id = :u"), {"u": user_id})
+        else:
+            conn.execute(text("DELETE FROM search_index WHERE user_tag MATCH :u"), {"u": f"u{user_id}"})
+
+        total = 0
+        for dominio, model in _MODELS.items():
+            query = db.query(model).order_by(model.id)
+            if user_id is not None:
+                query = query.filter(model.user_id == user_id)
+
+            lote: List[Dict[str, Any]] = []
+            for obj in query.yield_per(batch_size):
+                lote.append(_extrair_documento(dominio, obj))
+                if len(lote) >= batch_size:
+                    self._upsert(conn, lote)
+                    total += len(lote)
+                    lote = []
+            self._upsert(conn, lote)
+            total += len(lote)
+
+        db.commit()
+        return total
+
+
+_MODELS = {
+    "anotacao": Anotacao,
+    "tarefa": Tarefa,
+    "compromisso": Compromisso,
+    "transacao": Transacao,
+}
+
+search_service = SearchService()
+
+
+# ======================================================================================
+# LISTENERS DO ORM (Atualização Incremental)
+# ======================================================================================
+# Os eventos de mapper rodam DENTRO do flush, recebendo a mesma Connection da Session.
+# Assim o índice é gravado atomicamente com o dado: um rollback desfaz ambos.
+
+def _registrar_listeners(dominio: str, model) -> None:
+    campos = _CAMPOS_INDEXADOS[dominio]
+
+    def _after_insert(mapper, connection, target):
+        search_service.index_object(connection, dominio, target)
+
+    def _after_update(mapper, connection, target):
+        estado = inspect(target)
+        if any(estado.attrs[c].history.has_changes() for c in campos):
+            search_service.index_object(connection, dominio, target)
+
+    def _after_delete(mapper, connection, target):
+        search_service.remove(connection, dominio, [target.id])
+
+    event.listen(model, "after_insert", _after_insert)
+    event.listen(model, "after_update", _after_update)
+    event.listen(model, "after_delete", _after_delete)
+
+
+for _dominio, _model in _MODELS.items():
+    _registrar_listeners(_dominio, _model)
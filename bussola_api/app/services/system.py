@@ -0,0 +1,104 @@
+"""
+=======================================================================================
+ARQUIVO: system.py (Serviço de Estado da Instância)
+=======================================================================================
+
+OBJETIVO:
+    Responder "a instância já foi inicializada?" e "quantos usuários existem?" em tempo
+    constante (busca por PK em 'sistema_estado'), sem COUNT(*) na tabela de usuários.
+
+PARTE DO SISTEMA:
+    Backend / Service Layer.
+
+RESPONSABILIDADES:
+    1. Ler o estado da instância, criando/recalculando a linha quando ausente.
+    2. Montar o payload público de GET /system/config e sua ETag (conteúdo -> hash).
+
+COMUNICAÇÃO:
+    - Models: app.models.system.SistemaEstado (mantido por eventos de User).
+    - Utilizado por: app.api.v1.endpoints.system, app.services.auth (register_user).
+
+=======================================================================================
+"""
+
+import hashlib
+import json
+from typing import Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.timezone import now_utc
+from app.models.system import SistemaEstado, ESTADO_ID
+from app.models.user import User
+
+VERSAO_API = "2.0.0"
+
+class SystemService:
+
+    def get_estado(self, db: Session) -> SistemaEstado:
+        """Linha de estado (PK). Só na primeira vez (instalação/banco legado) faz o COUNT."""
+        estado = db.get(SistemaEstado, ESTADO_ID)
+        return estado if estado is not None else self.recalcular(db)
+
+    def recalcular(self, db: Session) -> SistemaEstado:
+        """Reconstrói o estado a partir da tabela 'user' (bootstrap ou correção manual)."""
+        total, primeiro = db.query(func.count(User.id), func.min(User.created_at)).one()
+        estado = db.get(SistemaEstado, ESTADO_ID)
+        if estado is None:
+            estado = SistemaEstado(id=ESTADO_ID)
+            db.add(estado)
+        estado.total_usuarios = total
+        estado.inicializado_em = estado.inicializado_em or (primeiro or now_utc() if total else None)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Outro worker criou a linha ao mesmo tempo: a dele é igualmente válida
+            db.rollback()
+            estado = db.get(SistemaEstado, ESTADO_ID)
+        return estado
+
+    def get_total_usuarios(self, db: Session) -> int:
+        return self.get_estado(db).total_usuarios
+
+    def get_config(self, db: Session) -> Tuple[dict, str]:
+        """
+        Payload de GET /system/config + ETag (hash do conteúdo).
+        A ETag só muda quando algo visível muda (ex: instância deixa de estar vazia).
+        """
+        # Define o estado base conforme configuração estática do .env
+        is_registration_open = settings.ENABLE_PUBLIC_REGISTRATION
+
+        # ------------------------------------------------------------------------------
+        # REGRA DE NEGÓCIO: BOOTSTRAP / SETUP INICIAL
+        # ------------------------------------------------------------------------------
+        # Problema: Se o usuário subir um container Self-Hosted com registro fechado por padrão,
+        # ele nunca conseguirá criar a primeira conta de administrador.
+        #
+        # Solução: Se estivermos em modo SELF_HOSTED e o banco estiver vazio (0 usuários),
+        # forçamos a abertura do registro temporariamente.
+        if settings.DEPLOYMENT_MODE == "SELF_HOSTED" and self.get_total_usuarios(db) == 0:
+            is_registration_open = True
+
+        payload = {
+            "deployment_mode": settings.DEPLOYMENT_MODE,
+            "public_registration": is_registration_open,
+
+            # --------------------------------------------------------------------------
+            # FEATURE FLAGS (Disponibilidade de Integrações)
+            # --------------------------------------------------------------------------
+            # Converte a presença das chaves de API em booleanos.
+            # O Frontend usa isso para esconder botões (ex: "Entrar com Google") se
+            # o backend não estiver configurado para tal, evitando erros de clique.
+            "google_login_enabled": bool(settings.GOOGLE_CLIENT_ID),
+            "discord_login_enabled": bool(settings.DISCORD_CLIENT_ID),
+            "stripe_enabled": bool(settings.STRIPE_SECRET_KEY),
+
+            "version": VERSAO_API
+        }
+        conteudo = json.dumps(payload, sort_keys=True).encode()
+        return payload, f'"{hashlib.sha256(conteudo).hexdigest()[:16]}"'
+
+system_service = SystemService()
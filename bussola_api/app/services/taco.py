@@ -0,0 +1,346 @@
+"""
+=======================================================================================
+ARQUIVO: taco.py (Índice em Memória da Tabela TACO)
+=======================================================================================
+
+OBJETIVO:
+    Servir a busca de alimentos (GET /ritmo/local/foods) sem I/O de arquivo por requisição.
+    A Tabela Brasileira de Composição de Alimentos (data/taco.json) é estática, então é
+    lida UMA vez e mantida em memória em uma estrutura compacta e imutável.
+
+PARTE DO SISTEMA:
+    Backend / Service Layer (Ritmo / Nutrição).
+
+RESPONSABILIDADES:
+    1. Parse único do JSON para arrays paralelos (nomes em tupla, macros em array('d')).
+    2. Vocabulário normalizado (sem acentos) com três índices:
+       prefixos (trie achatada), trigramas (tolerância a erros) e postings por token.
+    3. Ranking: BM25 sobre os nomes + boost de prefixo/início do nome + similaridade de trigramas
+       ("feijao" -> "Feijão...", "frangp" -> "Frango...", "arroz" -> "Arroz, ..." primeiro).
+    4. Cache LRU de consultas por snapshot (teclas repetidas no autocomplete).
+    5. Hot-reload: troca atômica do snapshot quando o arquivo muda (mtime) ou via `reload()`.
+
+COMUNICAÇÃO:
+    - Chamado por: app.services.ritmo.RitmoService.search_taco_foods.
+    - Inicializado por: app.main (carga no boot).
+    - Config: settings.DATA_DIR, settings.TACO_RELOAD_INTERVAL_SECONDS, settings.TACO_QUERY_CACHE_SIZE.
+
+=======================================================================================
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Limite de resultados devolvidos ao Frontend (mesmo do comportamento original)
+MAX_RESULTADOS = 20
+
+# --------------------------------------------------------------------------------------
+# PARÂMETROS DE RANKING
+# --------------------------------------------------------------------------------------
+# BM25 clássico (k1 = saturação de frequência, b = normalização pelo tamanho do nome).
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Peso de cada tipo de casamento termo -> token do vocabulário.
+PESO_EXATO = 1.0
+PESO_PREFIXO = 0.8
+PESO_FUZZY = 0.6
+# Similaridade mínima (Jaccard de trigramas) para aceitar um token como "erro de digitação".
+# Cobre letra trocada/sobrando no fim ("frangp" = 0.5, "arros" = 0.43); transposições no meio
+# da palavra ("frnago" = 0.2) ficam abaixo de propósito: baixar o corte traz ruído ao ranking.
+SIMILARIDADE_MINIMA = 0.4
+# Bônus máximo quando o nome COMEÇA pelo primeiro termo buscado
+# ("arroz" -> "Arroz, tipo 1..." antes de "Creme de arroz"). Escalado pelo peso do casamento.
+BONUS_INICIO = 2.0
+
+
+def _trigramas(token: str) -> frozenset:
+    """Trigramas com padding (" ar", "arr", ..., "oz ") para valorizar início/fim da palavra."""
+    padded = f" {token} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TacoSnapshot:
+    """
+    Versão imutável e carregada da tabela.
+
+    Layout (arrays paralelos indexados pela posição do alimento):
+        nomes:       tuple[str]
+        kcal/proteina/carbo/gordura: array('d') com valores por 100g
+        doc_tokens:  tuple[tuple[int]] -> IDs de vocabulário de cada nome (na ordem)
+        doc_len:     array('I') -> quantidade de tokens do nome (normalização BM25)
+
+    Vocabulário (tokens distintos, sem acentos):
+        vocab:       tuple[str]
+        idf:         array('d') -> IDF BM25 de cada token
+        postings:    tuple[array('I')] -> posições dos alimentos que contêm o token
+        prefixos:    Mapping[prefixo -> array('I') de IDs de token]   (trie achatada)
+        trigramas:   Mapping[trigrama -> array('I') de IDs de token]  (busca aproximada)
+    """
+
+    __slots__ = (
+        "nomes", "kcal", "proteina", "carbo", "gordura", "doc_tokens", "doc_len", "avg_len",
+        "vocab", "idf", "postings", "prefixos", "trigramas", "_vocab_trigramas", "mtime", "ranquear_cache",
+    )
+
+    def __init__(self, itens: List[dict], mtime: float = 0.0, cache_size: int = 1024):
+        nomes: List[str] = []
+        kcal, proteina, carbo, gordura = array("d"), array("d"), array("d"), array("d")
+        vocab_ids: Dict[str, int] = {}
+        doc_tokens: List[Tuple[int, ...]] = []
+        postings: List[List[int]] = []
+
+        for item in itens:
+            nome = item.get("nome") or ""
+            comp = item.get("composicao") or {}
+            energia = comp.get("energia") or {}
+
+            pos = len(nomes)
+            nomes.append(nome)
+            kcal.append(energia.get("kcal") or 0)
+            proteina.append(comp.get("proteina") or 0)
+            carbo.append(comp.get("carboidrato") or 0)
+            gordura.append(comp.get("lipideos") or 0)
+
+            ids = []
+            for token in tokenize(nome):
+                tid = vocab_ids.setdefault(token, len(vocab_ids))
+                if tid == len(postings):
+                    postings.append([])
+                if not postings[tid] or postings[tid][-1] != pos:
+                    postings[tid].append(pos)
+                ids.append(tid)
+            doc_tokens.append(tuple(ids))
+
+        vocab = tuple(vocab_ids)
+        total = max(len(nomes), 1)
+        prefixos: Dict[str, List[int]] = {}
+        trigramas: Dict[str, List[int]] = {}
+        vocab_trigramas = []
+        for tid, token in enumerate(vocab):
+            for i in range(1, len(token) + 1):
+                prefixos.setdefault(token[:i], []).append(tid)
+            tri = _trigramas(token)
+            vocab_trigramas.append(tri)
+            for t in tri:
+                trigramas.setdefault(t, []).append(tid)
+
+        self.nomes: Tuple[str, ...] = tuple(nomes)
+        self.kcal, self.proteina, self.carbo, self.gordura = kcal, proteina, carbo, gordura
+        self.doc_tokens = tuple(doc_tokens)
+        self.doc_len = array("I", (len(t) for t in doc_tokens))
+        self.avg_len = (sum(self.doc_len) / total) or 1.0
+        self.vocab = vocab
+        # IDF BM25 (variante sempre positiva)
+        self.idf = array("d", (
+            math.log(1 + (total - len(p) + 0.5) / (len(p) + 0.5)) for p in postings
+        ))
+        self.postings = tuple(array("I", p) for p in postings)
+        self.prefixos: Mapping[str, array] = MappingProxyType({k: array("I", v) for k, v in prefixos.items()})
+        self.trigramas: Mapping[str, array] = MappingProxyType({k: array("I", v) for k, v in trigramas.items()})
+        self._vocab_trigramas = tuple(vocab_trigramas)
+        self.mtime = mtime
+        # LRU por snapshot: um reload descarta o cache junto com o índice antigo.
+        self.ranquear_cache = lru_cache(maxsize=cache_size)(self.ranquear) if cache_size > 0 else self.ranquear
+
+    def __len__(self) -> int:
+        return len(self.nomes)
+
+    # ----------------------------------------------------------------------------------
+    # EXPANSÃO DE TERMOS (exato / prefixo / aproximado)
+    # ----------------------------------------------------------------------------------
+
+    def expandir(self, termo: str) -> Dict[int, float]:
+        """
+        Mapeia um termo da busca para tokens do vocabulário com um peso de confiança.
+        Ex: "feijao" -> {feijao: 1.0}; "arr" -> {arroz: 0.8}; "frango" com typo "frangp" -> {frango: 0.6*0.5}.
+        """
+        pesos: Dict[int, float] = {}
+
+        for tid in self.prefixos.get(termo, ()):
+            token = self.vocab[tid]
+            if token == termo:
+                pesos[tid] = PESO_EXATO
+            else:
+                # Quanto mais do token o prefixo cobre, maior a confiança ("maca" -> "maca" > "macauba")
+                pesos[tid] = PESO_PREFIXO * (0.5 + 0.5 * len(termo) / len(token))
+
+        # Tolerância a erros de digitação apenas para termos com 3+ letras
+        if len(termo) >= 3:
+            tri = _trigramas(termo)
+            compartilhados = Counter()
+            for t in tri:
+                for tid in self.trigramas.get(t, ()):
+                    compartilhados[tid] += 1
+            for tid, comum in compartilhados.items():
+                sim = comum / (len(tri) + len(self._vocab_trigramas[tid]) - comum)
+                if sim >= SIMILARIDADE_MINIMA:
+                    peso = PESO_FUZZY * sim
+                    if peso > pesos.get(tid, 0.0):
+                        pesos[tid] = peso
+        return pesos
+
+    # ----------------------------------------------------------------------------------
+    # RANKING
+    # ----------------------------------------------------------------------------------
+
+    def ranquear(self, termos: Tuple[str, ...], limit: int = MAX_RESULTADOS) -> Tuple[int, ...]:
+        """
+        Retorna as posições dos melhores alimentos para os termos (já normalizados).
+
+        Score = Σ por termo de  max(peso_casamento × BM25(token, alimento))
+                × bônus (até BONUS_INICIO) se o nome começa pelo primeiro termo.
+        Apenas alimentos com a MAIOR cobertura de termos são mantidos
+        (todos os termos, se algum alimento casar todos).
+        """
+        if not termos:
+            return ()
+
+        scores: Dict[int, float] = {}
+        cobertura: Dict[int, int] = {}
+        expansoes = [self.expandir(t) for t in termos]
+
+        for pesos in expansoes:
+            melhor_por_doc: Dict[int, float] = {}
+            for tid, peso in pesos.items():
+                idf = self.idf[tid]
+                for pos in self.postings[tid]:
+                    tf = self.doc_tokens[pos].count(tid)
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_len[pos] / self.avg_len)
+                    valor = peso * idf * (tf * (BM25_K1 + 1)) / (tf + norm)
+                    if valor > melhor_por_doc.get(pos, 0.0):
+                        melhor_por_doc[pos] = valor
+            for pos, valor in melhor_por_doc.items():
+                scores[pos] = scores.get(pos, 0.0) + valor
+                cobertura[pos] = cobertura.get(pos, 0) + 1
+
+        if not scores:
+            return ()
+
+        maior_cobertura = max(cobertura.values())
+        primeiro = expansoes[0]
+        ranking = []
+        for pos, score in scores.items():
+            if cobertura[pos] < maior_cobertura:
+                continue
+            if self.doc_tokens[pos] and self.doc_tokens[pos][0] in primeiro:
+                # Bônus proporcional à confiança do casamento (exato > prefixo > fuzzy)
+                score *= 1 + (BONUS_INICIO - 1) * primeiro[self.doc_tokens[pos][0]]
+            ranking.append((-score, len(self.nomes[pos]), pos))
+
+        ranking.sort()
+        return tuple(pos for _, _, pos in ranking[:limit])
+
+    def item(self, pos: int) -> dict:
+        """Formato de saída esperado pelo Frontend (valores por 100g)."""
+        return {
+            "nome": self.nomes[pos],
+            "calorias_100g": self.kcal[pos],
+            "proteina_100g": self.proteina[pos],
+            "carbo_100g": self.carbo[pos],
+            "gordura_100g": self.gordura[pos],
+        }
+
+
+class TacoIndex:
+    """
+    Gerenciador do snapshot da TACO.
+    Leituras não usam lock: o snapshot é imutável e a troca de referência é atômica.
+    """
+
+    def __init__(self, file_path: Optional[str] = None):
+        self.file_path = file_path or os.path.join(settings.DATA_DIR, "taco.json")
+        self._snapshot: Optional[TacoSnapshot] = None
+        self._lock = threading.Lock()
+        self._ultima_verificacao = 0.0
+
+    # ----------------------------------------------------------------------------------
+    # CARGA / HOT-RELOAD
+    # ----------------------------------------------------------------------------------
+
+    def load(self) -> bool:
+        """Carrega (ou recarrega) o arquivo. Em caso de erro, mantém o snapshot anterior."""
+        with self._lock:
+            if not os.path.exists(self.file_path):
+                logger.error(f"Arquivo taco.json NÃO encontrado em: {self.file_path}")
+                return False
+            try:
+                mtime = os.path.getmtime(self.file_path)
+                with open(self.file_path, "r", encoding="utf-8") as f:
+                    itens = json.load(f)
+                inicio = time.perf_counter()
+                snapshot = TacoSnapshot(itens, mtime, settings.TACO_QUERY_CACHE_SIZE)
+            except Exception as e:
+                logger.error(f"Erro ao carregar a tabela TACO: {e}")
+                return False
+
+            self._snapshot = snapshot
+            self._ultima_verificacao = time.monotonic()
+            logger.info(
+                f"TACO carregada: {len(snapshot)} alimentos, {len(snapshot.vocab)} tokens "
+                f"({(time.perf_counter() - inicio) * 1000:.1f} ms)"
+            )
+            return True
+
+    def reload(self) -> bool:
+        """Hook de hot-reload explícito (ex: após atualizar data/taco.json)."""
+        return self.load()
+
+    def _verificar_alteracao(self) -> None:
+        """
+        Recarrega se o mtime do arquivo mudou. Verificação limitada a uma a cada
+        TACO_RELOAD_INTERVAL_SECONDS (0 desativa), para não fazer stat a cada tecla.
+        """
+        intervalo = settings.TACO_RELOAD_INTERVAL_SECONDS
+        if intervalo <= 0 or self._snapshot is None:
+            return
+        agora = time.monotonic()
+        if agora - self._ultima_verificacao < intervalo:
+            return
+        self._ultima_verificacao = agora
+        try:
+            if os.path.getmtime(self.file_path) != self._snapshot.mtime:
+                logger.info("taco.json alterado em disco. Recarregando índice...")
+                self.load()
+        except OSError:
+            pass
+
+    @property
+    def snapshot(self) -> Optional[TacoSnapshot]:
+        if self._snapshot is None:
+            self.load()  # Fallback para contextos sem boot (scripts)
+        else:
+            self._verificar_alteracao()
+        return self._snapshot
+
+    # ----------------------------------------------------------------------------------
+    # BUSCA
+    # ----------------------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = MAX_RESULTADOS) -> List[dict]:
+        """
+        Busca ranqueada (BM25 + prefixo + trigramas), insensível a acentos e caixa.
+        Consultas repetidas são servidas pelo LRU do snapshot (chave = termos normalizados).
+        """
+        snapshot = self.snapshot
+        termos = tuple(tokenize(query))
+        if snapshot is None or not termos:
+            return []
+        return [snapshot.item(pos) for pos in snapshot.ranquear_cache(termos, limit)]
+
+
+# Instância Singleton (carregada no boot por app.main)
+taco_index = TacoIndex()
@@ -0,0 +1,51 @@
+"""
+=======================================================================================
+ARQUIVO: bloom.py (Filtro de Bloom)
+=======================================================================================
+
+OBJETIVO:
+    Estrutura probabilística compacta para perguntas do tipo "este item PODE estar
+    no conjunto?". Nunca dá falso negativo; falsos positivos ocorrem na taxa configurada.
+
+PARTE DO SISTEMA:
+    Backend / Utils Layer.
+
+RESPONSABILIDADES:
+    1. Dimensionar bits (m) e funções de hash (k) a partir da capacidade e da taxa de FP.
+    2. Inserção e consulta por double hashing (um único BLAKE2b por operação).
+
+COMUNICAÇÃO:
+    - Utilizado por: app.core.token_revocation (jtis revogados, por worker).
+
+=======================================================================================
+"""
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Filtro de Bloom sobre bytearray. Não é thread-safe para escrita concorrente."""
+
+    def __init__(self, capacidade: int, taxa_falso_positivo: float = 0.001):
+        capacidade = max(1, capacidade)
+        self.num_bits = max(8, int(-capacidade * math.log(taxa_falso_positivo) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacidade * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.itens = 0
+
+    def _posicoes(self, item: str):
+        # Double hashing (Kirsch-Mitzenmacher): h1 + i*h2 equivale a k hashes independentes
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        for pos in self._posicoes(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.itens += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._posicoes(item))
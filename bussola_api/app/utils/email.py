@@ -14,10 +14,12 @@ RESPONSABILIDADES:
     1. Configurar a conexão SMTP de forma segura.
     2. Gerar templates HTML dinâmicos com links para o Frontend.
     3. Enviar e-mails de forma assíncrona (non-blocking).
+    4. Envio em massa (digests) reaproveitando conexões SMTP (pool por lote).
 
 COMUNICAÇÃO:
     - Utiliza settings: app.core.config (Credenciais SMTP).
     - Utilizado por: app.services.auth (Fluxos de Auth).
+    - Utilizado por: app.services.cofre (Resumo diário de expirações).
     - Externo: Servidor SMTP (Gmail, SendGrid, etc).
 
 =======================================================================================
@@ -26,6 +28,8 @@ COMUNICAÇÃO:
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from app.core.config import settings
 from pathlib import Path
+from html import escape
+from typing import List
 import os
 from dotenv import load_dotenv
 
@@ -50,6 +54,65 @@ conf = ConnectionConfig(
     VALIDATE_CERTS=True
 )
 
+# [NOVO] Instância compartilhada para envios em massa (evita recriar o cliente por mensagem).
+_mailer = FastMail(conf)
+
+async def send_bulk_emails(messages: List[MessageSchema]) -> int:
+    """
+    Envia várias mensagens reaproveitando a conexão SMTP.
+
+    Cada lote de até MAIL_MENSAGENS_POR_CONEXAO mensagens usa UMA conexão
+    (login/TLS uma vez), em vez de abrir uma sessão SMTP por e-mail.
+    Retorna a quantidade de mensagens enviadas.
+    """
+    tamanho = max(1, settings.MAIL_MENSAGENS_POR_CONEXAO)
+    enviados = 0
+    for i in range(0, len(messages), tamanho):
+        lote = messages[i:i + tamanho]
+        await _mailer.send_message(lote)
+        enviados += len(lote)
+    return enviados
+
+def build_cofre_expiry_digest(email_to: str, itens: list, dias: int) -> MessageSchema:
+    """
+    Monta o resumo (um e-mail por usuário) dos segredos que expiram nos próximos `dias`.
+    `itens`: lista de (titulo, servico, data_expiracao), já ordenada por data.
+    """
+    frontend_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
+    linhas = "".join(
+        f"<tr><td style='padding: 6px 12px;'>{escape(titulo)}</td>"
+        f"<td style='padding: 6px 12px; color: #666;'>{escape(servico or '-')}</td>"
+        f"<td style='padding: 6px 12px;'>{data_expiracao.strftime('%d/%m/%Y')}</td></tr>"
+        for titulo, servico, data_expiracao in itens
+    )
+
+    html = f"""
+    <html>
+        <body style="font-family: Arial, sans-serif; line-height: 1.6;">
+            <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px;">
+                <h2 style="color: #333;">Cofre - Senhas prestes a expirar</h2>
+                <p>Olá,</p>
+                <p>{len(itens)} item(ns) do seu cofre expira(m) nos próximos {dias} dias:</p>
+                <table style="border-collapse: collapse; width: 100%;">{linhas}</table>
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{frontend_url}/cofre" style="background-color: #4F46E5; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                        Abrir Meu Cofre
+                    </a>
+                </div>
+                <hr style="border: none; border-top: 1px solid #eee; margin: 20px 0;">
+                <p style="font-size: 12px; color: #999;">Equipe Bússola</p>
+            </div>
+        </body>
+    </html>
+    """
+
+    return MessageSchema(
+        subject="Senhas prestes a expirar - Bússola",
+        recipients=[email_to],
+        body=html,
+        subtype=MessageType.html
+    )
+
 async def send_password_reset_email(email_to: str, token: str):
     """
     Envia e-mail com link único para redefinição de senha.
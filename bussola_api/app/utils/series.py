@@ -0,0 +1,106 @@
+"""
+=======================================================================================
+ARQUIVO: series.py (Utilitários de Séries Temporais)
+=======================================================================================
+
+OBJETIVO:
+    Fornecer rotinas numéricas vetorizadas (NumPy) para séries temporais exibidas
+    em gráficos: redução de pontos, médias móveis e tendência linear.
+
+PARTE DO SISTEMA:
+    Backend / Utils Layer.
+
+RESPONSABILIDADES:
+    1. Downsampling LTTB (Largest-Triangle-Three-Buckets): reduz a série a N pontos
+       preservando a forma visual (picos e vales).
+    2. Média móvel por janela de TEMPO (dias), robusta a registros irregulares.
+    3. Inclinação da tendência (regressão linear por mínimos quadrados).
+
+COMUNICAÇÃO:
+    - Utilizado por: app.services.ritmo (Série Biométrica).
+
+=======================================================================================
+"""
+
+from datetime import datetime, timezone
+from typing import Tuple
+
+import numpy as np
+
+SEGUNDOS_DIA = 86400.0
+
+
+def to_epoch_days(datas) -> np.ndarray:
+    """
+    Converte datetimes em dias (float) desde a época.
+    Datas com timezone são convertidas para UTC e normalizadas para naive antes
+    da conversão (o NumPy não aceita tz-aware em datetime64).
+    """
+    naive = [
+        d.astimezone(timezone.utc).replace(tzinfo=None) if isinstance(d, datetime) and d.tzinfo else d
+        for d in datas
+    ]
+    segundos = np.array(naive, dtype="datetime64[s]").astype(np.int64)
+    return segundos / SEGUNDOS_DIA
+
+
+def lttb(x: np.ndarray, y: np.ndarray, pontos: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: retorna os ÍNDICES dos pontos escolhidos.
+
+    O primeiro e o último ponto são sempre mantidos. O restante é dividido em
+    (pontos - 2) baldes; em cada um escolhe-se o ponto que forma o maior triângulo
+    com o ponto anterior escolhido e a média do balde seguinte.
+    As médias dos baldes e as áreas dentro de cada balde são calculadas vetorizadas;
+    só a cadeia de escolhas (dependente do ponto anterior) é sequencial.
+    """
+    n = len(x)
+    if pontos >= n or pontos < 3:
+        return np.arange(n)
+
+    # Limites dos baldes sobre os pontos internos [1, n-1)
+    limites = np.floor(np.linspace(1, n - 1, pontos - 1)).astype(np.int64)
+    inicio, fim = limites[:-1], limites[1:]
+
+    # Média de cada balde (reduceat) + último ponto como "balde seguinte" final
+    tamanhos = fim - inicio
+    media_x = np.add.reduceat(x[:-1], inicio)[: len(inicio)] / tamanhos
+    media_y = np.add.reduceat(y[:-1], inicio)[: len(inicio)] / tamanhos
+    prox_x = np.append(media_x[1:], x[-1])
+    prox_y = np.append(media_y[1:], y[-1])
+
+    escolhidos = np.empty(pontos, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, n - 1
+    anterior = 0
+    for b in range(len(inicio)):
+        bx, by = x[inicio[b]:fim[b]], y[inicio[b]:fim[b]]
+        ax, ay = x[anterior], y[anterior]
+        areas = np.abs((ax - prox_x[b]) * (by - ay) - (ax - bx) * (prox_y[b] - ay))
+        anterior = inicio[b] + int(np.argmax(areas))
+        escolhidos[b + 1] = anterior
+    return escolhidos
+
+
+def media_movel_tempo(x: np.ndarray, y: np.ndarray, janela_dias: float) -> np.ndarray:
+    """
+    Média móvel "à direita" por janela de tempo: para cada ponto i, média de y
+    nos pontos com x em (x[i] - janela_dias, x[i]]. Soma acumulada + searchsorted: O(n log n).
+    """
+    if len(x) == 0:
+        return np.array([], dtype=float)
+    acumulado = np.concatenate(([0.0], np.cumsum(y)))
+    esquerda = np.searchsorted(x, x - janela_dias, side="right")
+    direita = np.arange(1, len(x) + 1)
+    return (acumulado[direita] - acumulado[esquerda]) / (direita - esquerda)
+
+
+def tendencia_linear(x: np.ndarray, y: np.ndarray) -> Tuple[float, float]:
+    """
+    Inclinação (unidades/dia) e intercepto da reta de mínimos quadrados.
+    Retorna (0.0, y) quando não há variação temporal suficiente.
+    """
+    if len(x) < 2 or np.ptp(x) == 0:
+        return 0.0, float(y[0]) if len(y) else 0.0
+    xc = x - x.mean()
+    inclinacao = float(np.dot(xc, y - y.mean()) / np.dot(xc, xc))
+    return inclinacao, float(y.mean() - inclinacao * x.mean())
@@ -0,0 +1,61 @@
+"""
+=======================================================================================
+ARQUIVO: text.py (Utilitários de Normalização de Texto)
+=======================================================================================
+
+OBJETIVO:
+    Centralizar as rotinas de normalização de texto em Português usadas pelos
+    mecanismos de busca do sistema (Busca Unificada e índices em memória).
+
+PARTE DO SISTEMA:
+    Backend / Utils Layer.
+
+RESPONSABILIDADES:
+    1. Remover acentos e cedilhas (accent-folding): "Feijão" -> "feijao".
+    2. Padronizar caixa (lowercase) para comparações case-insensitive.
+    3. Remover marcação HTML de conteúdos ricos (Notas) antes da indexação.
+    4. Quebrar textos em tokens alfanuméricos simples.
+
+COMUNICAÇÃO:
+    - Utilizado por: app.services.search (Índice Full-Text).
+
+=======================================================================================
+"""
+
+import re
+import unicodedata
+from typing import List
+
+# Remove qualquer tag HTML (<p>, <b>, <a href=...>) deixando apenas o texto visível.
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+# Tokens são sequências alfanuméricas (após a remoção de acentos).
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(value: str) -> str:
+    """
+    Aplica accent-folding e lowercase.
+
+    Exemplo:
+        "Pão de Açúcar" -> "pao de acucar"
+
+    Usa a decomposição NFKD para separar a letra base do diacrítico e descarta
+    os caracteres combinantes. É a mesma regra aplicada na indexação e na consulta,
+    garantindo que "feijao" encontre "Feijão" (e vice-versa).
+    """
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def strip_html(value: str) -> str:
+    """Remove tags HTML e colapsa espaços excedentes."""
+    if not value:
+        return ""
+    return " ".join(_HTML_TAG_RE.sub(" ", value).split())
+
+
+def tokenize(value: str) -> List[str]:
+    """Normaliza e quebra o texto em tokens alfanuméricos."""
+    return _TOKEN_RE.findall(normalize_text(value))
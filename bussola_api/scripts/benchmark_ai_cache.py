@@ -0,0 +1,96 @@
+"""
+SCRIPT: benchmark_ai_cache.py
+DESCRIÇÃO: Simula aberturas repetidas do painel de IA (12 agentes consultando o AgentCache, cada um
+           com 5 sugestões em cache) e compara:
+             - Só L2: toda consulta vai ao Redis + JSON + reconstrução Pydantic (comportamento anterior).
+             - L1 + L2: após a primeira abertura, as consultas são atendidas em processo.
+           Mostra tempo por abertura, idas ao Redis e os contadores de acerto/erro por nível.
+           Requer um Redis acessível em REDIS_URL (L2 e Pub/Sub de invalidação).
+USO: python scripts/benchmark_ai_cache.py [aberturas]
+"""
+import sys
+import os
+import asyncio
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.services.ai.base.cache import AgentCache
+from app.services.ai.base.base_schema import AtomicSuggestion
+
+AGENTES = {
+    "financas": ["spending_detective", "budget_sentinel", "cash_flow_oracle", "strategy_architect"],
+    "roteiro": ["conflict_guardian", "density_auditor", "recovery_agent", "travel_marshal"],
+    "registros": ["time_strategist", "flow_architect", "priority_alchemist", "task_breaker"],
+}
+
+def contexto(domain, agent):
+    return {"user_id": 1, "domain": domain, "agent": agent, "itens": list(range(200))}
+
+def sugestoes(domain, agent):
+    return [AtomicSuggestion(
+        domain=domain, agent_source=agent, type="warning", severity="medium",
+        title=f"Insight {i}", content="Texto explicativo do insight " * 8,
+        action={"kind": "adjust", "target": f"alvo-{i}", "payload": {"valor": i}}
+    ) for i in range(5)]
+
+def contar_idas(cache):
+    """Conta pipelines executados (cada um = uma ida ao Redis)."""
+    contador = {"n": 0}
+    pipeline_original = cache.redis.pipeline
+
+    def pipeline(*args, **kwargs):
+        pipe = pipeline_original(*args, **kwargs)
+        execute = pipe.execute
+
+        async def execute_contado(*a, **k):
+            contador["n"] += 1
+            return await execute(*a, **k)
+        pipe.execute = execute_contado
+        return pipe
+    cache.redis.pipeline = pipeline
+    return contador
+
+async def abrir_painel(cache):
+    resultados = await asyncio.gather(*(
+        cache.get(domain, agent, contexto(domain, agent))
+        for domain, agentes in AGENTES.items() for agent in agentes
+    ))
+    assert all(resultados), "Todas as chaves deveriam estar em cache"
+
+async def cenario(descricao, cache, aberturas):
+    idas = contar_idas(cache)
+    await abrir_painel(cache) # Primeira abertura (aquece o L1, se ativo)
+    idas["n"] = 0
+    inicio = time.perf_counter()
+    for _ in range(aberturas):
+        await abrir_painel(cache)
+    duracao = (time.perf_counter() - inicio) / aberturas * 1000
+    print(f"   {descricao:<8} {duracao:>8.2f} ms/abertura   idas ao Redis: {idas['n'] / aberturas:>5.1f}/abertura")
+    print(f"            {cache.estatisticas()}")
+
+async def executar(aberturas):
+    semeador = AgentCache()
+    for domain, agentes in AGENTES.items():
+        for agent in agentes:
+            await semeador.set(domain, agent, contexto(domain, agent), sugestoes(domain, agent))
+
+    so_l2 = AgentCache()
+    so_l2.l1.capacidade = 0
+    dois_niveis = AgentCache()
+    dois_niveis._garantir_ouvinte()
+    while not dois_niveis._assinado:
+        await asyncio.sleep(0.05) # Aguarda a assinatura Pub/Sub (L1 só liga assinado)
+
+    print(f"📊 {aberturas} aberturas do painel (12 agentes x 5 sugestões)")
+    await cenario("Só L2", so_l2, aberturas)
+    await cenario("L1 + L2", dois_niveis, aberturas)
+
+if __name__ == "__main__":
+    asyncio.run(executar(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
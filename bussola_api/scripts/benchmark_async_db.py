@@ -0,0 +1,163 @@
+"""
+SCRIPT: benchmark_async_db.py
+DESCRIÇÃO: Lag do event loop e vazão com carga mista (endpoints de IA + CRUD) em três modos de acesso
+           ao banco pelos endpoints `async def` de /ai (coleta via ContextBuilder ->
+           `consultar_em_paralelo`):
+             - Legado: Session síncrona executada direto no event loop (comportamento anterior).
+             - Threadpool: Session síncrona via run_in_threadpool (padrão, ASYNC_DB_ENABLED=false).
+             - Assíncrono: AsyncSession com aiosqlite (ASYNC_DB_ENABLED=true).
+           Os orquestradores de IA são trocados por no-ops para medir só a fase de banco (sem LLM);
+           a autenticação é fixada em um usuário de teste. SQLite temporário e isolado.
+USO: python scripts/benchmark_async_db.py [rodadas]
+     (acima de ~15 rodadas o modo Legado esgota o pool síncrono: consultas bloqueando o loop
+      esperam conexões que só são devolvidas pelo próprio loop. É o problema medido, não do script.)
+"""
+import sys
+import os
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+INTERVALO_SONDA = 0.005  # Tick do medidor de lag (5 ms)
+
+def popular(db, User, Categoria, Transacao, Tarefa, Compromisso, now_utc):
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    categorias = [Categoria(nome=f"Categoria {i}", tipo="receita" if i < 3 else "despesa",
+                            meta_limite=500.0 * (i % 4), user_id=user.id) for i in range(20)]
+    db.add_all(categorias)
+    db.commit()
+
+    agora, rnd = now_utc(), random.Random(42)
+    db.bulk_insert_mappings(Transacao, [
+        {"descricao": f"Transação {i}", "valor": round(rnd.uniform(5, 900), 2),
+         "data": agora - timedelta(days=rnd.randint(-30, 120), minutes=rnd.randint(0, 1440)),
+         "categoria_id": categorias[i % 20].id, "tipo_recorrencia": "pontual", "status": "Pendente",
+         "user_id": user.id}
+        for i in range(20000)
+    ])
+    db.bulk_insert_mappings(Tarefa, [
+        {"titulo": f"Tarefa {i}", "descricao": "Detalhes " * 10, "status": "Pendente", "user_id": user.id,
+         "prazo": agora + timedelta(days=rnd.randint(-10, 30))}
+        for i in range(800)
+    ])
+    db.bulk_insert_mappings(Compromisso, [
+        {"titulo": f"Compromisso {i}", "local": "Escritório", "status": "Pendente", "user_id": user.id,
+         "data_hora": agora + timedelta(hours=rnd.randint(1, 24 * 29))}
+        for i in range(500)
+    ])
+    db.commit()
+    return user
+
+async def medir_lag(parar, amostras):
+    """Atraso do event loop: quanto cada sleep(5 ms) passou do previsto."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(INTERVALO_SONDA)
+        amostras.append(time.perf_counter() - inicio - INTERVALO_SONDA)
+
+async def cenario(client, descricao, rodadas):
+    rotas_ia = ["/api/v1/ai/financas/insight", "/api/v1/ai/registros/insight", "/api/v1/ai/roteiro/insight"]
+    rotas_crud = ["/", "/api/v1/cofre/"]
+    parar, lag = asyncio.Event(), []
+    monitor = asyncio.create_task(medir_lag(parar, lag))
+
+    inicio = time.perf_counter()
+    latencias_crud = []
+
+    async def crud(rota):
+        t0 = time.perf_counter()
+        r = await client.get(rota)
+        latencias_crud.append(time.perf_counter() - t0)
+        return r
+
+    tarefas = []
+    for _ in range(rodadas):
+        tarefas += [client.get(rota) for rota in rotas_ia]
+        tarefas += [crud(rota) for rota in rotas_crud for _ in range(3)]
+    respostas = await asyncio.gather(*tarefas)
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await monitor
+
+    assert all(r.status_code == 200 for r in respostas), {r.status_code for r in respostas}
+    lag_ms = sorted(x * 1000 for x in lag)
+    crud_ms = sorted(x * 1000 for x in latencias_crud)
+    print(f"   {descricao:<12} {len(respostas) / duracao:>7.1f} req/s   "
+          f"lag p95 {lag_ms[int(len(lag_ms) * 0.95)]:>7.1f} ms  máx {lag_ms[-1]:>7.1f} ms   "
+          f"CRUD p50 {statistics.median(crud_ms):>7.1f} ms")
+
+async def executar(rodadas):
+    import httpx
+    from app.main import app
+    from app.api import deps
+    from app.core.config import settings
+    from app.core.timezone import now_utc
+    from app.db import async_db
+    from app.db.session import SessionLocal, to_async_url
+    from app.models.user import User
+    from app.models.financas import Categoria, Transacao
+    from app.models.registros import Tarefa
+    from app.models.agenda import Compromisso
+    from app.services.ai.financas.orchestrator import FinancasOrchestrator
+    from app.services.ai.registros.orchestrator import RegistrosOrchestrator
+    from app.services.ai.roteiro.orchestrator import RoteiroOrchestrator
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async def sem_llm(*args, **kwargs):
+        return []
+    FinancasOrchestrator.analyze_context = staticmethod(sem_llm)
+    RegistrosOrchestrator.analyze = staticmethod(sem_llm)
+    RoteiroOrchestrator.analyze_context = staticmethod(sem_llm)
+
+    db = SessionLocal()
+    user = popular(db, User, Categoria, Transacao, Tarefa, Compromisso, now_utc)
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+    app.dependency_overrides[deps.get_current_user] = lambda: user
+
+    # Os modos são trocados no ponto que o ContextBuilder realmente usa (`consultar_em_paralelo`):
+    # a execução de cada consulta e a fábrica de AsyncSession do módulo async_db.
+    consulta_padrao = async_db._consultar_em_sessao_propria
+
+    async def consulta_legada(stmt):
+        """Reproduz o comportamento anterior: Session síncrona executada na thread do event loop."""
+        with SessionLocal() as sessao:
+            return sessao.execute(stmt).all()
+
+    async_engine = create_async_engine(to_async_url(settings.DATABASE_URL))
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    print(f"📊 {rodadas} rodadas x (3 endpoints de IA + 6 CRUD) simultâneos, 20k transações")
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench", timeout=300) as client:
+        for descricao, consulta, fabrica in (("Legado", consulta_legada, None),
+                                             ("Threadpool", consulta_padrao, None),
+                                             ("Assíncrono", consulta_padrao, AsyncSessionLocal)):
+            async_db._consultar_em_sessao_propria = consulta
+            async_db.AsyncSessionLocal = fabrica
+            await client.get("/api/v1/ai/financas/insight")  # Aquecimento (pools/conexões)
+            await cenario(client, descricao, rodadas)
+    await async_engine.dispose()
+
+def run(rodadas=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        # O app lê DATABASE_URL no import: aponta para o banco temporário antes de importar
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'async.db')}"
+        asyncio.run(executar(rodadas))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
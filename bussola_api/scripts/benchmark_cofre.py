@@ -0,0 +1,99 @@
+"""
+SCRIPT: benchmark_cofre.py
+DESCRIÇÃO: Mede a listagem de metadados e a revelação de valores do Cofre com milhares de segredos
+           (SQLite temporário e isolado):
+             - Listagem: linha ORM completa (legado, inclui ciphertext) x projeção de metadados.
+             - Revelação: N chamadas unitárias x `revelar_lote` (uma query, um Fernet).
+USO: python scripts/benchmark_cofre.py [quantidade_segredos]
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, undefer
+
+from app.db import base
+from app.models.user import User
+from app.models.cofre import Segredo
+from app.schemas.cofre import SegredoResponse
+from app.services.cofre import cofre_service, cipher_suite
+
+def preparar_banco(path, quantidade):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    base.Base.metadata.create_all(bind=engine)
+    contador = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        contador["n"] += 1
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    db.bulk_insert_mappings(Segredo, [
+        {"titulo": f"Conta {i}", "servico": f"Serviço {i % 40}", "notas": "Observação " * 5,
+         "valor_criptografado": cipher_suite.encrypt(f"senha-{i}".encode()).decode(), "user_id": user.id}
+        for i in range(quantidade)
+    ])
+    db.commit()
+    ids = [i for (i,) in db.query(Segredo.id)]
+    return db, user.id, ids, contador
+
+def listar_legado(db, user_id):
+    """Implementação anterior: entidade completa (ciphertext incluído)."""
+    return db.query(Segredo).options(undefer(Segredo.valor_criptografado))\
+        .filter(Segredo.user_id == user_id).order_by(Segredo.servico, Segredo.titulo).all()
+
+def revelar_legado(db, ids, user_id):
+    """Implementação anterior: uma query de linha completa por segredo."""
+    valores = {}
+    for i in ids:
+        segredo = db.query(Segredo).options(undefer(Segredo.valor_criptografado))\
+            .filter(Segredo.id == i, Segredo.user_id == user_id).first()
+        valores[i] = cipher_suite.decrypt(segredo.valor_criptografado.encode()).decode()
+    return valores
+
+def medir(db, contador, descricao, funcao):
+    db.expunge_all()
+    contador["n"] = 0
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"   {descricao:<44} {contador['n']:>5} queries {duracao * 1000:>9.1f} ms")
+    return resultado, duracao
+
+def run(quantidade=5000):
+    if not cipher_suite:
+        print("❌ ENCRYPTION_KEY não configurada.")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id, ids, contador = preparar_banco(os.path.join(tmp, "cofre.db"), quantidade)
+
+        print(f"📊 Listagem de {quantidade} segredos (serializada em SegredoResponse)")
+        serializar = lambda linhas: [SegredoResponse.model_validate(l) for l in linhas]
+        _, t_legado = medir(db, contador, "ORM completo (legado)", lambda: serializar(listar_legado(db, user_id)))
+        _, t_novo = medir(db, contador, "Projeção de metadados (get_all)", lambda: serializar(cofre_service.get_all(db, user_id)))
+        print(f"   ✅ Speedup listagem: {t_legado / t_novo:.1f}x")
+
+        print(f"📊 Revelação de {quantidade} segredos")
+        esperado, t_legado = medir(db, contador, "N chamadas unitárias (legado)", lambda: revelar_legado(db, ids, user_id))
+        obtido, t_novo = medir(db, contador, "revelar_lote (1 query, Fernet reutilizado)", lambda: cofre_service.revelar_lote(db, ids, user_id))
+        assert obtido == esperado, "Divergência entre os valores revelados"
+        print(f"   ✅ Speedup revelação: {t_legado / t_novo:.1f}x")
+        db.close()
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,157 @@
+"""
+SCRIPT: benchmark_context_builder.py
+DESCRIÇÃO: Tempo até a primeira chamada de LLM (fase de coleta + montagem do contexto) nos insights
+           de Finanças, Roteiro e Registros:
+             - Legado: consultas em série numa única sessão, entidades ORM e contexto Pydantic validado
+               linha a linha (comportamento anterior dos endpoints).
+             - ContextBuilder (threadpool): consultas paralelas em conexões separadas, projeções,
+               model_construct.
+             - ContextBuilder (assíncrono): idem, com AsyncSession (aiosqlite).
+           Mede uma requisição isolada e 8 simultâneas. SQLite temporário e isolado.
+USO: python scripts/benchmark_context_builder.py [repeticoes]
+"""
+import sys
+import os
+import asyncio
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from benchmark_async_db import popular
+
+SIMULTANEAS = 8
+
+async def medir(construtor, user_id, repeticoes):
+    isolada = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await construtor(user_id)
+        isolada.append(time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(construtor(user_id) for _ in range(SIMULTANEAS)))
+    return statistics.median(isolada) * 1000, (time.perf_counter() - inicio) * 1000
+
+def construtores_legados():
+    """Reprodução compacta da coleta anterior (série, ORM, validação por linha)."""
+    from sqlalchemy import func, select
+    from sqlalchemy.orm import selectinload
+    from app.core.timezone import now_local, now_utc, to_local
+    from app.db.async_db import AsyncDB
+    from app.db.session import SessionLocal
+    from app.models.agenda import Compromisso
+    from app.models.financas import Categoria, Transacao
+    from app.models.registros import Tarefa
+    from app.services.ai.financas.context import FinancasContext
+    from app.services.ai.registros.context import RegistrosContext, TaskItemContext
+    from app.services.ai.roteiro.context import RoteiroContext
+
+    async def financas(user_id):
+        with SessionLocal() as sessao:
+            db, agora = AsyncDB(sessao), now_utc()
+            inicio_mes = agora.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            fim_mes = (inicio_mes.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(seconds=1)
+            categorias = await db.scalars(select(Categoria).where(Categoria.user_id == user_id))
+            cats = {c.id: c for c in categorias}
+            mes = await db.scalars(select(Transacao).where(
+                Transacao.user_id == user_id, Transacao.data >= inicio_mes, Transacao.data <= fim_mes))
+            historico = await db.all(select(Transacao.categoria_id, func.sum(Transacao.valor)).where(
+                Transacao.user_id == user_id, Transacao.data >= inicio_mes - timedelta(days=90),
+                Transacao.data < inicio_mes, Transacao.tipo_recorrencia != 'ignorar').group_by(Transacao.categoria_id))
+            futuras = await db.scalars(select(Transacao).where(
+                Transacao.user_id == user_id, Transacao.data > agora, Transacao.data <= agora + timedelta(days=30)))
+            linha = lambda t: {"data": to_local(t.data).strftime("%Y-%m-%d"), "descricao": t.descricao,
+                               "valor": t.valor, "categoria": cats[t.categoria_id].nome, "tipo": cats[t.categoria_id].tipo}
+            local = now_local()
+            return FinancasContext(
+                data_atual=local.strftime("%Y-%m-%d"), periodo_analise_label=local.strftime("%B %Y"),
+                data_fim_projecao=(local + timedelta(days=30)).strftime("%Y-%m-%d"), saldo_atual=0.0,
+                transacoes_periodo=[linha(t) for t in mes],
+                historico_medias=[{"categoria": cats[c].nome, "valor_media": round(v / 3, 2)} for c, v in historico],
+                contas_a_pagar_receber=[linha(t) for t in futuras],
+                metas_orcamentarias=[{"categoria": c.nome, "valor_limite": c.meta_limite, "tipo": c.tipo}
+                                     for c in categorias if c.meta_limite > 0])
+
+    async def roteiro(user_id):
+        with SessionLocal() as sessao:
+            inicio = now_utc().replace(hour=0, minute=0, second=0, microsecond=0)
+            comps = await AsyncDB(sessao).scalars(select(Compromisso).where(
+                Compromisso.user_id == user_id, Compromisso.data_hora >= inicio,
+                Compromisso.data_hora <= inicio + timedelta(days=30)))
+            local = now_local()
+            return RoteiroContext(
+                data_atual=local.strftime("%Y-%m-%d"), dia_semana=local.strftime("%A"),
+                data_inicio=local.strftime("%Y-%m-%d"), data_fim=(local + timedelta(days=30)).strftime("%Y-%m-%d"),
+                agenda_itens=[{"id": c.id, "title": c.titulo, "start_time": to_local(c.data_hora).isoformat(),
+                               "end_time": (to_local(c.data_hora) + timedelta(hours=1)).isoformat(),
+                               "location": c.local, "description": c.descricao, "status": c.status} for c in comps])
+
+    async def registros(user_id):
+        with SessionLocal() as sessao:
+            tarefas = await AsyncDB(sessao).scalars(
+                select(Tarefa).options(selectinload(Tarefa.subtarefas)).where(Tarefa.user_id == user_id))
+            now = now_local()
+            return RegistrosContext(
+                user_id=user_id, data_atual=now.strftime("%Y-%m-%d"), hora_atual=now.strftime("%H:%M"),
+                dia_semana=now.strftime("%A"),
+                tarefas=[TaskItemContext(
+                    id=t.id, titulo=t.titulo, descricao=t.descricao, prioridade=t.prioridade,
+                    status='concluida' if t.status == 'Concluído' else 'pendente',
+                    data_vencimento=t.prazo.strftime("%Y-%m-%d") if t.prazo else None,
+                    created_at=t.data_criacao.strftime("%Y-%m-%d"), has_subtasks=len(t.subtarefas) > 0)
+                    for t in tarefas])
+
+    return {"financas": financas, "roteiro": roteiro, "registros": registros}
+
+async def executar(repeticoes):
+    from app.main import app  # noqa: F401 (registra todos os modelos)
+    from app.core.config import settings
+    from app.core.timezone import now_utc
+    from app.db import async_db
+    from app.db.session import SessionLocal, to_async_url
+    from app.models.user import User
+    from app.models.financas import Categoria, Transacao
+    from app.models.registros import Tarefa
+    from app.models.agenda import Compromisso
+    from app.services.ai.context_builder import ContextBuilder
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    db = SessionLocal()
+    user_id = popular(db, User, Categoria, Transacao, Tarefa, Compromisso, now_utc).id
+    db.close()
+
+    novos = {"financas": ContextBuilder.financas, "roteiro": ContextBuilder.roteiro,
+             "registros": ContextBuilder.registros}
+    async_engine = create_async_engine(to_async_url(settings.DATABASE_URL))
+    modos = (("Legado", construtores_legados(), None),
+             ("Builder/threadpool", novos, None),
+             ("Builder/async", novos, async_sessionmaker(async_engine, expire_on_commit=False)))
+
+    print(f"📊 Tempo até a primeira chamada de LLM (mediana de {repeticoes}) | {SIMULTANEAS} simultâneas (total)")
+    for dominio in novos:
+        print(f"   {dominio}")
+        for descricao, construtores, fabrica_async in modos:
+            async_db.AsyncSessionLocal = fabrica_async
+            await construtores[dominio](user_id)  # Aquecimento (pool/conexões)
+            isolada, simultaneas = await medir(construtores[dominio], user_id, repeticoes)
+            print(f"      {descricao:<20} {isolada:>8.1f} ms   |   {simultaneas:>8.1f} ms")
+    await async_engine.dispose()
+
+def run(repeticoes=10):
+    with tempfile.TemporaryDirectory() as tmp:
+        # O app lê DATABASE_URL no import: aponta para o banco temporário antes de importar
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'contexto.db')}"
+        asyncio.run(executar(repeticoes))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
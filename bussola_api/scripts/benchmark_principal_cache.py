@@ -0,0 +1,129 @@
+"""
+SCRIPT: benchmark_principal_cache.py
+DESCRIÇÃO: Mede requisições/s em um endpoint autenticado trivial, com e sem o cache de principal
+           de `deps.get_current_user` (SQLite temporário e isolado).
+             - Sem cache: decode do JWT + checagem de revogação + SELECT do usuário.
+             - Com cache: acerto local por 'jti' (sem decode e sem banco).
+           As requisições vão pelo ASGITransport do httpx no próprio event loop (o TestClient
+           abre threads por requisição, e esse custo encobre a diferença medida).
+           Usa o Redis de REDIS_URL (Pub/Sub de invalidação); se estiver inacessível, cai para
+           um fakeredis em processo (pip install fakeredis).
+USO: python scripts/benchmark_principal_cache.py [requisicoes]
+"""
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import httpx
+import redis
+from fastapi import FastAPI, Depends
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+
+def _usar_fakeredis_se_necessario() -> str:
+    """Aponta os clientes Redis do app para um fakeredis se REDIS_URL não responder."""
+    try:
+        redis.from_url(settings.REDIS_URL, socket_connect_timeout=1).ping()
+        return settings.REDIS_URL
+    except redis.RedisError as e:
+        try:
+            import fakeredis
+        except ImportError:
+            print(f"❌ Redis indisponível em {settings.REDIS_URL} e fakeredis não instalado: {e}")
+            sys.exit(1)
+    servidor = fakeredis.FakeServer()  # Compartilhado: blacklist e Pub/Sub enxergam os mesmos dados
+    redis.from_url = lambda url, **kwargs: fakeredis.FakeRedis(server=servidor, **kwargs)
+    return "fakeredis (em processo)"
+
+# Antes de importar o app: deps e principal_cache criam seus clientes via redis.from_url
+REDIS_ALVO = _usar_fakeredis_se_necessario()
+
+from app.api import deps
+from app.core import security
+from app.core.principal_cache import principal_cache
+from app.db import base
+from app.models.user import User
+
+def preparar(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    base.Base.metadata.create_all(bind=engine)
+    contador = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        contador["n"] += 1
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    def get_db():
+        sessao = Session()
+        try:
+            yield sessao
+        finally:
+            sessao.close()
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    def ping(current_user: User = Depends(deps.get_current_user)):
+        return {"id": current_user.id}
+
+    app.dependency_overrides[deps.get_db] = get_db
+    return app, user_id, contador
+
+async def medir(client, token, contador, requisicoes, descricao):
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.get("/ping", headers=headers)  # Aquecimento (popula o cache, se ativo)
+    contador["n"] = 0
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        assert (await client.get("/ping", headers=headers)).status_code == 200
+    duracao = time.perf_counter() - inicio
+    print(f"   {descricao:<22} {requisicoes / duracao:>9.0f} req/s   "
+          f"{duracao / requisicoes * 1e6:>8.0f} µs/req   {contador['n']:>6} queries SQL")
+    return requisicoes / duracao
+
+async def executar(app, user_id, contador, requisicoes):
+    token = security.create_access_token(user_id)
+    print(f"📊 {requisicoes} requisições sequenciais em GET /ping (autenticado), Redis: {REDIS_ALVO}")
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://bench") as client:
+        ttl = principal_cache.ttl_segundos
+        principal_cache.ttl_segundos = 0
+        sem_cache = await medir(client, token, contador, requisicoes, "Sem cache")
+
+        principal_cache.ttl_segundos = ttl or 30
+        principal_cache.get("aquecimento", token)  # Inicia o assinante do Pub/Sub
+        limite = time.monotonic() + 5
+        while not principal_cache._assinado and time.monotonic() < limite:
+            await asyncio.sleep(0.05)
+        com_cache = await medir(client, token, contador, requisicoes, "Com cache")
+
+    print(f"✅ Ganho: {com_cache / sem_cache:.1f}x (hits={principal_cache.hits}, misses={principal_cache.misses})")
+
+def run(requisicoes=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        app, user_id, contador = preparar(os.path.join(tmp, "principal.db"))
+        asyncio.run(executar(app, user_id, contador, requisicoes))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
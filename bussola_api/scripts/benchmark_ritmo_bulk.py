@@ -0,0 +1,138 @@
+"""
+SCRIPT: benchmark_ritmo_bulk.py
+DESCRIÇÃO: Teste de orçamento de queries para `update_plano_completo` e `update_dieta_completa`.
+           Cria árvores de tamanhos diferentes em um SQLite temporário, aplica uma edição mista
+           (altera, remove, adiciona itens e pais) e verifica que o número de statements SQL
+           permanece constante (não cresce com o tamanho do plano/dieta).
+USO: python scripts/benchmark_ritmo_bulk.py
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import base
+from app.models.user import User
+from app.schemas.ritmo import (
+    PlanoTreinoCreate, DiaTreinoCreate, ExercicioItemCreate,
+    DietaConfigCreate, RefeicaoCreate, AlimentoItemCreate
+)
+from app.services.ritmo import RitmoService
+
+# Orçamento máximo de statements por atualização (load + diff aplicado + reload).
+ORCAMENTO_QUERIES = 16
+
+def preparar_banco(path):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    base.Base.metadata.create_all(bind=engine)
+    contador = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        contador["n"] += 1
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    return db, user.id, contador
+
+def _exercicio(i, **extra):
+    return ExercicioItemCreate(nome_exercicio=f"Exercício {i}", grupo_muscular="Peito", series=3,
+                               repeticoes_min=8, repeticoes_max=12, descanso_segundos=60, **extra)
+
+def _alimento(i, **extra):
+    return AlimentoItemCreate(nome=f"Alimento {i}", quantidade=100, unidade="g",
+                              calorias=100, proteina=10, carbo=10, gordura=2, **extra)
+
+def editar_plano(plano):
+    """Altera metade dos exercícios, remove o último dia e adiciona um dia novo."""
+    dias = []
+    for dia in plano.dias[:-1]:
+        exercicios = [
+            _exercicio(j, id=ex.id) if j % 2 else _exercicio(f"{j} (editado)", id=ex.id)
+            for j, ex in enumerate(dia.exercicios[:-1])
+        ]
+        exercicios.append(_exercicio("novo"))
+        dias.append(DiaTreinoCreate(id=dia.id, nome=dia.nome, ordem=dia.ordem, exercicios=exercicios))
+    dias.append(DiaTreinoCreate(nome="Dia Extra", ordem=99, exercicios=[_exercicio(k) for k in range(5)]))
+    return PlanoTreinoCreate(nome=plano.nome, ativo=True, dias=dias)
+
+def editar_dieta(dieta):
+    """Altera metade dos alimentos, remove a última refeição e adiciona uma refeição nova."""
+    refeicoes = []
+    for ref in dieta.refeicoes[:-1]:
+        alimentos = [
+            _alimento(j, id=ali.id) if j % 2 else _alimento(f"{j} (editado)", id=ali.id)
+            for j, ali in enumerate(ref.alimentos[:-1])
+        ]
+        alimentos.append(_alimento("novo"))
+        refeicoes.append(RefeicaoCreate(id=ref.id, nome=ref.nome, ordem=ref.ordem, alimentos=alimentos))
+    refeicoes.append(RefeicaoCreate(nome="Ceia", ordem=99, alimentos=[_alimento(k) for k in range(5)]))
+    return DietaConfigCreate(nome=dieta.nome, ativo=True, refeicoes=refeicoes)
+
+def medir(db, contador, descricao, funcao):
+    db.expire_all()
+    contador["n"] = 0
+    inicio = time.perf_counter()
+    resultado = funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"   {descricao:<34} {contador['n']:>4} queries {duracao * 1000:>9.1f} ms")
+    return resultado, contador["n"]
+
+def run():
+    falhas = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_pais, n_itens in ((3, 5), (7, 40)):
+            print(f"📊 Árvore com {n_pais} pais x {n_itens} itens")
+            db, user_id, contador = preparar_banco(os.path.join(tmp, f"ritmo_{n_pais}.db"))
+
+            plano = RitmoService.create_plano_completo(db, user_id, PlanoTreinoCreate(
+                nome="Plano", ativo=True,
+                dias=[DiaTreinoCreate(nome=f"Dia {d}", ordem=d, exercicios=[_exercicio(e) for e in range(n_itens)])
+                      for d in range(n_pais)]
+            ))
+            payload, plano_id = editar_plano(plano), plano.id
+            plano, n = medir(db, contador, "update_plano_completo",
+                             lambda: RitmoService.update_plano_completo(db, user_id, plano_id, payload))
+            assert [d.nome for d in plano.dias][-1] == "Dia Extra"
+            if n > ORCAMENTO_QUERIES:
+                falhas.append(f"plano {n_pais}x{n_itens}: {n} queries")
+
+            dieta = RitmoService.create_dieta_completa(db, user_id, DietaConfigCreate(
+                nome="Dieta", ativo=True,
+                refeicoes=[RefeicaoCreate(nome=f"Refeição {r}", ordem=r, alimentos=[_alimento(a) for a in range(n_itens)])
+                           for r in range(n_pais)]
+            ))
+            payload, dieta_id = editar_dieta(dieta), dieta.id
+            dieta, n = medir(db, contador, "update_dieta_completa",
+                             lambda: RitmoService.update_dieta_completa(db, user_id, dieta_id, payload))
+            # Totais incrementais devem bater com a soma completa da árvore
+            for campo, macro in (("calorias_calculadas", "calorias"), ("total_proteina", "proteina"),
+                                 ("total_carbo", "carbo"), ("total_gordura", "gordura")):
+                assert abs(getattr(dieta, campo) - sum(getattr(a, macro) for r in payload.refeicoes for a in r.alimentos)) < 0.01
+            for ref in dieta.refeicoes:
+                assert abs(ref.total_calorias - sum(a.calorias for a in ref.alimentos)) < 0.01
+            if n > ORCAMENTO_QUERIES:
+                falhas.append(f"dieta {n_pais}x{n_itens}: {n} queries")
+            db.close()
+
+    if falhas:
+        print(f"❌ Orçamento de {ORCAMENTO_QUERIES} queries excedido: " + "; ".join(falhas))
+        sys.exit(1)
+    print(f"✅ Todas as atualizações dentro do orçamento de {ORCAMENTO_QUERIES} queries")
+
+if __name__ == "__main__":
+    run()
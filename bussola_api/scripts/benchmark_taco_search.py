@@ -0,0 +1,124 @@
+"""
+SCRIPT: benchmark_taco_search.py
+DESCRIÇÃO: Mede a vazão da busca de alimentos TACO (1 núcleo) e a qualidade do ranking
+           sobre um conjunto de relevância de alimentos comuns no Brasil.
+USO: python scripts/benchmark_taco_search.py [quantidade_consultas]
+"""
+import sys
+import os
+import random
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.services.taco import TacoIndex
+from app.utils.text import normalize_text, tokenize
+
+# --------------------------------------------------------------------------------------
+# CONJUNTO DE RELEVÂNCIA
+# --------------------------------------------------------------------------------------
+# (consulta digitada, trecho esperado no nome de um dos 3 primeiros resultados)
+# Inclui buscas sem acento, parciais (autocomplete) e com erro de digitação.
+RELEVANCIA = [
+    ("arroz", "arroz"),
+    ("arroz integral", "arroz, integral"),
+    ("feijao", "feijao"),
+    ("feijao preto", "feijao, preto"),
+    ("fei", "feijao"),
+    ("frango", "frango"),
+    ("frangu", "frango"),
+    ("file de frango", "frango, file"),
+    ("ovo", "ovo"),
+    ("ovo cozido", "ovo, de galinha"),
+    ("leite integral", "leite, de vaca, integral"),
+    ("pao frances", "pao, trigo, frances"),
+    ("pao de queijo", "pao, de queijo"),
+    ("queijo minas", "queijo, minas"),
+    ("banana prata", "banana, prata"),
+    ("maca", "maca, "),
+    ("mamao", "mamao"),
+    ("batata doce", "batata, doce"),
+    ("mandioca", "mandioca"),
+    ("macarrao", "macarrao"),
+    ("acucar", "acucar"),
+    ("cafe", "cafe"),
+    ("tapioca", "tapioca"),
+    ("aveia", "aveia"),
+    ("brocoli", "brocolis"),
+    ("cenora", "cenoura"),
+    ("alface", "alface"),
+    ("tomate", "tomate"),
+    ("abacate", "abacate"),
+    ("carne moida", "moido"),
+    ("manteiga", "manteiga"),
+    ("iogurte", "iogurte"),
+    ("linguica", "linguica"),
+    ("azeite oliva", "azeite, de oliva"),
+]
+
+def avaliar_relevancia(index):
+    acertos = 0
+    rr_total = 0.0
+    for consulta, esperado in RELEVANCIA:
+        nomes = [normalize_text(r["nome"]) for r in index.search(consulta, limit=10)]
+        posicao = next((i for i, n in enumerate(nomes) if esperado in n), None)
+        if posicao is not None:
+            rr_total += 1.0 / (posicao + 1)
+        if posicao is not None and posicao < 3:
+            acertos += 1
+        else:
+            print(f"   ⚠️  '{consulta}' -> {nomes[:3]}")
+    print(f"   Hit@3: {acertos}/{len(RELEVANCIA)}   MRR@10: {rr_total / len(RELEVANCIA):.3f}")
+
+def gerar_consultas(snapshot, quantidade, seed=42):
+    """Consultas aleatórias: prefixos, tokens completos, pares de termos e erros de digitação."""
+    rnd = random.Random(seed)
+    vocab = [t for t in snapshot.vocab if len(t) >= 3]
+    letras = "abcdefghijklmnopqrstuvwxyz"
+    consultas = []
+    for _ in range(quantidade):
+        token = rnd.choice(vocab)
+        tipo = rnd.random()
+        if tipo < 0.4:
+            consultas.append(token[:rnd.randint(2, len(token))])
+        elif tipo < 0.7:
+            consultas.append(f"{token} {rnd.choice(vocab)}")
+        else:
+            i = rnd.randrange(len(token))
+            consultas.append(token[:i] + rnd.choice(letras) + token[i + 1:])
+    return consultas
+
+def medir(descricao, consultas, funcao):
+    inicio = time.perf_counter()
+    for c in consultas:
+        funcao(c)
+    duracao = time.perf_counter() - inicio
+    print(f"   {descricao:<34} {len(consultas) / duracao:>10,.0f} consultas/s   ({duracao / len(consultas) * 1e6:.1f} µs/consulta)")
+
+def run(quantidade=10000):
+    index = TacoIndex()
+    if not index.load():
+        print("❌ Não foi possível carregar data/taco.json")
+        return
+    snapshot = index.snapshot
+
+    print(f"🔎 Relevância ({len(RELEVANCIA)} consultas)")
+    avaliar_relevancia(index)
+
+    consultas = gerar_consultas(snapshot, quantidade)
+    print(f"⏱️  Vazão com {quantidade} consultas aleatórias (1 núcleo)")
+    medir("Sem cache (ranking completo)", consultas, lambda q: [snapshot.item(p) for p in snapshot.ranquear(tuple(tokenize(q)))])
+
+    # Autocomplete repete muito as mesmas consultas: 10k buscas sobre um conjunto de 500 distintas
+    repetidas = random.Random(7).choices(consultas[:500], k=quantidade)
+    medir("Com cache LRU (500 distintas)", repetidas, index.search)
+    print(f"   {index.snapshot.ranquear_cache.cache_info()}")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,77 @@
+"""
+SCRIPT: benchmark_tarefas_lote.py
+DESCRIÇÃO: Compara N chamadas unitárias (update_status_tarefa / delete_tarefa) contra uma única
+           chamada de `aplicar_operacoes_lote`, em um banco SQLite temporário e isolado.
+USO: python scripts/benchmark_tarefas_lote.py [quantidade_tarefas]
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import base
+from app.models.user import User
+from app.models.registros import Tarefa
+from app.schemas.registros import TarefaOperacaoLote
+from app.services.registros import registros_service
+from app.services.search import search_service
+
+def preparar_banco(path, quantidade):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    base.Base.metadata.create_all(bind=engine)
+    search_service.ensure_schema(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    db = Session()
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+    db.add_all([Tarefa(titulo=f"Tarefa {i}", user_id=user.id) for i in range(quantidade)])
+    db.commit()
+    ids = [t.id for t in db.query(Tarefa.id).order_by(Tarefa.id)]
+    return db, user.id, ids
+
+def medir(descricao, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    duracao = time.perf_counter() - inicio
+    print(f"   {descricao:<40} {duracao * 1000:>9.1f} ms")
+    return duracao
+
+def run(quantidade=200):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📊 Benchmark com {quantidade} tarefas (metade concluída, metade excluída)")
+        db, user_id, ids = preparar_banco(os.path.join(tmp, "unitario.db"), quantidade)
+        metade = len(ids) // 2
+
+        def unitario():
+            for tid in ids[:metade]:
+                registros_service.update_status_tarefa(db, tid, "Concluído", user_id)
+            for tid in ids[metade:]:
+                registros_service.delete_tarefa(db, tid, user_id)
+
+        t_unitario = medir("N chamadas unitárias (1 commit cada)", unitario)
+        db.close()
+
+        db, user_id, ids = preparar_banco(os.path.join(tmp, "lote.db"), quantidade)
+        operacoes = [TarefaOperacaoLote(id=tid, acao="status", status="Concluído") for tid in ids[:metade]]
+        operacoes += [TarefaOperacaoLote(id=tid, acao="excluir") for tid in ids[metade:]]
+
+        t_lote = medir("1 chamada em lote (set-based)", lambda: registros_service.aplicar_operacoes_lote(db, operacoes, user_id))
+        db.close()
+
+        print(f"✅ Speedup: {t_unitario / t_lote:.1f}x")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
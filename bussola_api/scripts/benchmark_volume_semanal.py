@@ -0,0 +1,102 @@
+"""
+SCRIPT: benchmark_volume_semanal.py
+DESCRIÇÃO: Compara o cálculo de volume semanal percorrendo o plano via lazy loading (legado)
+           com o GROUP BY único de `RitmoService.get_volume_semanal`, em um plano com
+           centenas de exercícios (SQLite temporário e isolado).
+USO: python scripts/benchmark_volume_semanal.py [quantidade_exercicios]
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import base
+from app.models.user import User
+from app.models.ritmo import RitmoPlanoTreino, RitmoDiaTreino, RitmoExercicioItem
+from app.services.ritmo import RitmoService
+
+GRUPOS = ["Peito", "Costas", "Pernas", "Ombros", "Bíceps", "Tríceps", "Core", None]
+DIAS = 7
+REPETICOES = 50
+
+def preparar_banco(path, quantidade):
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    base.Base.metadata.create_all(bind=engine)
+    contador = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _contar(conn, cursor, statement, parameters, context, executemany):
+        contador["n"] += 1
+
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = Session()
+    user = User(email="bench@bussola.local", hashed_password="x", is_active=True)
+    db.add(user)
+    db.commit()
+
+    rnd = random.Random(42)
+    # Planos inativos garantem que o filtro por plano ativo é exercitado
+    for p in range(3):
+        plano = RitmoPlanoTreino(user_id=user.id, nome=f"Plano {p}", ativo=(p == 0))
+        for d in range(DIAS):
+            dia = RitmoDiaTreino(nome=f"Dia {d}", ordem=d)
+            dia.exercicios = [
+                RitmoExercicioItem(nome_exercicio=f"Ex {d}-{e}", grupo_muscular=rnd.choice(GRUPOS),
+                                   series=rnd.randint(2, 5), repeticoes_min=8, repeticoes_max=12)
+                for e in range(quantidade // DIAS)
+            ]
+            plano.dias.append(dia)
+        db.add(plano)
+    db.commit()
+    return db, user.id, contador
+
+def volume_legado(db, user_id):
+    """Implementação anterior: plano ativo + iteração lazy sobre dias e exercícios."""
+    plano = RitmoService.get_plano_ativo(db, user_id)
+    volume = {}
+    for dia in plano.dias:
+        for ex in dia.exercicios:
+            grupo = ex.grupo_muscular or "Outros"
+            volume[grupo] = volume.get(grupo, 0) + (ex.series or 0)
+    return volume
+
+def medir(db, contador, descricao, funcao):
+    duracoes = []
+    for _ in range(REPETICOES):
+        db.expire_all()
+        db.expunge_all()
+        contador["n"] = 0
+        inicio = time.perf_counter()
+        resultado = funcao()
+        duracoes.append(time.perf_counter() - inicio)
+    media = sum(duracoes) / len(duracoes)
+    print(f"   {descricao:<34} {contador['n']:>4} queries {media * 1000:>9.2f} ms")
+    return resultado, media
+
+def run(quantidade=350):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"📊 Volume semanal: plano ativo com {quantidade // DIAS * DIAS} exercícios em {DIAS} dias")
+        db, user_id, contador = preparar_banco(os.path.join(tmp, "volume.db"), quantidade)
+
+        esperado, t_legado = medir(db, contador, "Lazy loading (legado)", lambda: volume_legado(db, user_id))
+        obtido, t_sql = medir(db, contador, "GROUP BY (get_volume_semanal)",
+                              lambda: RitmoService.get_volume_semanal(db, user_id))
+        db.close()
+
+        assert obtido == esperado, f"Divergência: {obtido} != {esperado}"
+        print(f"✅ Resultados idênticos. Speedup: {t_legado / t_sql:.1f}x")
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 350)
@@ -0,0 +1,103 @@
+"""
+SCRIPT: load_test_login.py
+DESCRIÇÃO: Teste de carga do bcrypt. Dispara N logins simultâneos e, ao mesmo tempo, mede a
+           latência de um endpoint não relacionado (GET /, health check) para comparar:
+             - Inline: bcrypt dentro do threadpool compartilhado da API (comportamento anterior).
+             - Pool: bcrypt no pool de processos limitado (excedente recebe 503 imediato).
+           Usa um SQLite temporário e isolado; o rate limit do login é desligado durante o teste.
+USO: python scripts/load_test_login.py [logins_simultaneos]
+"""
+import sys
+import os
+import asyncio
+import statistics
+import tempfile
+import time
+from collections import Counter
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+SENHA = "senha-de-teste-123"
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+def resumo(latencias):
+    ms = [l * 1000 for l in latencias]
+    return f"p50 {statistics.median(ms):7.1f} ms   p95 {percentil(ms, 0.95):7.1f} ms   máx {max(ms):7.1f} ms"
+
+async def sondar(client, parar, latencias):
+    """Chama o health check continuamente até `parar` ser sinalizado."""
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await client.get("/")
+        latencias.append(time.perf_counter() - inicio)
+        await asyncio.sleep(0.01)
+
+async def cenario(client, logins, descricao):
+    # Linha de base (sem carga)
+    base = []
+    for _ in range(50):
+        inicio = time.perf_counter()
+        await client.get("/")
+        base.append(time.perf_counter() - inicio)
+
+    parar, durante = asyncio.Event(), []
+    sonda = asyncio.create_task(sondar(client, parar, durante))
+    inicio = time.perf_counter()
+    respostas = await asyncio.gather(*[
+        client.post("/api/v1/auth/access-token", data={"username": "carga@bussola.local", "password": SENHA})
+        for _ in range(logins)
+    ])
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    await sonda
+
+    status = Counter(r.status_code for r in respostas)
+    print(f"📊 {descricao}: {logins} logins em {duracao:.2f}s -> " + ", ".join(f"{k}: {v}" for k, v in sorted(status.items())))
+    print(f"   GET / sem carga   {resumo(base)}")
+    print(f"   GET / durante     {resumo(durante)}")
+    return percentil(durante, 0.95) / percentil(base, 0.95)
+
+async def executar(logins):
+    import httpx
+    from app.main import app
+    from app.core import security
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+    from app.models.user import User
+    from app.api.v1.endpoints.auth import limiter
+
+    limiter.enabled = False
+    db = SessionLocal()
+    db.add(User(email="carga@bussola.local", hashed_password=security.get_password_hash(SENHA),
+                is_active=True, is_verified=True))
+    db.commit()
+    db.close()
+
+    transporte = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://carga", timeout=120) as client:
+        workers = settings.PASSWORD_POOL_WORKERS or 2
+        settings.PASSWORD_POOL_WORKERS = 0
+        inline = await cenario(client, logins, "Inline (threadpool da API)")
+        settings.PASSWORD_POOL_WORKERS = workers
+        await client.post("/api/v1/auth/access-token", data={"username": "carga@bussola.local", "password": SENHA})  # Sobe o pool
+        pool = await cenario(client, logins, f"Pool ({workers} processos + fila {settings.PASSWORD_POOL_FILA})")
+
+    print(f"✅ p95 do health check sob carga / sem carga: inline {inline:.1f}x, pool {pool:.1f}x")
+
+def run(logins=50):
+    with tempfile.TemporaryDirectory() as tmp:
+        # O app lê DATABASE_URL no import: aponta para o banco temporário antes de importar
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'carga.db')}"
+        asyncio.run(executar(logins))
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -606,9 +606,16 @@ def create_ritmo(user_id):
         ("Jantar", [("Patinho Moído", 150, "g", 300, 40, 0, 12), ("Batata Doce", 200, "g", 170, 3, 40, 0)])
     ]
 
+    totais_dieta = [0, 0, 0, 0]
     for idx, (nome_ref, alimentos) in enumerate(refeicoes_data):
-        ref = RitmoRefeicao(dieta_id=dieta.id, nome=nome_ref, ordem=idx)
+        # Totais persistidos da refeição (cal, prot, carb, gord)
+        totais = [sum(a[i] for a in alimentos) for i in range(3, 7)]
+        ref = RitmoRefeicao(
+            dieta_id=dieta.id, nome=nome_ref, ordem=idx,
+            total_calorias=totais[0], total_proteina=totais[1], total_carbo=totais[2], total_gordura=totais[3]
+        )
         db.add(ref); db.commit(); db.refresh(ref)
+        totais_dieta = [t + v for t, v in zip(totais_dieta, totais)]
         
         for nome, qtd, unid, cal, prot, carb, gord in alimentos:
             ali = RitmoAlimentoItem(
@@ -616,7 +623,8 @@ def create_ritmo(user_id):
                 calorias=cal, proteina=prot, carbo=carb, gordura=gord
             )
             db.add(ali)
-    
+
+    dieta.calorias_calculadas, dieta.total_proteina, dieta.total_carbo, dieta.total_gordura = totais_dieta
     db.commit()
     print("   ✅ Ritmo OK.")
 
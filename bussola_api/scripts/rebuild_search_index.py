@@ -0,0 +1,37 @@
+"""
+SCRIPT: rebuild_search_index.py
+DESCRIÇÃO: Reconstrói o índice de Busca Unificada (Full-Text) a partir das tabelas de origem.
+USO: python scripts/rebuild_search_index.py [user_id]
+"""
+import sys
+import os
+import time
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal, engine
+from app.services.search import search_service
+
+def rebuild(user_id=None):
+    search_service.ensure_schema(engine)
+    db = SessionLocal()
+    try:
+        alvo = f"usuário {user_id}" if user_id else "todos os usuários"
+        print(f"🔍 Reindexando {alvo}...")
+        inicio = time.perf_counter()
+        total = search_service.rebuild(db, user_id=user_id)
+        print(f"✅ {total} documentos indexados em {time.perf_counter() - inicio:.2f}s.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Erro na reindexação: {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,45 @@
+"""
+SCRIPT: rotate_encryption_key.py
+DESCRIÇÃO: Re-criptografa os segredos do Cofre com a ENCRYPTION_KEY atual (rotação de chave).
+           Pré-requisito: a chave anterior deve estar em ENCRYPTION_KEYS_ANTIGAS.
+           Retomável: o progresso (watermark) fica em 'cofre_rotacao_chave'; basta rodar de novo.
+USO: python scripts/rotate_encryption_key.py [tamanho_lote]
+"""
+import sys
+import os
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal
+from app.services.cofre import cofre_service
+
+def rotate(tamanho_lote=None):
+    db = SessionLocal()
+    try:
+        estado = cofre_service.get_status_rotacao(db)
+        if estado and estado.concluido_em:
+            print(f"✅ Rotação para a chave atual já concluída em {estado.concluido_em}.")
+            return
+        if estado:
+            print(f"↻ Retomando rotação a partir do id {estado.ultimo_id}...")
+        else:
+            print("🔐 Iniciando rotação de chave do Cofre...")
+        resumo = cofre_service.rotacionar_chave(db, tamanho_lote)
+        print(f"✅ {resumo['processados']} segredos verificados, {resumo['reescritos']} re-criptografados "
+              f"({resumo['linhas_por_segundo']} linhas/s nesta execução).")
+        if resumo["falhas"]:
+            print(f"⚠️  {resumo['falhas']} segredos não abrem com nenhuma chave conhecida e foram mantidos.")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rotação interrompida (rode novamente para retomar): {e}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rotate(int(sys.argv[1]) if len(sys.argv) > 1 else None)
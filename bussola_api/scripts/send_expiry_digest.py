@@ -0,0 +1,37 @@
+"""
+SCRIPT: send_expiry_digest.py
+DESCRIÇÃO: Job diário (cron) do Cofre. Busca, em uma única consulta, os segredos de todos os
+           usuários que expiram nos próximos N dias e envia UM e-mail de resumo por usuário,
+           reaproveitando as conexões SMTP.
+USO: python scripts/send_expiry_digest.py [dias]
+     ex (crontab): 0 8 * * * cd /app && python scripts/send_expiry_digest.py
+"""
+import sys
+import os
+import asyncio
+
+# Setup de diretório para importar o app
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.db.session import SessionLocal
+from app.services.cofre import cofre_service
+
+def send(dias=None):
+    db = SessionLocal()
+    try:
+        resumo = asyncio.run(cofre_service.enviar_digest_expiracao(db, dias))
+        print(f"📬 {resumo['segredos']} segredos expirando para {resumo['usuarios']} usuários; "
+              f"{resumo['enviados']} e-mails enviados.")
+    except Exception as e:
+        print(f"❌ Falha ao enviar resumo de expirações: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    send(int(sys.argv[1]) if len(sys.argv) > 1 else None)
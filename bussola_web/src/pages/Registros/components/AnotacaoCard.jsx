@@ -41,7 +41,10 @@ export function AnotacaoCard({ anotacao, onUpdate, onEdit, onView }) {
     const dateStr = dateObj.toLocaleDateString('pt-BR', { day: '2-digit', month: 'short' });
 
     // Remove tags HTML para o preview e limita texto
-    const rawText = anotacao.conteudo.replace(/<[^>]+>/g, ' ');
+    // (notas do feed já chegam com `trecho` em texto puro; as fixadas trazem o conteúdo integral)
+    const rawText = anotacao.trecho !== undefined
+        ? `${anotacao.trecho}${anotacao.trecho_truncado ? '…' : ''}`
+        : (anotacao.conteudo || '').replace(/<[^>]+>/g, ' ');
     
     return (
         <div 
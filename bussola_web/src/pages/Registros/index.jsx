@@ -1,5 +1,5 @@
-import React, { useEffect, useState } from 'react';
-import { getRegistrosDashboard, deleteGrupo } from '../../services/api';
+import React, { useEffect, useRef, useState } from 'react';
+import { getRegistrosDashboard, getFeedAnotacoes, getAnotacao, deleteGrupo } from '../../services/api';
 import { AnotacaoCard } from './components/AnotacaoCard';
 import { TarefaCard } from './components/TarefaCard';
 import { AnotacaoModal } from './components/AnotacaoModal';
@@ -15,6 +15,9 @@ export function Registros() {
     const [data, setData] = useState(null);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    // Páginas antigas do feed já abertas (recarregadas junto no Silent Update)
+    const paginasExtras = useRef(0);
 
     // Hooks de Contexto
     const { addToast } = useToast();
@@ -55,11 +58,25 @@ export function Registros() {
         localStorage.setItem('@Bussola:registros_accordions', JSON.stringify(openGroups));
     }, [openGroups]);
 
+    // Junta uma página do feed (notas mais antigas) aos dados já carregados
+    const mesclarFeed = (base, pagina) => {
+        const porMes = { ...base.anotacoes_por_mes };
+        Object.entries(pagina.anotacoes_por_mes || {}).forEach(([mes, notas]) => {
+            porMes[mes] = [...(porMes[mes] || []), ...notas];
+        });
+        return { ...base, anotacoes_por_mes: porMes, anotacoes_proximo_cursor: pagina.proximo_cursor };
+    };
+
     // Carregamento de dados (com suporte a Silent Update)
     const fetchData = async (silent = false) => {
         if (!silent) setLoading(true);
+        if (!silent) paginasExtras.current = 0;
         try {
-            const result = await getRegistrosDashboard();
+            let result = await getRegistrosDashboard();
+            // Silent Update: mantém abertas as páginas antigas (ex: após editar uma nota antiga)
+            for (let i = 0; i < paginasExtras.current && result.anotacoes_proximo_cursor; i++) {
+                result = mesclarFeed(result, await getFeedAnotacoes(result.anotacoes_proximo_cursor));
+            }
             setData(result);
             setError(null);
         } catch (err) {
@@ -73,6 +90,22 @@ export function Registros() {
 
     useEffect(() => { fetchData(false); }, []);
 
+    // O dashboard traz só os meses mais recentes; as notas antigas vêm sob demanda (cursor)
+    const handleCarregarMais = async () => {
+        if (!data?.anotacoes_proximo_cursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const pagina = await getFeedAnotacoes(data.anotacoes_proximo_cursor);
+            paginasExtras.current += 1;
+            setData(prev => mesclarFeed(prev, pagina));
+        } catch (err) {
+            console.error("Erro ao carregar notas antigas:", err);
+            addToast({ type: 'error', title: 'Erro', description: 'Não foi possível carregar as notas antigas.' });
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     // --- PROCESSAMENTO DE DADOS (ANOTAÇÕES) ---
     const processDataByGroup = () => {
         if (!data) return {};
@@ -90,8 +123,8 @@ export function Registros() {
             if (searchTerm) {
                 const term = searchTerm.toLowerCase();
                 const matchTitle = nota.titulo?.toLowerCase().includes(term);
-                // Remove tags HTML para buscar no conteúdo
-                const rawContent = nota.conteudo?.replace(/<[^>]+>/g, ' ').toLowerCase() || '';
+                // Remove tags HTML para buscar no conteúdo (no feed, apenas o trecho)
+                const rawContent = (nota.trecho ?? nota.conteudo?.replace(/<[^>]+>/g, ' ') ?? '').toLowerCase();
                 const matchContent = rawContent.includes(term);
 
                 if (!matchTitle && !matchContent) return; // Pula se não der match
@@ -145,11 +178,31 @@ export function Registros() {
         setOpenGroups(prev => ({ ...prev, [key]: !prev[key] }));
     };
 
+    // Notas do feed vêm sem o `conteudo` (só o trecho): busca o corpo completo antes de abrir,
+    // para que o PUT da edição nunca devolva texto truncado.
+    const carregarNotaCompleta = async (nota) => {
+        if (nota.conteudo !== undefined) return nota;
+        try {
+            return await getAnotacao(nota.id);
+        } catch (err) {
+            console.error("Erro ao carregar anotação:", err);
+            addToast({ type: 'error', title: 'Erro', description: 'Não foi possível abrir a anotação.' });
+            return null;
+        }
+    };
+
     const handleNewNota = () => { setEditingNota(null); setNotaModalOpen(true); };
-    const handleEditNota = (nota) => { setEditingNota(nota); setNotaModalOpen(true); };
+    const handleEditNota = async (nota) => {
+        const completa = await carregarNotaCompleta(nota);
+        if (!completa) return;
+        setEditingNota(completa);
+        setNotaModalOpen(true);
+    };
 
-    const handleViewNota = (nota) => {
-        setViewingNota(nota);
+    const handleViewNota = async (nota) => {
+        const completa = await carregarNotaCompleta(nota);
+        if (!completa) return;
+        setViewingNota(completa);
         setViewModalOpen(true);
     };
 
@@ -387,6 +440,16 @@ export function Registros() {
                                         <p>{searchTerm ? 'Nenhuma anotação encontrada.' : 'Nenhuma anotação neste grupo.'}</p>
                                     </div>
                                 )}
+
+                                {data?.anotacoes_proximo_cursor && (
+                                    <div style={{ textAlign: 'center', padding: '1rem 0' }}>
+                                        <button className="btn-secondary" onClick={handleCarregarMais} disabled={loadingMore}>
+                                            {loadingMore
+                                                ? <><i className="fa-solid fa-circle-notch fa-spin"></i> Carregando...</>
+                                                : <><i className="fa-solid fa-clock-rotate-left"></i> Carregar notas mais antigas</>}
+                                        </button>
+                                    </div>
+                                )}
                             </>
                         )}
                     </div>
@@ -391,6 +391,12 @@ export interface Anotacao {
     links: LinkItem[];
 }
 
+// Nota do feed mensal: sem o `conteudo` HTML (buscar com getAnotacao para ver/editar)
+export interface AnotacaoFeedItem extends Omit<Anotacao, 'conteudo'> {
+    trecho: string;            // Início do conteúdo em texto puro
+    trecho_truncado: boolean;
+}
+
 export interface Subtarefa {
     id: number;
     titulo: string;
@@ -414,7 +420,8 @@ export interface Tarefa {
 
 export interface RegistrosDashboard {
     anotacoes_fixadas: Anotacao[];
-    anotacoes_por_mes: Record<string, Anotacao[]>;
+    anotacoes_por_mes: Record<string, AnotacaoFeedItem[]>;
+    anotacoes_proximo_cursor?: string | null; // "AAAA-MM" da próxima página do feed (null = fim)
     tarefas_pendentes: Tarefa[];
     tarefas_concluidas: Tarefa[];
     grupos_disponiveis: GrupoAnotacao[];
@@ -425,6 +432,23 @@ export const getRegistrosDashboard = async (): Promise<RegistrosDashboard> => {
     return response.data;
 };
 
+export interface AnotacoesFeed {
+    anotacoes_por_mes: Record<string, AnotacaoFeedItem[]>;
+    proximo_cursor: string | null;
+}
+
+// Páginas seguintes do feed de notas (o dashboard traz apenas a primeira)
+export const getFeedAnotacoes = async (antesDe: string): Promise<AnotacoesFeed> => {
+    const response = await api.get('/registros/anotacoes', { params: { antes_de: antesDe } });
+    return response.data;
+};
+
+// Nota completa (conteúdo integral), carregada ao abrir visualização/edição a partir do feed
+export const getAnotacao = async (id: number): Promise<Anotacao> => {
+    const response = await api.get(`/registros/anotacoes/${id}`);
+    return response.data;
+};
+
 export const createGrupo = async (data: { nome: string; cor?: string }) => {
     const response = await api.post('/registros/grupos', data);
     return response.data;